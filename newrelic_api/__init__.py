@@ -1,17 +1,47 @@
 # flake8: noqa
+import importlib
+import sys
+
 from .version import __version__
 
-from .alert_policies import AlertPolicies
-from .alert_conditions import AlertConditions
-from .alert_conditions_infra import AlertConditionsInfra
-from .alert_conditions_nrql import AlertConditionsNRQL
-from .applications import Applications
-from .application_hosts import ApplicationHosts
-from .application_instances import ApplicationInstances
-from .components import Components
-from .dashboards import Dashboards
-from .key_transactions import KeyTransactions
-from .notification_channels import NotificationChannels
-from .plugins import Plugins
-from .servers import Servers
-from .users import Users
+# The client and resource classes are imported on first access so that ``import newrelic_api``
+# stays cheap for short-lived processes that only touch one resource.
+_EXPORTS = {
+    'NewRelicClient': 'client',
+    'AlertPolicies': 'alert_policies',
+    'AlertConditions': 'alert_conditions',
+    'AlertConditionsInfra': 'alert_conditions_infra',
+    'AlertConditionsNRQL': 'alert_conditions_nrql',
+    'Applications': 'applications',
+    'ApplicationHosts': 'application_hosts',
+    'ApplicationInstances': 'application_instances',
+    'Components': 'components',
+    'Dashboards': 'dashboards',
+    'KeyTransactions': 'key_transactions',
+    'NotificationChannels': 'notification_channels',
+    'Plugins': 'plugins',
+    'Servers': 'servers',
+    'Users': 'users',
+}
+
+__all__ = ['__version__'] + sorted(_EXPORTS)
+
+
+def _load(name):
+    value = getattr(importlib.import_module('.{0}'.format(_EXPORTS[name]), __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _EXPORTS:
+            raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTS))
+else:  # pragma: no cover
+    # Module level __getattr__ (PEP 562) is not available, import eagerly
+    for _name in _EXPORTS:
+        _load(_name)
@@ -157,6 +157,40 @@ class Applications(Resource):
             headers=self.headers,
         )
 
+    def show_many(self, ids, batch_size=None, max_workers=None):
+        """
+        Returns many applications at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: Application IDs
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The applications keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "name": "string",
+                    "language": "string",
+                    "health_status": "string",
+                    ...
+                }
+            }
+
+        """
+        return self._show_many(self.list, 'applications', ids, batch_size=batch_size, max_workers=max_workers)
+
     def update(
             self, id, name=None, app_apdex_threshold=None, end_user_apdex_threshold=None,
             enable_real_user_monitoring=None):
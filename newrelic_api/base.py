@@ -1,9 +1,51 @@
 import os
 import json
 
-import requests
+from newrelic_api.exceptions import (
+    ConfigurationException, NewRelicAPINotFoundException, NewRelicAPIServerException
+)
+from newrelic_api.concurrency import fan_out
+from newrelic_api.instrumentation import global_hooks, instrument
+from newrelic_api.scheduling import BULK, explicit_priority, priority
+from newrelic_api.transport import Transport, endpoint_template
 
-from newrelic_api.exceptions import ConfigurationException, NewRelicAPIServerException
+
+def get_api_key(api_key=None):
+    """
+    Returns the API key to use, falling back on the environment variables
+    NEW_RELIC_API_KEY and NEWRELIC_API_KEY
+
+    :type api_key: str
+    :param api_key: An explicit API key
+
+    :rtype: str
+    :return: The API key
+
+    :raises: If no key is passed and no environment variable is present, a
+        :class:`newrelic_api.exceptions.ConfigurationException` is raised.
+    """
+    api_key = api_key or os.environ.get('NEW_RELIC_API_KEY') or os.environ.get('NEWRELIC_API_KEY')
+
+    if not api_key:
+        raise ConfigurationException('NEW_RELIC_API_KEY or NEWRELIC_API_KEY not present in environment!')
+
+    return api_key
+
+
+def build_headers(api_key):
+    """
+    Returns the headers sent with every request made with an API key
+
+    :type api_key: str
+    :param api_key: The API key
+
+    :rtype: dict
+    :return: The request headers
+    """
+    return {
+        'Content-type': 'application/json',
+        'X-Api-Key': api_key,
+    }
 
 
 class Resource(object):
@@ -12,24 +54,45 @@ class Resource(object):
     """
     URL = 'https://api.newrelic.com/v2/'
 
-    def __init__(self, api_key=None):
+    # Bounds on the ids sent in one filter[ids] parameter by show_many, so
+    # that request urls stay well under common length limits
+    FILTER_IDS_BATCH_SIZE = 100
+    FILTER_IDS_MAX_LENGTH = 1500
+
+    def __init__(self, api_key=None, object_pairs_hook=None, transport=None, hooks=None):
         """
         :type api_key: str
         :param api_key: The API key. If no key is passed, the environment
             variable NEW_RELIC_API_KEY is used.
+
+        :type object_pairs_hook: callable
+        :param object_pairs_hook: An optional hook used when decoding JSON
+            responses, see :func:`json.loads`. Pass a
+            :class:`newrelic_api.interning.StringInterner` to de-duplicate
+            repeated strings in large responses.
+
+        :type transport: :class:`newrelic_api.transport.Transport`
+        :param transport: The transport requests are sent with. Resources
+            created by a :class:`newrelic_api.client.NewRelicClient` share
+            the client's transport. If no transport is passed, a new one is
+            created.
+
+        :type hooks: list
+        :param hooks: Callables told about every request of this resource
+            with a :class:`newrelic_api.instrumentation.RequestEvent` when it
+            starts and when it ends, in addition to the hooks registered with
+            :func:`newrelic_api.instrumentation.add_hook`
+
         :raises: If the api_key parameter is not present, and no environment
             variable is present, a :class:`newrelic_api.exceptions.ConfigurationException`
             is raised.
         """
-        self.api_key = api_key or os.environ.get('NEW_RELIC_API_KEY') or os.environ.get('NEWRELIC_API_KEY')
-
-        if not self.api_key:
-            raise ConfigurationException('NEW_RELIC_API_KEY or NEWRELIC_API_KEY not present in environment!')
+        self.api_key = get_api_key(api_key)
 
-        self.headers = {
-            'Content-type': 'application/json',
-            'X-Api-Key': self.api_key,
-        }
+        self.headers = build_headers(self.api_key)
+        self.object_pairs_hook = object_pairs_hook
+        self.transport = transport if transport is not None else Transport()
+        self.hooks = list(hooks or [])
 
     def _get(self, *args, **kwargs):
         """
@@ -40,13 +103,11 @@ class Resource(object):
 
         :raises: This will raise a
             :class:`NewRelicAPIServerException<newrelic_api.exceptions.NewRelicAPIServerException>`
-            if there is an error from New Relic
+            if there is an error from New Relic, or a
+            :class:`NewRelicAPINotFoundException<newrelic_api.exceptions.NewRelicAPINotFoundException>`
+            if the entity does not exist
         """
-        response = requests.get(*args, **kwargs)
-        if not response.ok:
-            raise NewRelicAPIServerException('{}: {}'.format(response.status_code, response.text))
-
-        json_response = response.json()
+        response, json_response = self._request('get', self._decode, *args, **kwargs)
 
         if response.links:
             json_response['pages'] = response.links
@@ -62,15 +123,13 @@ class Resource(object):
 
         :raises: This will raise a
             :class:`NewRelicAPIServerException<newrelic_api.exceptions.NewRelicAPIServerException>`
-            if there is an error from New Relic
+            if there is an error from New Relic, or a
+            :class:`NewRelicAPINotFoundException<newrelic_api.exceptions.NewRelicAPINotFoundException>`
+            if the entity does not exist
         """
         if 'data' in kwargs:
             kwargs['data'] = json.dumps(kwargs['data'])
-        response = requests.put(*args, **kwargs)
-        if not response.ok:
-            raise NewRelicAPIServerException('{}: {}'.format(response.status_code, response.text))
-
-        return response.json()
+        return self._request('put', self._decode, *args, **kwargs)[1]
 
     def _post(self, *args, **kwargs):
         """
@@ -81,15 +140,13 @@ class Resource(object):
 
         :raises: This will raise a
             :class:`NewRelicAPIServerException<newrelic_api.exceptions.NewRelicAPIServerException>`
-            if there is an error from New Relic
+            if there is an error from New Relic, or a
+            :class:`NewRelicAPINotFoundException<newrelic_api.exceptions.NewRelicAPINotFoundException>`
+            if the entity does not exist
         """
         if 'data' in kwargs:
             kwargs['data'] = json.dumps(kwargs['data'])
-        response = requests.post(*args, **kwargs)
-        if not response.ok:
-            raise NewRelicAPIServerException('{}: {}'.format(response.status_code, response.text))
-
-        return response.json()
+        return self._request('post', self._decode, *args, **kwargs)[1]
 
     def _delete(self, *args, **kwargs):
         """
@@ -100,17 +157,172 @@ class Resource(object):
 
         :raises: This will raise a
             :class:`NewRelicAPIServerException<newrelic_api.exceptions.NewRelicAPIServerException>`
-            if there is an error from New Relic
+            if there is an error from New Relic, or a
+            :class:`NewRelicAPINotFoundException<newrelic_api.exceptions.NewRelicAPINotFoundException>`
+            if the entity does not exist
         """
-        response = requests.delete(*args, **kwargs)
-        if not response.ok:
-            raise NewRelicAPIServerException('{}: {}'.format(response.status_code, response.text))
+        return self._request('delete', self._decode_if_present, *args, **kwargs)[1]
 
-        if response.text:
-            return response.json()
+    def _request(self, method, decode, *args, **kwargs):
+        """
+        Sends a request through the transport, raises if its response is an
+        error and decodes the response. If there are hooks, they are told
+        about the request.
+
+        :type method: str
+        :param method: The lowercase HTTP verb
+
+        :type decode: callable
+        :param decode: Decodes the response
+
+        :rtype: tuple
+        :return: The response and its decoded body
+        """
+        hooks = tuple(self.hooks) + global_hooks()
+        if not hooks:
+            response = self.transport.request(method, *args, **kwargs)
+            self._raise_for_status(response)
+            return response, decode(response)
+
+        url = kwargs['url'] if 'url' in kwargs else args[0]
+        return instrument(
+            hooks, method, endpoint_template(url), url,
+            send=lambda: self.transport.request(method, *args, **kwargs),
+            check=self._raise_for_status,
+            decode=decode,
+        )
+
+    def _raise_for_status(self, response):
+        """
+        Raises an exception if the response is an error
+
+        :raises: :class:`NewRelicAPINotFoundException<newrelic_api.exceptions.NewRelicAPINotFoundException>`
+            on 404, :class:`NewRelicAPIServerException<newrelic_api.exceptions.NewRelicAPIServerException>`
+            on any other error
+        """
+        if response.ok:
+            return
+        message = '{}: {}'.format(response.status_code, response.text)
+        if response.status_code == 404:
+            raise NewRelicAPINotFoundException(message)
+        raise NewRelicAPIServerException(message)
+
+    def _decode(self, response):
+        """
+        Decodes the JSON body of a response, using the configured
+        ``object_pairs_hook`` if there is one
+
+        :rtype: dict
+        :return: The decoded body
+        """
+        if self.object_pairs_hook is not None:
+            return response.json(object_pairs_hook=self.object_pairs_hook)
+        return response.json()
+
+    def _decode_if_present(self, response):
+        """
+        Decodes the body of a response, or returns an empty dict if it has
+        none
 
+        :rtype: dict
+        """
+        if response.text:
+            return self._decode(response)
         return {}
 
+    def _list_all(self, list_method, key, **list_kwargs):
+        """
+        Fetches every page of a paginated listing. The requests are sent as
+        'bulk' unless a priority is set.
+
+        :type list_method: callable
+        :param list_method: The resource's list method, it must take a
+            ``page`` argument
+
+        :type key: str
+        :param key: The key of the entities in the list response
+
+        :rtype: list of dicts
+        :return: The entities of every page
+        """
+        entities, page = [], None
+        with priority(explicit_priority() or BULK):
+            while True:
+                response = list_method(page=page, **list_kwargs)
+                entities.extend(response.get(key, []))
+                if 'next' not in response.get('pages', {}):
+                    return entities
+                page = (page or 1) + 1
+
+    def _batch_ids(self, ids, batch_size=None):
+        """
+        Splits ids into batches for the filter[ids] parameter, dropping
+        duplicates. A batch holds at most ``batch_size`` ids, and its comma
+        separated ids are at most FILTER_IDS_MAX_LENGTH characters long.
+
+        :type ids: list of ints
+        :param ids: The ids
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids in a batch, defaults to
+            FILTER_IDS_BATCH_SIZE
+
+        :rtype: list of lists
+        :return: The batches
+        """
+        batch_size = batch_size or self.FILTER_IDS_BATCH_SIZE
+        batches = []
+        batch, length, seen = [], 0, set()
+        for entity_id in ids:
+            if entity_id in seen:
+                continue
+            seen.add(entity_id)
+            id_length = len(str(entity_id)) + 1
+            if batch and (len(batch) >= batch_size or length + id_length > self.FILTER_IDS_MAX_LENGTH):
+                batches.append(batch)
+                batch, length = [], 0
+            batch.append(entity_id)
+            length += id_length
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _show_many(self, list_method, key, ids, batch_size=None, max_workers=None, **list_kwargs):
+        """
+        Fetches many entities by id with as few list requests as possible.
+        The ids are split into filter[ids] batches that are fetched
+        concurrently, following pagination within each batch. The requests
+        are sent as 'bulk' unless a priority is set.
+
+        :type list_method: callable
+        :param list_method: The resource's list method, it must take
+            ``filter_ids`` and ``page`` arguments
+
+        :type key: str
+        :param key: The key of the entities in the list response
+
+        :type ids: list of ints
+        :param ids: The ids to fetch
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests. With
+            a concurrency limiter on the transport, defaults to its maximum
+            limit.
+
+        :rtype: dict
+        :return: The entities keyed by id. Ids that do not exist are left out.
+        """
+        def fetch(batch):
+            return self._list_all(list_method, key, filter_ids=batch, **list_kwargs)
+
+        with priority(explicit_priority() or BULK):
+            batches = fan_out(
+                fetch, self._batch_ids(ids, batch_size), max_workers=max_workers or self.transport.max_concurrency)
+        return dict((entity['id'], entity) for batch in batches for entity in batch)
+
     def build_param_string(self, params):
         """
         This is a simple helper method to build a parameter string. It joins
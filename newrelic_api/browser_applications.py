@@ -62,6 +62,39 @@ class BrowserApplications(Resource):
             params=self.build_param_string(filters)
         )
 
+    def show_many(self, ids, batch_size=None, max_workers=None):
+        """
+        Returns many browser applications at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: Browser application IDs
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The browser applications keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "name": "string",
+                    "browser_monitoring_key": "string",
+                    "loader_script": "string"
+                }
+            }
+
+        """
+        return self._show_many(self.list, 'browser_applications', ids, batch_size=batch_size, max_workers=max_workers)
+
     def create(self, name):
         """
         This API endpoint allows you to create a standalone Browser Application
@@ -0,0 +1,785 @@
+import contextlib
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from newrelic_api.transport import _freeze, collection_url, endpoint_template, monotonic, request_key
+
+SNAPSHOT_VERSION = 1
+
+
+class CachedResponse(object):
+    """
+    A detached copy of a response that can be stored in a cache and served
+    in place of a :class:`requests.Response`. Header names are lowercased.
+    """
+    def __init__(self, status_code, content, headers=None, links=None):
+        """
+        :type status_code: int
+        :param status_code: The HTTP status code
+
+        :type content: bytes
+        :param content: The raw response body
+
+        :type headers: dict
+        :param headers: The response headers
+
+        :type links: dict
+        :param links: The parsed ``Link`` header, as in
+            :attr:`requests.Response.links`
+        """
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict((name.lower(), value) for name, value in (headers or {}).items())
+        self._links = links or {}
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Copies a :class:`requests.Response`
+
+        :rtype: :class:`CachedResponse`
+        :return: The copy
+        """
+        return cls(
+            status_code=response.status_code,
+            content=response.content,
+            headers=response.headers,
+            links=response.links,
+        )
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    @property
+    def links(self):
+        return dict((rel, dict(link)) for rel, link in self._links.items())
+
+    @property
+    def validators(self):
+        """
+        The conditional request headers that revalidate this response, built
+        from its ``ETag`` and ``Last-Modified`` headers
+        """
+        validators = {}
+        if 'etag' in self.headers:
+            validators['If-None-Match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            validators['If-Modified-Since'] = self.headers['last-modified']
+        return validators
+
+    @property
+    def size(self):
+        """
+        The approximate number of bytes used by the response
+        """
+        return len(self.content) + sum(len(name) + len(value) for name, value in self.headers.items())
+
+    def json(self, **kwargs):
+        """
+        Decodes the body, keyword arguments are passed to :func:`json.loads`
+        """
+        return json.loads(self.text, **kwargs)
+
+
+class CacheEntry(object):
+    """
+    A cached response along with the url it was fetched from, its expiry
+    and, for backends that track it, when it was last used
+    """
+    def __init__(self, url, response, expires, accessed=None):
+        self.url = url
+        self.response = response
+        self.expires = expires
+        self.accessed = accessed
+        self.size = response.size + len(url)
+
+
+class BaseCache(object):
+    """
+    The behaviour shared by every cache backend: ttls, staleness bounds,
+    background refresh slots and statistics. Backends implement storage by
+    overriding the underscored methods, as well as :meth:`generation`,
+    :meth:`invalidate`, :meth:`clear` and ``__len__``.
+    """
+    # Metric data depends on the time of the request, never cache it unless
+    # explicitly configured
+    DEFAULT_TTLS = {
+        '*metrics/data.json': 0,
+    }
+
+    def __init__(
+            self, max_entries=1024, max_bytes=64 * 1024 * 1024, default_ttl=60, ttls=None,
+            stale_while_revalidate=0, max_refreshes=4, negative_ttl=0, clock=monotonic):
+        """
+        :type max_entries: int
+        :param max_entries: The maximum number of responses to keep
+
+        :type max_bytes: int
+        :param max_bytes: The maximum total size of the cached responses
+
+        :type default_ttl: float
+        :param default_ttl: The number of seconds a response is fresh for,
+            unless its endpoint has its own ttl
+
+        :type ttls: dict
+        :param ttls: Maps endpoint templates (see
+            :func:`newrelic_api.transport.endpoint_template`), or shell style
+            patterns matching them, to a ttl in seconds. A ttl of 0 disables
+            caching for the endpoint.
+
+        :type stale_while_revalidate: float
+        :param stale_while_revalidate: For how many seconds after it expires
+            a response may still be served while it is refreshed in the
+            background. 0 disables serving stale responses.
+
+        :type max_refreshes: int
+        :param max_refreshes: The maximum number of background refreshes
+            running at once. Stale responses are still served once the cap
+            is reached, but are not refreshed until a slot frees up.
+
+        :type negative_ttl: float
+        :param negative_ttl: For how many seconds a 404 Not Found is
+            remembered, so that probing a missing entity again raises
+            :class:`newrelic_api.exceptions.NewRelicAPINotFoundException`
+            without a request. 0 disables negative caching.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_refreshes = max_refreshes
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.revalidations = 0
+        self.refreshing = set()
+        self._lock = threading.RLock()
+
+    def ttl(self, url):
+        """
+        Returns the time to live of responses from a url. Exact endpoint
+        templates take precedence over patterns, and longer patterns over
+        shorter ones.
+
+        :type url: str
+        :param url: The url of a request
+
+        :rtype: float
+        :return: The ttl in seconds
+        """
+        template = endpoint_template(url)
+        if template in self.ttls:
+            return self.ttls[template]
+        for pattern in sorted(self.ttls, key=len, reverse=True):
+            if fnmatch.fnmatchcase(template, pattern):
+                return self.ttls[pattern]
+        return self.default_ttl
+
+    def generation(self, url):
+        """
+        Returns a counter that changes every time the collection of a url is
+        invalidated. Pass it to :meth:`set` to drop responses that were in
+        flight while the collection changed.
+
+        :rtype: int
+        """
+        raise NotImplementedError
+
+    def invalidate(self, url):
+        """
+        Removes every response belonging to the same collection as a url
+
+        :type url: str
+        :param url: The url of a create, update or delete
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Removes every response
+        """
+        raise NotImplementedError
+
+    def get(self, key):
+        """
+        Returns the fresh response stored under a key
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :rtype: :class:`CachedResponse`
+        :return: The response, or None if there is no fresh response
+        """
+        with self._lock:
+            entry = self._load(key)
+            if entry is None or entry.expires <= self.clock():
+                self.misses += 1
+                return None
+            self._touch(key, entry)
+            self.hits += 1
+            return entry.response
+
+    def serve_stale(self, key):
+        """
+        Returns the response stored under a key if it has expired, but is
+        still within the ``stale_while_revalidate`` window
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :rtype: :class:`CachedResponse`
+        :return: The stale response, or None
+        """
+        if not self.stale_while_revalidate:
+            return None
+
+        with self._lock:
+            entry = self._load(key)
+            if entry is None or entry.expires + self.stale_while_revalidate <= self.clock():
+                return None
+            self.stale_hits += 1
+            return entry.response
+
+    def begin_refresh(self, key):
+        """
+        Claims a background refresh slot for a key
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :rtype: bool
+        :return: False if the key is already being refreshed or every slot is
+            taken, True otherwise. Callers that get True must call
+            :meth:`end_refresh` when done.
+        """
+        with self._lock:
+            if key in self.refreshing or len(self.refreshing) >= self.max_refreshes:
+                return False
+            self.refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        """
+        Releases the refresh slot claimed by :meth:`begin_refresh`
+        """
+        with self._lock:
+            self.refreshing.discard(key)
+
+    def get_stale(self, key):
+        """
+        Returns the response stored under a key, whether it is fresh or not
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :rtype: :class:`CachedResponse`
+        :return: The response, or None if nothing is stored
+        """
+        with self._lock:
+            entry = self._load(key)
+            return entry.response if entry is not None else None
+
+    def revalidate(self, key, url, stale, not_modified, generation=None):
+        """
+        Refreshes a stored response after the server answered a conditional
+        request with 304 Not Modified, keeping the stored body and taking any
+        new validators from the 304 response.
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :type url: str
+        :param url: The url the response was fetched from
+
+        :type stale: :class:`CachedResponse`
+        :param stale: The stored response the conditional request was built from
+
+        :type not_modified: :class:`requests.Response`
+        :param not_modified: The 304 response
+
+        :type generation: int
+        :param generation: See :meth:`set`
+
+        :rtype: :class:`CachedResponse`
+        :return: The refreshed response
+        """
+        headers = dict(stale.headers)
+        for name, value in not_modified.headers.items():
+            if name.lower() in ('etag', 'last-modified'):
+                headers[name.lower()] = value
+
+        with self._lock:
+            self.revalidations += 1
+        response = CachedResponse(stale.status_code, stale.content, headers, stale._links)
+        return self.set(key, url, response, generation=generation)
+
+    def should_store(self, response):
+        """
+        Returns whether a response may be stored: successful responses
+        always, 404s only if negative caching is enabled
+
+        :rtype: bool
+        """
+        if response.status_code == 404:
+            return bool(self.negative_ttl)
+        return 200 <= response.status_code < 300
+
+    def set(self, key, url, response, generation=None):
+        """
+        Stores a response, 404s are stored for ``negative_ttl`` seconds
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :type url: str
+        :param url: The url the response was fetched from
+
+        :type response: :class:`requests.Response`
+        :param response: The response
+
+        :type generation: int
+        :param generation: The :meth:`generation` of the url when the request
+            was sent. If the collection was invalidated since, the response is
+            not stored.
+
+        :rtype: :class:`CachedResponse`
+        :return: The response as it should be returned to the caller
+        """
+        if not isinstance(response, CachedResponse):
+            response = CachedResponse.from_response(response)
+
+        ttl = self.ttl(url)
+        if response.status_code == 404:
+            ttl = ttl and self.negative_ttl
+        if not ttl:
+            return response
+
+        entry = CacheEntry(url, response, self.clock() + ttl)
+        if entry.size > self.max_bytes:
+            return response
+
+        with self._lock:
+            self._store(key, entry, generation)
+        return response
+
+    def entries(self):
+        """
+        Returns every stored entry
+
+        :rtype: list of tuple
+        :return: (key, :class:`CacheEntry`) pairs
+        """
+        raise NotImplementedError
+
+    def entries_for(self, headers):
+        """
+        Returns the entries of requests sent with given headers
+
+        :type headers: dict
+        :param headers: The request headers
+
+        :rtype: list of tuple
+        :return: ((method, url, params), :class:`CacheEntry`) pairs, the
+            request key without its headers
+        """
+        headers = _freeze(headers)
+        return [(key[:3], entry) for key, entry in self.entries() if key[3] == headers]
+
+    def restore(self, key, entry):
+        """
+        Stores an entry as is, keeping its expiry, unless its endpoint is
+        not cached
+
+        :type key: tuple
+        :param key: The request key, see :func:`newrelic_api.transport.request_key`
+
+        :type entry: :class:`CacheEntry`
+        :param entry: The entry
+        """
+        if not self.ttl(entry.url) or entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._store(key, entry, None)
+
+    def _load(self, key):
+        raise NotImplementedError
+
+    def _touch(self, key, entry):
+        raise NotImplementedError
+
+    def _store(self, key, entry, generation):
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """
+    An in-memory LRU cache of GET responses, bounded both by the number of
+    entries and by their total size. Each endpoint can be given its own time
+    to live.
+
+    Attach the cache to a transport, or pass it to a
+    :class:`newrelic_api.client.NewRelicClient`, to share it between
+    resources. Any create, update or delete sent through the same transport
+    invalidates every cached response of the resource it touched.
+
+    .. code-block:: python
+
+        >>> cache = MemoryCache(default_ttl=60, ttls={'users.json': 3600})
+        >>> client = NewRelicClient(cache=cache)
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Takes the same arguments as :class:`BaseCache`
+        """
+        super(MemoryCache, self).__init__(*args, **kwargs)
+        self.size = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def generation(self, url):
+        return self._generations.get(collection_url(url), 0)
+
+    def invalidate(self, url):
+        collection = collection_url(url)
+        with self._lock:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for key in [key for key, entry in self._entries.items() if collection_url(entry.url) == collection]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def _load(self, key):
+        return self._entries.get(key)
+
+    def _touch(self, key, entry):
+        self._entries[key] = self._entries.pop(key)
+
+    def _store(self, key, entry, generation):
+        if generation is not None and generation != self.generation(entry.url):
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        self._evict()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+
+
+class SQLiteCache(BaseCache):
+    """
+    A cache of GET responses stored in a SQLite database, so that separate
+    processes, like cron jobs fetching the same inventory, share responses.
+    The database runs in WAL mode, which lets readers proceed while another
+    process writes. Entries are evicted least recently used first once the
+    entry count or total size is exceeded, and invalidations made by one
+    process are seen by all of them. To keep cache hits from taking the
+    write lock, the last use of an entry is only recorded once every
+    ``touch_interval`` seconds.
+
+    Keys are hashed before they are stored, so API keys sent in request
+    headers never reach the disk. Alongside the hash, the verb, url and
+    parameters of the request are kept so that snapshots can be saved.
+
+    .. code-block:: python
+
+        >>> cache = SQLiteCache('/var/cache/newrelic-api.sqlite', default_ttl=600)
+        >>> client = NewRelicClient(cache=cache)
+    """
+    # Bumped whenever the responses table changes, older tables are dropped
+    SCHEMA_VERSION = 2
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS responses ('
+        'key TEXT PRIMARY KEY, url TEXT NOT NULL, collection TEXT NOT NULL, status_code INTEGER NOT NULL, '
+        'headers TEXT NOT NULL, links TEXT NOT NULL, content BLOB NOT NULL, expires REAL NOT NULL, '
+        'accessed REAL NOT NULL, size INTEGER NOT NULL, request TEXT NOT NULL, owner TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS responses_collection ON responses (collection)',
+        'CREATE INDEX IF NOT EXISTS responses_owner ON responses (owner)',
+        'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)',
+        'CREATE TABLE IF NOT EXISTS generations (collection TEXT PRIMARY KEY, generation INTEGER NOT NULL)',
+    )
+
+    def __init__(self, path, timeout=30, touch_interval=60, clock=time.time, **kwargs):
+        """
+        :type path: str
+        :param path: The path of the database file, created if missing
+
+        :type timeout: float
+        :param timeout: How many seconds to wait for another process holding
+            a write lock
+
+        :type touch_interval: float
+        :param touch_interval: How many seconds must pass before a hit
+            records the last use of an entry again
+
+        :type clock: callable
+        :param clock: Returns the current time. Expiry times are shared
+            between processes, so this must be a wall clock.
+
+        Every other argument is passed to :class:`BaseCache`.
+        """
+        super(SQLiteCache, self).__init__(clock=clock, **kwargs)
+        self.path = path
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        with self._transaction(connection):
+            if connection.execute('PRAGMA user_version').fetchone()[0] < self.SCHEMA_VERSION:
+                connection.execute('DROP TABLE IF EXISTS responses')
+                connection.execute('PRAGMA user_version = {0:d}'.format(self.SCHEMA_VERSION))
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @property
+    def size(self):
+        """
+        The total size of the stored responses
+        """
+        return self._connection().execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def generation(self, url):
+        return self._generation(self._connection(), collection_url(url))
+
+    def invalidate(self, url):
+        collection = collection_url(url)
+        connection = self._connection()
+        with self._lock, self._transaction(connection):
+            connection.execute(
+                'INSERT OR REPLACE INTO generations (collection, generation) VALUES (?, ?)',
+                (collection, self._generation(connection, collection) + 1)
+            )
+            connection.execute('DELETE FROM responses WHERE collection = ?', (collection,))
+
+    def clear(self):
+        connection = self._connection()
+        with self._lock, self._transaction(connection):
+            connection.execute('DELETE FROM responses')
+
+    def purge(self):
+        """
+        Removes every response that can no longer be served, even stale
+        """
+        connection = self._connection()
+        with self._lock, self._transaction(connection):
+            connection.execute(
+                'DELETE FROM responses WHERE expires + ? <= ?',
+                (self.stale_while_revalidate, self.clock())
+            )
+
+    def close(self):
+        """
+        Closes the calling thread's connection to the database
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def entries_for(self, headers):
+        rows = self._connection().execute(
+            'SELECT request, url, status_code, headers, links, content, expires FROM responses WHERE owner = ?',
+            (self._hash(_freeze(headers)),)
+        ).fetchall()
+        entries = []
+        for request, url, status_code, response_headers, links, content, expires in rows:
+            response = CachedResponse(status_code, bytes(content), json.loads(response_headers), json.loads(links))
+            entries.append((_thaw(json.loads(request)), CacheEntry(url, response, expires)))
+        return entries
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self, connection):
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _generation(self, connection, collection):
+        row = connection.execute('SELECT generation FROM generations WHERE collection = ?', (collection,)).fetchone()
+        return row[0] if row else 0
+
+    def _hash(self, key):
+        return hashlib.sha256(json.dumps(key, default=str).encode('utf-8')).hexdigest()
+
+    def _load(self, key):
+        row = self._connection().execute(
+            'SELECT url, status_code, headers, links, content, expires, accessed FROM responses WHERE key = ?',
+            (self._hash(key),)
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, status_code, headers, links, content, expires, accessed = row
+        response = CachedResponse(status_code, bytes(content), json.loads(headers), json.loads(links))
+        return CacheEntry(url, response, expires, accessed)
+
+    def _touch(self, key, entry):
+        now = self.clock()
+        if entry.accessed is not None and now - entry.accessed < self.touch_interval:
+            return
+        self._connection().execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, self._hash(key)))
+
+    def _store(self, key, entry, generation):
+        connection = self._connection()
+        collection = collection_url(entry.url)
+        with self._transaction(connection):
+            if generation is not None and generation != self._generation(connection, collection):
+                return
+            response = entry.response
+            connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    self._hash(key), entry.url, collection, response.status_code,
+                    json.dumps(response.headers), json.dumps(response._links), sqlite3.Binary(response.content),
+                    entry.expires, self.clock(), entry.size, json.dumps(key[:3]), self._hash(key[3]),
+                )
+            )
+            self._evict(connection)
+
+    def _evict(self, connection):
+        count, size = connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, entry_size in connection.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            size -= entry_size
+        connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+
+def _thaw(value):
+    if isinstance(value, list):
+        return tuple(_thaw(v) for v in value)
+    return value
+
+
+def save_snapshot(cache, path, headers):
+    """
+    Writes the responses a client has cached to a gzipped JSON snapshot, so
+    that another process can start with a warm cache, see
+    :func:`load_snapshot`. Only responses fetched with ``headers`` are
+    exported, and the headers themselves, which hold the API key, are left
+    out of the file. The file is replaced atomically.
+
+    :type cache: :class:`BaseCache`
+    :param cache: The cache to export
+
+    :type path: str
+    :param path: The snapshot file
+
+    :type headers: dict
+    :param headers: The request headers of the client
+
+    :rtype: int
+    :return: The number of responses written
+    """
+    now = cache.clock()
+    entries = []
+    for (method, url, params), entry in cache.entries_for(headers):
+        response = entry.response
+        entries.append({
+            'method': method,
+            'url': url,
+            'params': params,
+            'ttl': entry.expires - now,
+            'status_code': response.status_code,
+            'headers': response.headers,
+            'links': response._links,
+            'content': response.text,
+        })
+
+    snapshot = {'version': SNAPSHOT_VERSION, 'saved_at': time.time(), 'entries': entries}
+    temporary = '{0}.{1}.tmp'.format(path, os.getpid())
+    with gzip.open(temporary, 'wb') as f:
+        f.write(json.dumps(snapshot, separators=(',', ':')).encode('utf-8'))
+    getattr(os, 'replace', os.rename)(temporary, path)
+    return len(entries)
+
+
+def load_snapshot(cache, path, headers):
+    """
+    Loads a snapshot written by :func:`save_snapshot` into a cache. Each
+    response keeps the time to live it had left when it was saved, minus the
+    time since. Responses that have expired in the meantime are loaded too:
+    the next request for them is a conditional request, so unchanged
+    resources are not downloaded again.
+
+    :type cache: :class:`BaseCache`
+    :param cache: The cache to load into
+
+    :type path: str
+    :param path: The snapshot file
+
+    :type headers: dict
+    :param headers: The request headers of the client, used to rebuild the
+        request keys
+
+    :rtype: int
+    :return: The number of responses loaded, or 0 if the snapshot was written
+        by an incompatible version
+    """
+    with gzip.open(path, 'rb') as f:
+        snapshot = json.loads(f.read().decode('utf-8'))
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        return 0
+
+    elapsed = time.time() - snapshot['saved_at']
+    now = cache.clock()
+    for item in snapshot['entries']:
+        response = CachedResponse(
+            item['status_code'], item['content'].encode('utf-8'), item['headers'], item['links'])
+        key = request_key(item['method'], item['url'], _thaw(item['params']), headers)
+        cache.restore(key, CacheEntry(item['url'], response, now + item['ttl'] - elapsed))
+    return len(snapshot['entries'])
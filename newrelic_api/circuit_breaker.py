@@ -0,0 +1,219 @@
+import threading
+from collections import deque
+
+from newrelic_api.exceptions import CircuitOpenException
+from newrelic_api.transport import monotonic
+
+try:
+    from urllib.parse import urlparse
+except ImportError:  # pragma: no cover
+    from urlparse import urlparse
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _HostState(object):
+    def __init__(self, window):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = None
+        self.probes = 0
+        self.probe_successes = 0
+        self.rejected = 0
+
+
+class CircuitBreaker(object):
+    """
+    A circuit breaker per API host, e.g. api.newrelic.com and
+    infra-api.newrelic.com, so that a degraded host fails fast instead of
+    piling up timeouts while the other keeps working.
+
+    A host's circuit opens once the failure rate over its last ``window``
+    requests reaches ``failure_rate``. Failures are connection errors,
+    timeouts and 5xx responses. While open, requests raise
+    :class:`newrelic_api.exceptions.CircuitOpenException` without being
+    sent. After ``reset_timeout`` seconds the circuit half-opens and lets
+    ``probes`` requests through: if they all succeed it closes, if any fails
+    it opens again.
+
+    .. code-block:: python
+
+        >>> breaker = CircuitBreaker(failure_rate=0.5, reset_timeout=30)
+        >>> client = NewRelicClient(circuit_breaker=breaker)
+        >>> breaker.states()
+        {'api.newrelic.com': {'state': 'closed', 'failure_rate': 0.0, ...}}
+    """
+    def __init__(
+            self, failure_rate=0.5, window=20, min_requests=10, reset_timeout=30, probes=1,
+            on_state_change=None, clock=monotonic):
+        """
+        :type failure_rate: float
+        :param failure_rate: The failure rate, between 0 and 1, that opens
+            the circuit
+
+        :type window: int
+        :param window: The number of recent requests the failure rate is
+            computed over
+
+        :type min_requests: int
+        :param min_requests: The number of requests in the window before the
+            circuit can open
+
+        :type reset_timeout: float
+        :param reset_timeout: The number of seconds the circuit stays open
+            before half-opening
+
+        :type probes: int
+        :param probes: The number of requests let through while half-open,
+            all must succeed for the circuit to close
+
+        :type on_state_change: callable
+        :param on_state_change: Called with the host, the old state and the
+            new state every time a circuit changes state
+        """
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, url):
+        """
+        Checks that a request may be sent
+
+        :type url: str
+        :param url: The url of the request
+
+        :raises: A :class:`newrelic_api.exceptions.CircuitOpenException` if
+            the circuit of the url's host is open
+        """
+        host = urlparse(url).netloc
+        change = None
+        with self._lock:
+            host_state = self._host(host)
+            if host_state.state == OPEN and self.clock() - host_state.opened_at >= self.reset_timeout:
+                change = self._transition(host, host_state, HALF_OPEN)
+            allowed = host_state.state == CLOSED
+            if host_state.state == HALF_OPEN and host_state.probes < self.probes:
+                host_state.probes += 1
+                allowed = True
+            if not allowed:
+                host_state.rejected += 1
+            state = host_state.state
+        self._notify(change)
+
+        if not allowed:
+            raise CircuitOpenException('Circuit breaker for {0} is {1}'.format(host, state))
+
+    def record(self, url, success):
+        """
+        Records the outcome of a request sent after :meth:`before_request`
+
+        :type url: str
+        :param url: The url of the request
+
+        :type success: bool
+        :param success: Whether the request succeeded
+        """
+        host = urlparse(url).netloc
+        change = None
+        with self._lock:
+            host_state = self._host(host)
+            host_state.outcomes.append(success)
+            if host_state.state == HALF_OPEN:
+                change = self._record_probe(host, host_state, success)
+            elif host_state.state == CLOSED and self._should_open(host_state):
+                change = self._transition(host, host_state, OPEN)
+        self._notify(change)
+
+    def abandon(self, url):
+        """
+        Gives back the probe slot, if any, of a request let through by
+        :meth:`before_request` that ended without an outcome saying anything
+        about the host, e.g. because the caller's deadline passed
+
+        :type url: str
+        :param url: The url of the request
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            host_state = self._host(host)
+            if host_state.state == HALF_OPEN and host_state.probes > 0:
+                host_state.probes -= 1
+
+    def state(self, host):
+        """
+        Returns the state of a host's circuit: 'closed', 'open' or 'half_open'
+
+        :type host: str
+        :param host: The host, e.g. 'api.newrelic.com'
+
+        :rtype: str
+        """
+        with self._lock:
+            return self._host(host).state
+
+    def states(self):
+        """
+        Returns the state of every host's circuit, for dashboards
+
+        :rtype: dict
+        :return: Maps hosts to their state, failure rate over the window,
+            number of requests in the window and number of rejected requests
+        """
+        with self._lock:
+            return dict(
+                (host, {
+                    'state': host_state.state,
+                    'failure_rate': self._failure_rate(host_state),
+                    'requests': len(host_state.outcomes),
+                    'rejected': host_state.rejected,
+                })
+                for host, host_state in self._hosts.items()
+            )
+
+    def _host(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self.window)
+        return self._hosts[host]
+
+    def _failure_rate(self, host_state):
+        if not host_state.outcomes:
+            return 0.0
+        return float(host_state.outcomes.count(False)) / len(host_state.outcomes)
+
+    def _should_open(self, host_state):
+        return (
+            len(host_state.outcomes) >= self.min_requests and
+            self._failure_rate(host_state) >= self.failure_rate
+        )
+
+    def _record_probe(self, host, host_state, success):
+        if not success:
+            return self._transition(host, host_state, OPEN)
+        host_state.probe_successes += 1
+        if host_state.probe_successes >= self.probes:
+            host_state.outcomes.clear()
+            return self._transition(host, host_state, CLOSED)
+        return None
+
+    def _transition(self, host, host_state, state):
+        previous = host_state.state
+        host_state.state = state
+        host_state.probes = 0
+        host_state.probe_successes = 0
+        if state == OPEN:
+            host_state.opened_at = self.clock()
+        return host, previous, state
+
+    def _notify(self, change):
+        # Called once the lock is released, so that callbacks can read the
+        # states and slow ones do not hold up requests
+        if change is not None and self.on_state_change is not None:
+            self.on_state_change(*change)
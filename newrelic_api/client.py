@@ -0,0 +1,199 @@
+import importlib
+import os
+import threading
+
+from newrelic_api.base import build_headers, get_api_key
+from newrelic_api.exceptions import ConfigurationException
+from newrelic_api.transport import DEFAULT_TIMEOUT, Transport
+
+
+class NewRelicClient(object):
+    """
+    A single entry point to every API resource. Resources are created on
+    first access and share the client's API key, transport, connection pool,
+    rate limiter and cache.
+
+    .. code-block:: python
+
+        >>> client = NewRelicClient(rate_limiter=RateLimiter(rate=10))
+        >>> client.applications.list(filter_name='demo')
+        >>> client.alert_conditions_infra.list(policy_id=1234)
+    """
+    # Maps attribute names to resource classes, the attribute name is also
+    # the name of the module that defines the class
+    RESOURCES = {
+        'alert_conditions': 'AlertConditions',
+        'alert_conditions_infra': 'AlertConditionsInfra',
+        'alert_conditions_nrql': 'AlertConditionsNRQL',
+        'alert_policies': 'AlertPolicies',
+        'application_hosts': 'ApplicationHosts',
+        'application_instances': 'ApplicationInstances',
+        'applications': 'Applications',
+        'browser_applications': 'BrowserApplications',
+        'components': 'Components',
+        'dashboards': 'Dashboards',
+        'key_transactions': 'KeyTransactions',
+        'labels': 'Labels',
+        'notification_channels': 'NotificationChannels',
+        'plugins': 'Plugins',
+        'servers': 'Servers',
+        'users': 'Users',
+    }
+
+    def __init__(
+            self, api_key=None, session=None, rate_limiter=None, cache=None, snapshot=None,
+            circuit_breaker=None, timeout=DEFAULT_TIMEOUT, hedging=None, concurrency_limiter=None,
+            object_pairs_hook=None, transport=None, hooks=None):
+        """
+        :type api_key: str
+        :param api_key: The API key. If no key is passed, the environment
+            variable NEW_RELIC_API_KEY is used.
+
+        :type session: :class:`requests.Session`
+        :param session: The session shared by every resource. If no session
+            is passed, one is created on the first request.
+
+        :type rate_limiter: :class:`newrelic_api.transport.RateLimiter`
+        :param rate_limiter: An optional limiter shared by every resource
+
+        :type cache: :class:`newrelic_api.cache.MemoryCache`
+        :param cache: An optional response cache shared by every resource
+
+        :type snapshot: str
+        :param snapshot: The path of a cache snapshot to warm the cache
+            with, if the file exists. Requires a ``cache``. See
+            :meth:`save_snapshot`.
+
+        :type circuit_breaker: :class:`newrelic_api.circuit_breaker.CircuitBreaker`
+        :param circuit_breaker: An optional circuit breaker shared by every
+            resource
+
+        :type timeout: float or tuple
+        :param timeout: The timeout of every request in seconds, or a
+            (connect, read) tuple
+
+        :type hedging: :class:`newrelic_api.hedging.HedgingPolicy`
+        :param hedging: An optional policy for hedging slow GET requests
+
+        :type concurrency_limiter: :class:`newrelic_api.concurrency.AdaptiveLimiter`
+        :param concurrency_limiter: An optional limiter adapting the number of
+            requests in flight, shared by every resource
+
+        :type object_pairs_hook: callable
+        :param object_pairs_hook: An optional hook used by every resource
+            when decoding JSON responses
+
+        :type transport: :class:`newrelic_api.transport.Transport`
+        :param transport: A preconfigured transport. If passed, ``session``,
+            ``rate_limiter``, ``cache``, ``circuit_breaker``, ``timeout``,
+            ``hedging`` and ``concurrency_limiter`` are ignored.
+
+        :type hooks: list
+        :param hooks: Callables told about every request of every resource,
+            see :mod:`newrelic_api.instrumentation`
+
+        :raises: If the api_key parameter is not present, and no environment
+            variable is present, or if a snapshot is passed without a cache,
+            a :class:`newrelic_api.exceptions.ConfigurationException` is
+            raised.
+        """
+        self.api_key = get_api_key(api_key)
+        self.object_pairs_hook = object_pairs_hook
+        self.hooks = list(hooks or [])
+        self.transport = transport or Transport(
+            session=session, pooled=True, rate_limiter=rate_limiter, cache=cache,
+            circuit_breaker=circuit_breaker, timeout=timeout, hedging=hedging,
+            concurrency_limiter=concurrency_limiter)
+        self._resolvers = {}
+        self._lock = threading.Lock()
+
+        if snapshot and os.path.exists(snapshot):
+            self.load_snapshot(snapshot)
+
+    def __getattr__(self, name):
+        if name not in self.RESOURCES:
+            raise AttributeError('{0!r} object has no attribute {1!r}'.format(type(self).__name__, name))
+
+        with self._lock:
+            if name not in self.__dict__:
+                module = importlib.import_module('newrelic_api.{0}'.format(name))
+                resource_class = getattr(module, self.RESOURCES[name])
+                self.__dict__[name] = resource_class(
+                    api_key=self.api_key,
+                    object_pairs_hook=self.object_pairs_hook,
+                    transport=self.transport,
+                    hooks=self.hooks,
+                )
+        return self.__dict__[name]
+
+    def resolver(self, name, max_age=300):
+        """
+        Returns the client's :class:`newrelic_api.resolvers.NameResolver` for
+        a resource, creating it on first use
+
+        .. code-block:: python
+
+            >>> client.resolver('servers').get_id('web-01')
+
+        :type name: str
+        :param name: 'applications', 'dashboards', 'servers' or 'users'
+
+        :type max_age: float
+        :param max_age: The age after which the resolver's index is rebuilt,
+            only used when the resolver is created
+
+        :rtype: :class:`newrelic_api.resolvers.NameResolver`
+        """
+        from newrelic_api.resolvers import NameResolver
+
+        resource = getattr(self, name)
+        with self._lock:
+            if name not in self._resolvers:
+                self._resolvers[name] = NameResolver(resource, max_age=max_age)
+            return self._resolvers[name]
+
+    def save_snapshot(self, path):
+        """
+        Writes the cached responses of this client to a compact snapshot
+        file. Loading it in a new process, by passing ``snapshot=path`` to
+        the client, starts that process with the listings, entities and
+        metric names this one had cached. The API key is not written to the
+        file.
+
+        :type path: str
+        :param path: The snapshot file
+
+        :rtype: int
+        :return: The number of responses written
+
+        :raises: A :class:`newrelic_api.exceptions.ConfigurationException` if
+            the client has no cache
+        """
+        from newrelic_api.cache import save_snapshot
+        return save_snapshot(self._snapshot_cache(), path, build_headers(self.api_key))
+
+    def load_snapshot(self, path):
+        """
+        Loads a snapshot written by :meth:`save_snapshot` into the cache.
+        Responses that expired since are revalidated with conditional
+        requests on first use.
+
+        :type path: str
+        :param path: The snapshot file
+
+        :rtype: int
+        :return: The number of responses loaded
+
+        :raises: A :class:`newrelic_api.exceptions.ConfigurationException` if
+            the client has no cache
+        """
+        from newrelic_api.cache import load_snapshot
+        return load_snapshot(self._snapshot_cache(), path, build_headers(self.api_key))
+
+    def _snapshot_cache(self):
+        if self.transport.cache is None:
+            raise ConfigurationException('Cache snapshots need a client created with a cache')
+        return self.transport.cache
+
+    def __dir__(self):
+        return sorted(set(dir(type(self))) | set(self.__dict__) | set(self.RESOURCES))
@@ -0,0 +1,218 @@
+import threading
+
+from newrelic_api.deadline import current_deadline, use_deadline
+from newrelic_api.exceptions import DeadlineExceededException
+from newrelic_api.scheduling import explicit_priority, priority
+from newrelic_api.transport import endpoint_template, monotonic
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def fan_out(func, items, max_workers=None):
+    """
+    Calls ``func`` on every item on a pool of threads and returns the
+    results in the order of ``items``. If any call raises, the first
+    exception in that order is raised once the calls already started have
+    finished. The deadline and priority of the calling thread, if any,
+    apply to the calls.
+
+    :type func: callable
+    :param func: The function to call with each item
+
+    :type items: iterable
+    :param items: The items
+
+    :type max_workers: int
+    :param max_workers: The maximum number of concurrent calls, defaults to
+        DEFAULT_MAX_WORKERS
+
+    :rtype: list
+    :return: The return values of ``func``
+    """
+    items = list(items)
+    max_workers = min(max_workers or DEFAULT_MAX_WORKERS, len(items))
+    if max_workers <= 1:
+        return [func(item) for item in items]
+
+    current = current_deadline()
+    current_priority = explicit_priority()
+
+    def call(item):
+        with use_deadline(current), priority(current_priority):
+            return func(item)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(call, items))
+
+
+class _Ticket(object):
+    def __init__(self, template, started, epoch, saturated):
+        self.template = template
+        self.started = started
+        self.epoch = epoch
+        self.saturated = saturated
+
+
+class AdaptiveLimiter(object):
+    """
+    Limits the number of requests in flight with additive increase and
+    multiplicative decrease (AIMD), the way TCP finds the capacity of a
+    network. Each healthy response to a request sent while at least half the
+    limit was in use raises the limit by ``1 / limit``, so about one per round of requests.
+    A 429 or 5xx response, a connection error, or a latency more than
+    ``latency_tolerance`` times the usual latency of its endpoint multiplies
+    the limit by ``backoff``. Latencies under ``min_spike_latency`` are never
+    spikes, and spikes still move the usual latency, so an endpoint that
+    stays slower settles at its new latency. Responses to requests sent before the last
+    decrease do not decrease it again, so one burst of errors backs off once.
+
+    Passed to a transport, the limiter gates every request it sends, and
+    the fan-out helpers such as ``show_many`` size their thread pools to
+    ``max_limit`` so that the limiter decides how many requests are in
+    flight.
+
+    .. code-block:: python
+
+        >>> client = NewRelicClient(concurrency_limiter=AdaptiveLimiter(initial_limit=4, max_limit=32))
+        >>> client.servers.show_many(server_ids)
+    """
+    def __init__(
+            self, initial_limit=4, min_limit=1, max_limit=32, backoff=0.5, latency_tolerance=3.0,
+            min_spike_latency=0.05, smoothing=0.1, clock=monotonic):
+        """
+        :type initial_limit: int
+        :param initial_limit: The number of concurrent requests to start with
+
+        :type min_limit: int
+        :param min_limit: The limit never goes below this
+
+        :type max_limit: int
+        :param max_limit: The limit never goes above this
+
+        :type backoff: float
+        :param backoff: The factor the limit is multiplied by on overload
+
+        :type latency_tolerance: float
+        :param latency_tolerance: How many times slower than usual a response
+            must be to count as a latency spike
+
+        :type min_spike_latency: float
+        :param min_spike_latency: The number of seconds a response must take
+            to count as a latency spike
+
+        :type smoothing: float
+        :param smoothing: The weight of each new latency in the moving
+            average of an endpoint's latency
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.min_spike_latency = min_spike_latency
+        self.smoothing = smoothing
+        self.clock = clock
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._limit = float(initial_limit)
+        self._epoch = 0
+        self._latencies = {}
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """
+        The current number of requests allowed in flight
+
+        :rtype: int
+        """
+        return max(self.min_limit, int(self._limit))
+
+    def acquire(self, url, timeout=None):
+        """
+        Waits until a request may be sent
+
+        :type url: str
+        :param url: The url of the request
+
+        :type timeout: float
+        :param timeout: The maximum number of seconds to wait
+
+        :return: A ticket to pass to :meth:`start`, then to :meth:`release`
+            or :meth:`cancel`
+
+        :raises: A :class:`newrelic_api.exceptions.DeadlineExceededException`
+            if no request could be sent within ``timeout``
+        """
+        expires = None if timeout is None else self.clock() + timeout
+        with self._condition:
+            while self.in_flight >= self.limit:
+                remaining = None if expires is None else expires - self.clock()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededException('Timed out waiting for a concurrency slot')
+                self._condition.wait(remaining)
+            self.in_flight += 1
+            # Only requests sent while at least half the limit is in use say
+            # anything about whether a higher limit would be healthy
+            saturated = self.in_flight * 2 >= self.limit
+            return _Ticket(endpoint_template(url), None, self._epoch, saturated)
+
+    def start(self, ticket):
+        """
+        Starts timing a request, once it is about to be sent. Time spent
+        waiting in other limiters is not latency of the API.
+
+        :param ticket: The ticket returned by :meth:`acquire`
+        """
+        ticket.started = self.clock()
+
+    def cancel(self, ticket):
+        """
+        Gives back the slot of a request that was not sent, or was abandoned
+        for reasons that say nothing about the API, without adjusting the
+        limit
+
+        :param ticket: The ticket returned by :meth:`acquire`
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, ticket, status_code=None):
+        """
+        Ends a request and adjusts the limit to its outcome
+
+        :param ticket: The ticket returned by :meth:`acquire`
+
+        :type status_code: int
+        :param status_code: The status of the response, None if no response
+            was received
+        """
+        latency = self.clock() - (ticket.started if ticket.started is not None else self.clock())
+        with self._condition:
+            self.in_flight -= 1
+            overloaded = status_code is None or status_code == 429 or status_code >= 500
+            if not overloaded:
+                usual = self._latencies.get(ticket.template)
+                overloaded = (
+                    usual is not None and latency >= self.min_spike_latency and
+                    latency > usual * self.latency_tolerance
+                )
+                self._observe(ticket.template, latency)
+
+            if overloaded and ticket.epoch == self._epoch:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                self._epoch += 1
+                self.decreases += 1
+            elif not overloaded and ticket.saturated and self._limit < self.max_limit:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+                self.increases += 1
+            self._condition.notify_all()
+
+    def _observe(self, template, latency):
+        usual = self._latencies.get(template)
+        if usual is None:
+            self._latencies[template] = latency
+        else:
+            self._latencies[template] = usual + self.smoothing * (latency - usual)
@@ -126,6 +126,39 @@ class Dashboards(Resource):
             headers=self.headers,
         )
 
+    def show_many(self, ids, batch_size=None, max_workers=None):
+        """
+        Returns many dashboards at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: Dashboard IDs
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The dashboards keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "title": "string",
+                    "description": "string",
+                    ...
+                }
+            }
+
+        """
+        return self._show_many(self.list, 'dashboards', ids, batch_size=batch_size, max_workers=max_workers)
+
     def delete(self, id):
         """
         This API endpoint deletes a dashboard and all its widgets.
@@ -0,0 +1,118 @@
+import contextlib
+import threading
+import time
+
+from newrelic_api.exceptions import DeadlineExceededException
+
+monotonic = getattr(time, 'monotonic', time.time)
+
+_local = threading.local()
+
+
+class Deadline(object):
+    """
+    A total time budget shared by every request of an operation. Requests
+    sent while a deadline is current have their timeouts shrunk to the time
+    left, and requests that would start after it has passed are not sent.
+    """
+    def __init__(self, seconds, clock=monotonic):
+        """
+        :type seconds: float
+        :param seconds: The budget, in seconds from now
+
+        :type clock: callable
+        :param clock: Returns the current time in seconds
+        """
+        self.clock = clock
+        self.expires = clock() + seconds
+
+    def remaining(self):
+        """
+        :rtype: float
+        :return: The number of seconds left, never negative
+        """
+        return max(0.0, self.expires - self.clock())
+
+    def expired(self):
+        """
+        :rtype: bool
+        """
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        :raises: A :class:`newrelic_api.exceptions.DeadlineExceededException`
+            if the deadline has passed
+        """
+        if self.expired():
+            raise DeadlineExceededException('The deadline of the operation has passed')
+
+    def timeout(self, timeout):
+        """
+        Shrinks a requests timeout so that it ends no later than the deadline
+
+        :type timeout: float or tuple
+        :param timeout: A timeout, a (connect, read) tuple or None
+
+        :rtype: float or tuple
+        :return: The shrunk timeout, in the same form
+        """
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+
+def current_deadline():
+    """
+    Returns the deadline of the current thread, or None
+
+    :rtype: :class:`Deadline`
+    """
+    return getattr(_local, 'deadline', None)
+
+
+@contextlib.contextmanager
+def use_deadline(current):
+    """
+    Makes a :class:`Deadline` current in this thread, e.g. to carry the
+    deadline of the calling thread into a worker thread. None clears it.
+
+    :type current: :class:`Deadline`
+    :param current: The deadline
+    """
+    previous = current_deadline()
+    _local.deadline = current
+    try:
+        yield current
+    finally:
+        _local.deadline = previous
+
+
+@contextlib.contextmanager
+def deadline(seconds, clock=monotonic):
+    """
+    Bounds the total time spent by the requests sent inside the block,
+    including the pages of a listing, the batches of a ``show_many`` and the
+    show request an ``update`` starts with. A deadline nested in another
+    cannot extend it.
+
+    .. code-block:: python
+
+        >>> with deadline(10):
+        ...     servers = Servers().show_many(ids)
+
+    :type seconds: float
+    :param seconds: The budget in seconds
+
+    :raises: A :class:`newrelic_api.exceptions.DeadlineExceededException` if
+        a request would start, or is still running, after the deadline
+    """
+    new = Deadline(seconds, clock=clock)
+    outer = current_deadline()
+    if outer is not None and outer.expires < new.expires:
+        new = outer
+    with use_deadline(new):
+        yield new
@@ -12,8 +12,38 @@ class NewRelicAPIServerException(Exception):
     message = 'There was an error from New Relic'
 
 
+class NewRelicAPINotFoundException(NewRelicAPIServerException):
+    """
+    An exception for entities New Relic answered 404 Not Found for
+    """
+    message = 'The entity was not found on New Relic'
+
+
 class NoEntityException(Exception):
     """
     An exception for operation to no existed entities
     """
     message = 'No entity exists'
+
+
+class CircuitOpenException(NewRelicAPIServerException):
+    """
+    An exception for requests refused without being sent because the
+    circuit breaker of their host is open
+    """
+    message = 'The circuit breaker for this New Relic host is open'
+
+
+class DeadlineExceededException(Exception):
+    """
+    An exception for operations that ran out of their time budget
+    """
+    message = 'The deadline of the operation has passed'
+
+
+class ReplayMissException(Exception):
+    """
+    An exception for requests a replay transport has no recorded response
+    for
+    """
+    message = 'The request was not recorded'
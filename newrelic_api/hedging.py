@@ -0,0 +1,145 @@
+import fnmatch
+import math
+import threading
+from collections import deque
+
+from newrelic_api.transport import endpoint_template
+
+
+class HedgingPolicy(object):
+    """
+    Decides when a GET request is hedged: if no response arrived after the
+    given percentile of the recent latencies of its endpoint, a duplicate
+    request is sent and whichever response arrives first is used. Only GET
+    requests are hedged, as they are safe to send twice.
+
+    Every request earns ``max_extra`` of a hedge and every hedge spends one,
+    so hedges never add more than that fraction of extra requests once the
+    initial ``burst`` is spent.
+
+    .. code-block:: python
+
+        >>> policy = HedgingPolicy(percentile=95, endpoints=['applications/{id}.json', '*/metrics/data.json'])
+        >>> client = NewRelicClient(hedging=policy)
+    """
+    def __init__(
+            self, percentile=95, endpoints=None, max_extra=0.05, burst=10, window=200, min_samples=20,
+            initial_delay=None):
+        """
+        :type percentile: float
+        :param percentile: The percentile of recent latencies after which a
+            request is hedged
+
+        :type endpoints: list of str
+        :param endpoints: Patterns of the endpoint templates to hedge, e.g.
+            'applications/{id}.json'. All GET requests are hedged if None.
+
+        :type max_extra: float
+        :param max_extra: The maximum number of hedges per request, e.g.
+            0.05 for 5% extra load
+
+        :type burst: int
+        :param burst: The number of hedges that may be sent before the
+            ``max_extra`` ratio applies
+
+        :type window: int
+        :param window: The number of recent latencies kept per endpoint
+
+        :type min_samples: int
+        :param min_samples: The number of latencies an endpoint needs before
+            its percentile is used
+
+        :type initial_delay: float
+        :param initial_delay: The hedging delay used until an endpoint has
+            ``min_samples`` latencies. Requests to it are not hedged if None.
+        """
+        self.percentile = percentile
+        self.endpoints = endpoints
+        self.max_extra = max_extra
+        self.burst = burst
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._tokens = float(burst)
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def applies(self, url):
+        """
+        Returns whether requests to a url may be hedged
+
+        :type url: str
+        :param url: The url of a GET request
+
+        :rtype: bool
+        """
+        if self.endpoints is None:
+            return True
+        template = endpoint_template(url)
+        return any(fnmatch.fnmatch(template, pattern) for pattern in self.endpoints)
+
+    def delay(self, url):
+        """
+        Returns how long to wait for a response before hedging
+
+        :type url: str
+        :param url: The url of a GET request
+
+        :rtype: float
+        :return: The delay in seconds, or None if the request should not be
+            hedged
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint_template(url), ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        index = int(math.ceil(self.percentile / 100.0 * len(latencies))) - 1
+        return latencies[max(0, index)]
+
+    def record(self, url, latency):
+        """
+        Records the latency of a response
+
+        :type url: str
+        :param url: The url of the request
+
+        :type latency: float
+        :param latency: The latency in seconds
+        """
+        template = endpoint_template(url)
+        with self._lock:
+            if template not in self._latencies:
+                self._latencies[template] = deque(maxlen=self.window)
+            self._latencies[template].append(latency)
+
+    def begin(self):
+        """
+        Counts a request and earns its share of a hedge
+        """
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.max_extra)
+
+    def try_hedge(self):
+        """
+        Spends a hedge if the extra load budget allows one
+
+        :rtype: bool
+        :return: Whether a hedge may be sent
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+    def won(self):
+        """
+        Counts a hedge that answered before the request it duplicated
+        """
+        with self._lock:
+            self.hedge_wins += 1
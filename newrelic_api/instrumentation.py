@@ -0,0 +1,394 @@
+import bisect
+import contextlib
+import datetime
+import threading
+
+from newrelic_api.deadline import monotonic
+
+# The stages a request is reported at
+START = 'start'
+END = 'end'
+
+# The phases of a request, see RequestEvent.timings
+PHASES = ('total', 'queue', 'server', 'download', 'decode')
+
+# The upper bounds, in seconds, of the default latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_local = threading.local()
+_hooks_lock = threading.Lock()
+_hooks = ()
+
+
+class RequestTrace(object):
+    """
+    What the transport did to serve one request of a resource. The
+    transport fills in the trace that is current in the calling thread, and
+    in the threads it starts on the request's behalf.
+    """
+    def __init__(self):
+        #: Seconds spent waiting for the concurrency and rate limiters
+        self.queued = 0.0
+        #: The number of times the request was sent, including hedges
+        self.attempts = 0
+        #: Seconds the last attempt took to send and receive, or None
+        self.sent = None
+        #: 'hit', 'stale', 'revalidated' or 'miss', or None without a cache
+        self.cache = None
+        self._lock = threading.Lock()
+
+    def waited(self, seconds):
+        with self._lock:
+            self.queued += seconds
+
+    def attempted(self, seconds):
+        with self._lock:
+            self.attempts += 1
+            self.sent = seconds
+
+
+def current_trace():
+    """
+    Returns the trace of the current thread, or None when no hook is
+    listening
+
+    :rtype: :class:`RequestTrace`
+    """
+    return getattr(_local, 'trace', None)
+
+
+@contextlib.contextmanager
+def use_trace(trace):
+    """
+    Makes a :class:`RequestTrace` current in this thread. None clears it.
+
+    :type trace: :class:`RequestTrace`
+    :param trace: The trace
+    """
+    previous = current_trace()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+class RequestEvent(object):
+    """
+    Describes a request of a resource to hooks, once when it starts and
+    once when it ends
+    """
+    def __init__(
+            self, stage, method, endpoint, url, status_code=None, size=0, retries=0, cache=None, timings=None,
+            error=None):
+        """
+        :type stage: str
+        :param stage: START or END
+
+        :type method: str
+        :param method: The lowercase HTTP verb
+
+        :type endpoint: str
+        :param endpoint: The endpoint template of the url, see
+            :func:`newrelic_api.transport.endpoint_template`
+
+        :type url: str
+        :param url: The url of the request
+
+        :type status_code: int
+        :param status_code: The status of the response, or None if there is
+            none
+
+        :type size: int
+        :param size: The size of the response body in bytes
+
+        :type retries: int
+        :param retries: The number of times the request was sent again,
+            e.g. as a hedge
+
+        :type cache: str
+        :param cache: 'hit', 'stale', 'revalidated' or 'miss', or None
+            without a cache
+
+        :type timings: dict
+        :param timings: Seconds spent in each phase of the request: 'total';
+            'queue', waiting for the limiters; 'server', from sending the
+            request to receiving the response headers, including connecting
+            and the TLS handshake; 'download', receiving the body; and
+            'decode', parsing the JSON. Phases that did not happen, such as
+            'server' for a cached response, are left out.
+
+        :type error: Exception
+        :param error: The exception the request raised, if any
+        """
+        self.stage = stage
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status_code = status_code
+        self.size = size
+        self.retries = retries
+        self.cache = cache
+        self.timings = timings or {}
+        self.error = error
+
+    @property
+    def failed(self):
+        """
+        Whether the request raised or was answered with an error status
+        """
+        return self.error is not None or self.status_code is None or self.status_code >= 400
+
+
+def add_hook(hook):
+    """
+    Registers a hook called with a :class:`RequestEvent` at the start and
+    end of every request of every resource. Hooks are called in the thread
+    sending the request, so they must be thread safe.
+
+    :type hook: callable
+    :param hook: The hook
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook):
+    """
+    Unregisters a hook registered with :func:`add_hook`
+
+    :type hook: callable
+    :param hook: The hook
+    """
+    global _hooks
+    with _hooks_lock:
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+
+
+def global_hooks():
+    """
+    :rtype: tuple
+    :return: The hooks registered with :func:`add_hook`
+    """
+    return _hooks
+
+
+def _size(response):
+    content = getattr(response, 'content', None)
+    return len(content) if isinstance(content, bytes) else 0
+
+
+def _server_time(response):
+    # The time from sending the request to parsing the response headers,
+    # as measured by requests. Cached responses have none.
+    elapsed = getattr(response, 'elapsed', None)
+    return elapsed.total_seconds() if isinstance(elapsed, datetime.timedelta) else None
+
+
+def instrument(hooks, method, endpoint, url, send, check, decode):
+    """
+    Sends a request, checks and decodes its response, and reports the
+    request to hooks
+
+    :type hooks: tuple
+    :param hooks: The hooks to call
+
+    :type send: callable
+    :param send: Sends the request and returns the response
+
+    :type check: callable
+    :param check: Raises if the response is an error
+
+    :type decode: callable
+    :param decode: Decodes the response
+
+    :rtype: tuple
+    :return: The response and its decoded body
+    """
+    for hook in hooks:
+        hook(RequestEvent(START, method, endpoint, url))
+
+    trace = RequestTrace()
+    timings = {}
+    response = error = None
+    started = monotonic()
+    try:
+        with use_trace(trace):
+            response = send()
+        received = monotonic()
+        check(response)
+        body = decode(response)
+        timings['decode'] = monotonic() - received
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        timings['total'] = monotonic() - started
+        if trace.queued:
+            timings['queue'] = trace.queued
+        server = _server_time(response)
+        if server is not None:
+            timings['server'] = server
+            if trace.sent is not None:
+                timings['download'] = max(0.0, trace.sent - server)
+        event = RequestEvent(
+            END, method, endpoint, url, status_code=getattr(response, 'status_code', None), size=_size(response),
+            retries=max(0, trace.attempts - 1), cache=trace.cache, timings=timings, error=error)
+        for hook in hooks:
+            hook(event)
+    return response, body
+
+
+class Histogram(object):
+    """
+    Counts observations in buckets with fixed upper bounds, so that
+    percentiles can be estimated in constant memory
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :type buckets: tuple
+        :param buckets: The increasing upper bounds of the buckets. Larger
+            observations are counted in a last, unbounded bucket.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        :type value: float
+        :param value: The observation
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, percentile):
+        """
+        Estimates a percentile by interpolating within the bucket it falls
+        in. Percentiles in the unbounded bucket are reported as the largest
+        upper bound.
+
+        :type percentile: float
+        :param percentile: The percentile, from 0 to 100
+
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percentile / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _EndpointStats(object):
+    def __init__(self, buckets):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.size = 0
+        self.phases = dict((phase, Histogram(buckets)) for phase in PHASES)
+
+
+class LatencyCollector(object):
+    """
+    A hook keeping latency histograms per endpoint and phase in memory
+
+    .. code-block:: python
+
+        >>> collector = LatencyCollector()
+        >>> client = NewRelicClient(hooks=[collector])
+        >>> client.applications.list()
+        >>> print(collector.report())
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :type buckets: tuple
+        :param buckets: The upper bounds of the histogram buckets in seconds
+        """
+        self.buckets = buckets
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.stage != END:
+            return
+        key = '{0} {1}'.format(event.method.upper(), event.endpoint)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats(self.buckets)
+            stats.requests += 1
+            stats.errors += event.failed
+            stats.retries += event.retries
+            stats.size += event.size
+            for phase, seconds in event.timings.items():
+                stats.phases[phase].observe(seconds)
+
+    def reset(self):
+        """
+        Forgets every request collected so far
+        """
+        with self._lock:
+            self._stats = {}
+
+    def summary(self):
+        """
+        Summarizes the requests collected so far
+
+        :rtype: dict
+        :return: Keyed by verb and endpoint template, e.g.
+            'GET applications/{id}.json', the number of 'requests',
+            'errors' and 'retries', the 'bytes' received, the 'p50', 'p90'
+            and 'p99' total latencies and the mean latency of each phase in
+            'phases'
+        """
+        with self._lock:
+            summary = {}
+            for key, stats in self._stats.items():
+                total = stats.phases['total']
+                summary[key] = {
+                    'requests': stats.requests,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'bytes': stats.size,
+                    'p50': total.percentile(50),
+                    'p90': total.percentile(90),
+                    'p99': total.percentile(99),
+                    'phases': dict(
+                        (phase, histogram.mean) for phase, histogram in stats.phases.items() if histogram.count),
+                }
+            return summary
+
+    def report(self):
+        """
+        Formats the summary as a table, the endpoints that took the most
+        time first
+
+        :rtype: str
+        """
+        summary = self.summary()
+        lines = ['{0:<50} {1:>8} {2:>6} {3:>8} {4:>8} {5:>8} {6:>12}'.format(
+            'endpoint', 'requests', 'errors', 'p50 ms', 'p90 ms', 'p99 ms', 'bytes')]
+        keys = sorted(summary, key=lambda key: -summary[key]['phases'].get('total', 0) * summary[key]['requests'])
+        for key in keys:
+            stats = summary[key]
+            lines.append('{0:<50} {1:>8} {2:>6} {3:>8.1f} {4:>8.1f} {5:>8.1f} {6:>12}'.format(
+                key, stats['requests'], stats['errors'], stats['p50'] * 1000, stats['p90'] * 1000,
+                stats['p99'] * 1000, stats['bytes']))
+        return '\n'.join(lines)
@@ -0,0 +1,93 @@
+try:
+    string_types = (str, unicode)  # noqa: F821
+except NameError:  # pragma: no cover
+    string_types = (str,)
+
+
+class StringInterner(object):
+    """
+    A JSON ``object_pairs_hook`` that de-duplicates repeated strings while a
+    response is decoded.
+
+    Large listings repeat the same keys and values many times (metric value
+    names such as ``average_response_time``, languages, health statuses,
+    label categories). Each decoded object is rebuilt with its keys and short
+    string values replaced by a single shared instance, so processes that
+    keep whole account inventories resident only pay for each distinct
+    string once.
+
+    A single interner can be shared between resources:
+
+    .. code-block:: python
+
+        >>> interner = StringInterner()
+        >>> apps = Applications(object_pairs_hook=interner)
+        >>> servers = Servers(object_pairs_hook=interner)
+    """
+    def __init__(self, max_length=64, max_size=100000):
+        """
+        :type max_length: int
+        :param max_length: String values longer than this are assumed to be
+            high-cardinality (names, urls, descriptions) and are left alone.
+            Keys are always interned.
+
+        :type max_size: int
+        :param max_size: The maximum number of distinct strings to keep. Once
+            the table is full, only strings already in it are de-duplicated.
+        """
+        self.max_length = max_length
+        self.max_size = max_size
+        self._table = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def __call__(self, pairs):
+        """
+        Builds a dict from decoded key/value pairs, interning keys, short
+        string values and short strings inside list values.
+
+        :type pairs: list of tuple
+        :param pairs: The ordered key/value pairs of a decoded JSON object
+
+        :rtype: dict
+        :return: The decoded object
+        """
+        intern = self.intern
+        obj = {}
+        for key, value in pairs:
+            if isinstance(value, string_types):
+                value = self._intern_value(value)
+            elif isinstance(value, list):
+                value = [self._intern_value(v) if isinstance(v, string_types) else v for v in value]
+            obj[intern(key)] = value
+        return obj
+
+    def intern(self, value):
+        """
+        Returns the shared instance of ``value``, adding it to the table if
+        there is still room.
+
+        :type value: str
+        :param value: The string to intern
+
+        :rtype: str
+        :return: A string equal to ``value``
+        """
+        shared = self._table.get(value)
+        if shared is not None:
+            return shared
+        if len(self._table) < self.max_size:
+            self._table[value] = value
+        return value
+
+    def clear(self):
+        """
+        Forgets every interned string.
+        """
+        self._table.clear()
+
+    def _intern_value(self, value):
+        if len(value) > self.max_length:
+            return value
+        return self.intern(value)
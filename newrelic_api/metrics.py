@@ -0,0 +1,198 @@
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from newrelic_api.instrumentation import DEFAULT_BUCKETS, END, START, Histogram
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('{0}="{1}"'.format(name, _escape(value)) for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(object):
+    def __init__(self, name, kind, description, labels=()):
+        self.name = name
+        self.kind = kind
+        self.description = description
+        self.labels = labels
+        self.values = {}
+
+    def header(self):
+        return ['# HELP {0} {1}'.format(self.name, self.description), '# TYPE {0} {1}'.format(self.name, self.kind)]
+
+
+class _Counter(_Metric):
+    def __init__(self, name, description, labels=()):
+        super(_Counter, self).__init__(name, 'counter', description, labels)
+
+    def inc(self, values=(), amount=1):
+        self.values[values] = self.values.get(values, 0) + amount
+
+    def lines(self):
+        return [
+            '{0}{1} {2}'.format(self.name, _labels(self.labels, values), _number(value))
+            for values, value in sorted(self.values.items())
+        ]
+
+
+class _Gauge(_Counter):
+    def __init__(self, name, description, labels=()):
+        super(_Gauge, self).__init__(name, description, labels)
+        self.kind = 'gauge'
+
+
+class _Histogram(_Metric):
+    def __init__(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        super(_Histogram, self).__init__(name, 'histogram', description, labels)
+        self.buckets = buckets
+
+    def observe(self, values, value):
+        histogram = self.values.get(values)
+        if histogram is None:
+            histogram = self.values[values] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def lines(self):
+        lines = []
+        for values, histogram in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                cumulative += count
+                lines.append('{0}_bucket{1} {2}'.format(
+                    self.name, _labels(self.labels, values, [('le', _number(bound))]), cumulative))
+            lines.append('{0}_sum{1} {2}'.format(self.name, _labels(self.labels, values), _number(histogram.sum)))
+            lines.append('{0}_count{1} {2}'.format(self.name, _labels(self.labels, values), histogram.count))
+        return lines
+
+
+class PrometheusMetrics(object):
+    """
+    A hook that counts requests in Prometheus metrics, exposed in the text
+    format by :meth:`render` or over HTTP by :meth:`serve`
+
+    .. code-block:: python
+
+        >>> metrics = PrometheusMetrics()
+        >>> client = NewRelicClient(hooks=[metrics])
+        >>> server = metrics.serve(port=9464)
+    """
+    def __init__(self, prefix='newrelic_api', buckets=DEFAULT_BUCKETS):
+        """
+        :type prefix: str
+        :param prefix: The prefix of every metric name
+
+        :type buckets: tuple
+        :param buckets: The upper bounds of the histogram buckets in seconds
+        """
+        self.prefix = prefix
+        self.requests = _Counter(
+            prefix + '_requests_total', 'Requests sent, by verb, endpoint and status',
+            ('method', 'endpoint', 'status'))
+        self.errors = _Counter(
+            prefix + '_request_errors_total', 'Requests that raised or were answered with an error status',
+            ('method', 'endpoint'))
+        self.retries = _Counter(
+            prefix + '_request_retries_total', 'Extra attempts sent for requests, such as hedges',
+            ('method', 'endpoint'))
+        self.cache = _Counter(
+            prefix + '_cache_lookups_total', 'Cache lookups of GET requests, by result', ('result',))
+        self.duration = _Histogram(
+            prefix + '_request_duration_seconds', 'Time to send a request and decode its response',
+            ('method', 'endpoint'), buckets)
+        self.wait = _Histogram(
+            prefix + '_rate_limiter_wait_seconds', 'Time requests waited for the rate and concurrency limiters',
+            (), buckets)
+        self.in_flight = _Gauge(prefix + '_requests_in_flight', 'Requests started and not yet ended')
+        self.in_flight.inc((), 0)
+        self._metrics = (
+            self.requests, self.errors, self.retries, self.cache, self.duration, self.wait, self.in_flight)
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            if event.stage == START:
+                self.in_flight.inc((), 1)
+            elif event.stage == END:
+                self._count(event)
+
+    def _count(self, event):
+        self.in_flight.inc((), -1)
+        labels = (event.method.upper(), event.endpoint)
+        status = str(event.status_code) if event.status_code is not None else 'error'
+        self.requests.inc(labels + (status,))
+        if event.failed:
+            self.errors.inc(labels)
+        if event.retries:
+            self.retries.inc(labels, event.retries)
+        if event.cache is not None:
+            self.cache.inc((event.cache,))
+        if 'total' in event.timings:
+            self.duration.observe(labels, event.timings['total'])
+        if 'queue' in event.timings:
+            self.wait.observe((), event.timings['queue'])
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text exposition format
+
+        :rtype: str
+        """
+        lines = []
+        with self._lock:
+            for metric in self._metrics:
+                lines.extend(metric.header())
+                lines.extend(metric.lines())
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """
+        Serves :meth:`render` to scrapers from a background thread. Call
+        ``shutdown()`` on the returned server to stop it.
+
+        :type port: int
+        :param port: The port to listen on, 0 picks a free one
+
+        :type host: str
+        :param host: The address to listen on, only the local host by
+            default
+
+        :rtype: :class:`http.server.HTTPServer`
+        :return: The server, its ``server_port`` is the port it listens on
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
@@ -169,3 +169,40 @@ class Plugins(Resource):
             headers=self.headers,
             params=self.build_param_string(filters) or None
         )
+
+    def show_many(self, ids, detailed=None, batch_size=None, max_workers=None):
+        """
+        Returns many plugins at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: Plugin IDs
+
+        :type detailed: bool
+        :param detailed: Include all data about the plugins
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The plugins keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "name": "string",
+                    "guid": "string",
+                    ...
+                }
+            }
+
+        """
+        return self._show_many(
+            self.list, 'plugins', ids, batch_size=batch_size, max_workers=max_workers, detailed=detailed)
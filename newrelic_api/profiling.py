@@ -0,0 +1,257 @@
+import contextlib
+import os
+import sys
+import threading
+import traceback
+
+from newrelic_api.instrumentation import END, add_hook, remove_hook
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_THREADING_FILE = os.path.splitext(os.path.abspath(threading.__file__))[0] + '.py'
+_FUTURES_DIR = os.path.join('concurrent', 'futures')
+
+# Batched alternatives to requests that are often sent in a loop, keyed by
+# verb and endpoint template
+SUGGESTIONS = {
+    ('get', 'applications/{id}.json'): 'Applications.show_many(ids) fetches up to 100 applications per request',
+    ('get', 'dashboards/{id}.json'): 'Dashboards.show_many(ids) fetches up to 100 dashboards per request',
+    ('get', 'key_transactions/{id}.json'):
+        'KeyTransactions.show_many(ids) fetches up to 100 key transactions per request',
+    ('get', 'plugins/{id}.json'): 'Plugins.show_many(ids) fetches up to 100 plugins per request',
+    ('get', 'servers/{id}.json'): 'Servers.show_many(ids) fetches up to 100 servers per request',
+    ('get', 'users/{id}.json'): 'Users.show_many(ids) fetches up to 100 users per request',
+    ('get', 'alerts_conditions.json'):
+        'AlertConditions.update lists every condition of the policy, list them once and reuse the listing '
+        'or give the client a cache',
+    ('get', 'alerts_nrql_conditions.json'):
+        'AlertConditionsNRQL.update lists every condition of the policy, list them once and reuse the listing '
+        'or give the client a cache',
+    ('get', 'applications/{id}/metrics/data.json'):
+        'metric_data accepts a list of names, ask for several metrics in one call',
+    ('get', 'applications/{id}/hosts/{id}/metrics/data.json'):
+        'metric_data accepts a list of names, ask for several metrics in one call',
+    ('get', 'applications/{id}/instances/{id}/metrics/data.json'):
+        'metric_data accepts a list of names, ask for several metrics in one call',
+    ('get', 'components/{id}/metrics/data.json'):
+        'metric_data accepts a list of names, ask for several metrics in one call',
+    ('get', 'servers/{id}/metrics/data.json'):
+        'metric_data accepts a list of names, ask for several metrics in one call',
+}
+
+# Writes that resource methods precede with a read, keyed by the verb and
+# endpoint template of the write
+READS_BEFORE_WRITES = {
+    ('put', 'applications/{id}.json'): (
+        'applications/{id}.json', 'Applications.update shows the application first to fill in missing settings'),
+    ('put', 'servers/{id}.json'): (
+        'servers/{id}.json', 'Servers.update shows the server first to fill in a missing name'),
+    ('put', 'alerts_conditions/{id}.json'): (
+        'alerts_conditions.json', 'AlertConditions.update lists every condition of the policy to find one'),
+    ('put', 'alerts_nrql_conditions/{id}.json'): (
+        'alerts_nrql_conditions.json', 'AlertConditionsNRQL.update lists every condition of the policy to find one'),
+}
+
+DEFAULT_SUGGESTION = 'Batch these requests, or give the client a cache if the responses repeat'
+
+# The helpers that already batch the requests they send
+_BATCHING_HELPERS = ('_list_all', '_show_many')
+
+
+def _is_internal(filename):
+    filename = os.path.abspath(filename)
+    if filename.startswith(_PACKAGE_DIR + os.sep):
+        # The package's own tests are callers like any other
+        return not filename[len(_PACKAGE_DIR) + 1:].startswith('tests' + os.sep)
+    return filename == _THREADING_FILE or _FUTURES_DIR in filename
+
+
+def call_site():
+    """
+    Finds the code that sent the request of the current thread
+
+    :rtype: tuple
+    :return: The innermost frame of the stack outside this library and the
+        threading machinery it runs requests on, as a (file name, line
+        number, function name) tuple, or None for a library worker thread;
+        and whether a batching helper such as ``show_many`` sent the request
+    """
+    batched = False
+    for filename, lineno, function, _ in reversed(traceback.extract_stack()):
+        if not _is_internal(filename):
+            return (filename, lineno, function), batched
+        batched = batched or function in _BATCHING_HELPERS
+    return None, batched
+
+
+class Call(object):
+    """
+    A request recorded by a :class:`Profile`
+    """
+    def __init__(self, method, endpoint, url, site, batched, duration, status_code):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.site = site
+        #: Whether a batching helper, such as a listing following its pages,
+        #: sent the request
+        self.batched = batched
+        self.duration = duration
+        self.status_code = status_code
+
+
+class Finding(object):
+    """
+    A call site that sent requests a batched call could have avoided
+    """
+    def __init__(self, site, method, endpoint, count, duration, suggestion, read=None):
+        self.site = site
+        self.method = method
+        self.endpoint = endpoint
+        self.count = count
+        self.duration = duration
+        self.suggestion = suggestion
+        #: The endpoint read before each write, for reads before writes
+        self.read = read
+
+
+def _format_site(site):
+    if site is None:
+        return '<library worker thread>'
+    return '{0}:{1} in {2}'.format(os.path.relpath(site[0]), site[1], site[2])
+
+
+class Profile(object):
+    """
+    A hook recording every request that reaches the API with the line of
+    code that sent it. Cache hits are not recorded, as they cost no round
+    trip.
+    """
+    def __init__(self, threshold=3):
+        """
+        :type threshold: int
+        :param threshold: The number of requests to one endpoint from one
+            call site that is reported as a loop
+        """
+        self.threshold = threshold
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.stage != END or event.cache in ('hit', 'stale'):
+            return
+        site, batched = call_site()
+        call = Call(
+            event.method, event.endpoint, event.url, site, batched, event.timings.get('total', 0.0),
+            event.status_code)
+        with self._lock:
+            self.calls.append(call)
+
+    def _by_site(self, batched=True):
+        groups = {}
+        with self._lock:
+            for call in self.calls:
+                if call.batched and not batched:
+                    continue
+                groups.setdefault((call.site, call.method, call.endpoint), []).append(call)
+        return groups
+
+    def repeated(self):
+        """
+        Finds call sites that sent at least ``threshold`` requests to one
+        endpoint, most requests first. Requests sent by batching helpers,
+        such as the pages of a listing, are left out.
+
+        :rtype: list of :class:`Finding`
+        """
+        findings = [
+            Finding(site, method, endpoint, len(calls), sum(call.duration for call in calls),
+                    SUGGESTIONS.get((method, endpoint), DEFAULT_SUGGESTION))
+            for (site, method, endpoint), calls in self._by_site(batched=False).items()
+            if site is not None and len(calls) >= self.threshold
+        ]
+        return sorted(findings, key=lambda finding: -finding.count)
+
+    def reads_before_writes(self):
+        """
+        Finds call sites whose writes were preceded by a read made by the
+        resource method, such as the show ``Servers.update`` starts with
+
+        :rtype: list of :class:`Finding`
+        """
+        groups = self._by_site()
+        findings = []
+        for site, method, endpoint in groups:
+            if (method, endpoint) not in READS_BEFORE_WRITES:
+                continue
+            read, suggestion = READS_BEFORE_WRITES[(method, endpoint)]
+            reads = groups.get((site, 'get', read), [])
+            if reads:
+                findings.append(Finding(
+                    site, method, endpoint, len(reads), sum(call.duration for call in reads), suggestion, read=read))
+        return sorted(findings, key=lambda finding: -finding.count)
+
+    def report(self):
+        """
+        Formats the findings with the batched alternatives to each
+
+        :rtype: str
+        """
+        lines = ['{0} requests in {1:.3f}s'.format(len(self.calls), sum(call.duration for call in self.calls))]
+        repeated = self.repeated()
+        if repeated:
+            lines.append('Repeated requests:')
+            for finding in repeated:
+                lines.append('  {0}: {1} {2} x{3} ({4:.3f}s)'.format(
+                    _format_site(finding.site), finding.method.upper(), finding.endpoint, finding.count,
+                    finding.duration))
+                lines.append('    -> {0}'.format(finding.suggestion))
+        reads = self.reads_before_writes()
+        if reads:
+            lines.append('Reads before writes:')
+            for finding in reads:
+                lines.append('  {0}: GET {1} before {2} {3} x{4} ({5:.3f}s)'.format(
+                    _format_site(finding.site), finding.read, finding.method.upper(), finding.endpoint,
+                    finding.count, finding.duration))
+                lines.append('    -> {0}'.format(finding.suggestion))
+        if not repeated and not reads:
+            lines.append('No repeated requests found')
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profile(threshold=3, stream=None, print_report=True):
+    """
+    Records every request sent inside the block, by any resource and
+    thread, and prints a report of the call sites that send requests in a
+    loop when the block ends
+
+    .. code-block:: python
+
+        >>> with profile() as result:
+        ...     for server_id in server_ids:
+        ...         servers.show(server_id)
+        5 requests in 0.734s
+        Repeated requests:
+          sync.py:12 in sync: GET servers/{id}.json x5 (0.734s)
+            -> Servers.show_many(ids) fetches up to 100 servers per request
+
+    :type threshold: int
+    :param threshold: The number of requests to one endpoint from one call
+        site that is reported as a loop
+
+    :type stream: file
+    :param stream: Where the report is printed, stderr by default
+
+    :type print_report: bool
+    :param print_report: Whether to print the report
+
+    :rtype: :class:`Profile`
+    """
+    result = Profile(threshold=threshold)
+    add_hook(result)
+    try:
+        yield result
+    finally:
+        remove_hook(result)
+    if print_report:
+        (stream or sys.stderr).write(result.report() + '\n')
@@ -0,0 +1,182 @@
+import collections
+import datetime
+import gzip
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from newrelic_api.deadline import monotonic
+from newrelic_api.exceptions import ConfigurationException, ReplayMissException
+from newrelic_api.transport import Transport
+
+RECORDING_VERSION = 1
+
+
+def exchange_key(method, url, params=None, data=None):
+    """
+    Returns the key a recorded exchange is replayed for: the verb, url,
+    query parameters and body of its request. Request headers, which hold
+    the API key, are not part of it.
+
+    :rtype: str
+    """
+    return json.dumps([method, url, params, data], sort_keys=True, separators=(',', ':'))
+
+
+class RecordingTransport(Transport):
+    """
+    A transport that records the requests it sends and the responses it
+    receives, with their ``Link`` headers and latencies, so that they can be
+    replayed offline by a :class:`ReplayTransport`. Only requests that reach
+    the network are recorded, not cache hits. Request headers are left out.
+
+    .. code-block:: python
+
+        >>> transport = RecordingTransport()
+        >>> client = NewRelicClient(transport=transport)
+        >>> client.servers.list()
+        >>> transport.save('servers.json.gz')
+    """
+    def __init__(self, *args, **kwargs):
+        super(RecordingTransport, self).__init__(*args, **kwargs)
+        self.exchanges = []
+        self._exchanges_lock = threading.Lock()
+
+    def _send(self, method, url, **kwargs):
+        started = monotonic()
+        response = super(RecordingTransport, self)._send(method, url, **kwargs)
+        latency = monotonic() - started
+        exchange = {
+            'method': method,
+            'url': url,
+            'params': kwargs.get('params'),
+            'data': kwargs.get('data'),
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'content': response.content.decode('utf-8'),
+            'latency': latency,
+        }
+        with self._exchanges_lock:
+            self.exchanges.append(exchange)
+        return response
+
+    def save(self, path):
+        """
+        Writes the recorded exchanges to a gzipped JSON file. The file is
+        replaced atomically.
+
+        :type path: str
+        :param path: The recording file
+
+        :rtype: int
+        :return: The number of exchanges written
+        """
+        with self._exchanges_lock:
+            exchanges = list(self.exchanges)
+        recording = {'version': RECORDING_VERSION, 'exchanges': exchanges}
+        temporary = '{0}.{1}.tmp'.format(path, os.getpid())
+        with gzip.open(temporary, 'wb') as f:
+            f.write(json.dumps(recording, separators=(',', ':')).encode('utf-8'))
+        getattr(os, 'replace', os.rename)(temporary, path)
+        return len(exchanges)
+
+
+def load_recording(path):
+    """
+    Reads the exchanges written by :meth:`RecordingTransport.save`
+
+    :type path: str
+    :param path: The recording file
+
+    :rtype: list of dicts
+
+    :raises: A :class:`newrelic_api.exceptions.ConfigurationException` if
+        the file was written by an incompatible version
+    """
+    with gzip.open(path, 'rb') as f:
+        recording = json.loads(f.read().decode('utf-8'))
+    if recording.get('version') != RECORDING_VERSION:
+        raise ConfigurationException('{0} is not a recording this version can replay'.format(path))
+    return recording['exchanges']
+
+
+class ReplayTransport(Transport):
+    """
+    A transport that answers requests with recorded responses instead of
+    sending them. The responses recorded for one request are replayed in
+    the order they were recorded, starting over once they are used up, so
+    that a replay is deterministic however many times it runs. Caching,
+    rate limiting and the other transport features work as they do against
+    the API.
+
+    .. code-block:: python
+
+        >>> transport = ReplayTransport('servers.json.gz', latency='recorded')
+        >>> client = NewRelicClient(api_key='replay', transport=transport)
+        >>> client.servers.list()
+    """
+    def __init__(self, recording, latency=None, sleep=time.sleep, **kwargs):
+        """
+        :type recording: str or list
+        :param recording: The path of a recording, or its exchanges
+
+        :type latency: str, float or callable
+        :param latency: How long each response takes: None answers at once,
+            'recorded' takes as long as the recorded response, a number of
+            seconds applies to every response, and a callable is called with
+            the recorded exchange and returns the seconds, e.g. to draw
+            synthetic latencies from a distribution
+
+        :type sleep: callable
+        :param sleep: Waits a number of seconds
+
+        The other keyword arguments are passed to :class:`Transport`.
+        """
+        super(ReplayTransport, self).__init__(**kwargs)
+        if not isinstance(recording, list):
+            recording = load_recording(recording)
+        self.latency = latency
+        self.sleep = sleep
+        self._recorded = collections.defaultdict(list)
+        for exchange in recording:
+            key = exchange_key(exchange['method'], exchange['url'], exchange['params'], exchange['data'])
+            self._recorded[key].append(exchange)
+        self._positions = collections.defaultdict(int)
+        self._replay_lock = threading.Lock()
+
+    def _send(self, method, url, **kwargs):
+        key = exchange_key(method, url, kwargs.get('params'), kwargs.get('data'))
+        with self._replay_lock:
+            exchanges = self._recorded.get(key)
+            if not exchanges:
+                raise ReplayMissException('No response was recorded for {0} {1}'.format(method.upper(), url))
+            exchange = exchanges[self._positions[key] % len(exchanges)]
+            self._positions[key] += 1
+
+        seconds = self._latency(exchange)
+        if seconds:
+            self.sleep(seconds)
+        return self._response(exchange, seconds)
+
+    def _latency(self, exchange):
+        if self.latency is None:
+            return 0.0
+        if self.latency == 'recorded':
+            return exchange['latency']
+        if callable(self.latency):
+            return self.latency(exchange)
+        return self.latency
+
+    def _response(self, exchange, seconds):
+        response = requests.Response()
+        response.status_code = exchange['status_code']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response._content = exchange['content'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = exchange['url']
+        response.elapsed = datetime.timedelta(seconds=seconds)
+        return response
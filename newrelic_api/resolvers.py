@@ -0,0 +1,162 @@
+import threading
+
+from newrelic_api.exceptions import ConfigurationException, NoEntityException
+from newrelic_api.transport import monotonic
+
+
+class NameResolver(object):
+    """
+    Resolves entities by their exact name, email or title. The first lookup
+    builds an index from a full paginated listing, and later lookups are
+    served from memory.
+
+    The ``filter[name]`` style list filters match substrings, so the index
+    is the only way to match exactly without client side filtering. Names
+    missing from the index are looked up with one filtered list request and
+    added to it, so entities created after the index was built are found
+    without a full rebuild. The index is rebuilt once it is older than
+    ``max_age``; with a cache on the transport, unchanged pages of that
+    listing are revalidated rather than downloaded again.
+
+    .. code-block:: python
+
+        >>> resolver = NameResolver(Applications())
+        >>> resolver.get_id('Marketing Website')
+        1234567
+        >>> resolver.get_name(1234567)
+        'Marketing Website'
+    """
+    # Maps resource classes to the key of the entities in list responses,
+    # the field entities are resolved by and the list filter for that field
+    FIELDS = {
+        'Applications': ('applications', 'name', 'filter_name'),
+        'Dashboards': ('dashboards', 'title', 'filter_title'),
+        'Servers': ('servers', 'name', 'filter_name'),
+        'Users': ('users', 'email', 'filter_email'),
+    }
+
+    def __init__(self, resource, max_age=300, clock=monotonic):
+        """
+        :type resource: :class:`newrelic_api.base.Resource`
+        :param resource: An Applications, Dashboards, Servers or Users
+            resource
+
+        :type max_age: float
+        :param max_age: The number of seconds after which the index is
+            rebuilt from a full listing
+
+        :raises: A :class:`newrelic_api.exceptions.ConfigurationException` if
+            entities of the resource cannot be resolved by name
+        """
+        for cls in type(resource).__mro__:
+            if cls.__name__ in self.FIELDS:
+                self.key, self.field, self.filter_arg = self.FIELDS[cls.__name__]
+                break
+        else:
+            raise ConfigurationException('{0} entities cannot be resolved by name'.format(type(resource).__name__))
+
+        self.resource = resource
+        self.max_age = max_age
+        self.clock = clock
+        self.built_at = None
+        self._by_field = {}
+        self._by_id = {}
+        self._missing = set()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def build(self):
+        """
+        Rebuilds the index from a full listing
+        """
+        entities = self.resource._list_all(self.resource.list, self.key)
+        with self._lock:
+            self._by_field = {}
+            self._by_id = {}
+            self._missing = set()
+            for entity in entities:
+                self._add(entity)
+            self.built_at = self.clock()
+
+    def get_all(self, value):
+        """
+        Returns every entity whose field equals a value exactly
+
+        :type value: str
+        :param value: The name, email or title
+
+        :rtype: list of dicts
+        :return: The matching entities, as returned by the list endpoint
+        """
+        with self._lock:
+            if self.built_at is None or self.clock() - self.built_at >= self.max_age:
+                self.build()
+            if value not in self._by_field and value not in self._missing:
+                self._lookup(value)
+            return [self._by_id[entity_id] for entity_id in self._by_field.get(value, [])]
+
+    def get(self, value):
+        """
+        Returns the entity whose field equals a value exactly. If several
+        entities match, the one with the lowest id is returned.
+
+        :type value: str
+        :param value: The name, email or title
+
+        :rtype: dict
+        :return: The entity, as returned by the list endpoint
+
+        :raises: A :class:`newrelic_api.exceptions.NoEntityException` if no
+            entity matches
+        """
+        entities = self.get_all(value)
+        if not entities:
+            raise NoEntityException('No {0} with {1} {2!r}'.format(self.key, self.field, value))
+        return min(entities, key=lambda entity: entity['id'])
+
+    def get_id(self, value):
+        """
+        Returns the id of the entity whose field equals a value exactly, see
+        :meth:`get`
+
+        :rtype: int
+        """
+        return self.get(value)['id']
+
+    def get_name(self, entity_id):
+        """
+        Returns the name, email or title of an entity in the index
+
+        :type entity_id: int
+        :param entity_id: The entity id
+
+        :rtype: str
+
+        :raises: A :class:`newrelic_api.exceptions.NoEntityException` if the
+            entity is not in the index
+        """
+        with self._lock:
+            if self.built_at is None or self.clock() - self.built_at >= self.max_age:
+                self.build()
+            if entity_id not in self._by_id:
+                raise NoEntityException('No {0} with id {1}'.format(self.key, entity_id))
+            return self._by_id[entity_id][self.field]
+
+    def _lookup(self, value):
+        # Every entity the substring filter returns is current, index them all
+        for entity in self.resource._list_all(self.resource.list, self.key, **{self.filter_arg: value}):
+            self._add(entity)
+        if value not in self._by_field:
+            self._missing.add(value)
+
+    def _add(self, entity):
+        previous = self._by_id.get(entity['id'])
+        if previous is not None:
+            ids = self._by_field.get(previous.get(self.field), set())
+            ids.discard(entity['id'])
+            if not ids:
+                self._by_field.pop(previous.get(self.field), None)
+        self._by_id[entity['id']] = entity
+        self._by_field.setdefault(entity.get(self.field), set()).add(entity['id'])
@@ -0,0 +1,167 @@
+import contextlib
+import threading
+from collections import deque
+
+from newrelic_api.deadline import current_deadline, monotonic
+from newrelic_api.exceptions import ConfigurationException, DeadlineExceededException
+
+INTERACTIVE = 'interactive'
+NORMAL = 'normal'
+BULK = 'bulk'
+
+# Classes earlier in the list win ties
+PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+
+_local = threading.local()
+
+
+def explicit_priority():
+    """
+    Returns the priority set with :func:`priority` in this thread, or None
+
+    :rtype: str
+    """
+    return getattr(_local, 'priority', None)
+
+
+def current_priority():
+    """
+    Returns the priority of requests sent from this thread, 'normal' unless
+    set with :func:`priority`
+
+    :rtype: str
+    """
+    return explicit_priority() or NORMAL
+
+
+@contextlib.contextmanager
+def priority(name):
+    """
+    Sets the priority of the requests sent inside the block. Listings that
+    follow every page and ``show_many`` run as 'bulk' unless a priority is
+    set.
+
+    .. code-block:: python
+
+        >>> with priority('interactive'):
+        ...     server = client.servers.show(1234)
+
+    :type name: str
+    :param name: 'interactive', 'normal', 'bulk' or None to unset it
+
+    :raises: A :class:`newrelic_api.exceptions.ConfigurationException` if the
+        priority is unknown
+    """
+    if name is not None and name not in PRIORITIES:
+        raise ConfigurationException('Unknown priority {0!r}'.format(name))
+    previous = explicit_priority()
+    _local.priority = name
+    try:
+        yield name
+    finally:
+        _local.priority = previous
+
+
+class PriorityScheduler(object):
+    """
+    A rate limiter that hands out tokens by priority rather than in arrival
+    order. Used as the rate limiter of a transport, interactive requests
+    are sent ahead of queued bulk pagination and fan-out.
+
+    Priorities share tokens by weight with stride scheduling: under
+    contention each class receives tokens in proportion to its weight, so
+    with the default weights bulk requests still get at least one token in
+    thirteen. A class that was idle does not accumulate credit.
+
+    .. code-block:: python
+
+        >>> client = NewRelicClient(rate_limiter=PriorityScheduler(rate=10))
+    """
+    DEFAULT_WEIGHTS = {INTERACTIVE: 8, NORMAL: 4, BULK: 1}
+
+    def __init__(self, rate, burst=1, weights=None, clock=monotonic):
+        """
+        :type rate: float
+        :param rate: The sustained number of requests allowed per second
+
+        :type burst: int
+        :param burst: The number of requests that may be sent back to back
+            after a quiet period
+
+        :type weights: dict
+        :param weights: The share of tokens of each priority under
+            contention, defaults to DEFAULT_WEIGHTS
+        """
+        self.rate = float(rate)
+        self.burst = burst
+        self.weights = dict(self.DEFAULT_WEIGHTS, **(weights or {}))
+        self.granted = dict((name, 0) for name in PRIORITIES)
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._queues = dict((name, deque()) for name in PRIORITIES)
+        self._passes = dict((name, 0.0) for name in PRIORITIES)
+        self._virtual = 0.0
+        self._condition = threading.Condition()
+
+    def waiting(self):
+        """
+        Returns the number of callers waiting for a token by priority
+
+        :rtype: dict
+        """
+        with self._condition:
+            return dict((name, len(queue)) for name, queue in self._queues.items())
+
+    def acquire(self):
+        """
+        Takes a token for the priority of the calling thread, blocking until
+        one is available and no caller that should go first is waiting
+
+        :rtype: float
+        :return: The number of seconds spent waiting
+
+        :raises: A :class:`newrelic_api.exceptions.DeadlineExceededException`
+            if the current deadline passes while waiting
+        """
+        name = current_priority()
+        current = current_deadline()
+        ticket = object()
+        started = self._clock()
+        with self._condition:
+            queue = self._queues[name]
+            if not queue:
+                # An idle class resumes at the current virtual time
+                self._passes[name] = max(self._passes[name], self._virtual)
+            queue.append(ticket)
+            try:
+                while not self._try_grant(name, ticket):
+                    wait = None if self._tokens >= 1 else (1 - self._tokens) / self.rate
+                    if current is not None:
+                        current.check()
+                        wait = current.remaining() if wait is None else min(wait, current.remaining())
+                    self._condition.wait(wait)
+            except DeadlineExceededException:
+                queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+        return self._clock() - started
+
+    def _try_grant(self, name, ticket):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1 or self._next() != name or self._queues[name][0] is not ticket:
+            return False
+
+        self._tokens -= 1
+        self._queues[name].popleft()
+        self._virtual = self._passes[name]
+        self._passes[name] += 1.0 / self.weights[name]
+        self.granted[name] += 1
+        self._condition.notify_all()
+        return True
+
+    def _next(self):
+        waiting = [name for name in PRIORITIES if self._queues[name]]
+        return min(waiting, key=lambda name: (self._passes[name], PRIORITIES.index(name)))
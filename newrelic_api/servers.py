@@ -120,6 +120,40 @@ class Servers(Resource):
             headers=self.headers,
         )
 
+    def show_many(self, ids, batch_size=None, max_workers=None):
+        """
+        Returns many servers at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: Server IDs
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The servers keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "account_id": "integer",
+                    "name": "string",
+                    "host": "string",
+                    ...
+                }
+            }
+
+        """
+        return self._show_many(self.list, 'servers', ids, batch_size=batch_size, max_workers=max_workers)
+
     def update(self, id, name=None):
         """
         Updates any of the optional parameters of the server
@@ -0,0 +1,613 @@
+import collections
+import datetime
+import json
+import random
+import re
+import threading
+import zlib
+
+import requests
+
+try:
+    from urllib.parse import parse_qsl, urlencode, urlsplit
+except ImportError:  # pragma: no cover
+    from urllib import urlencode
+    from urlparse import parse_qsl, urlsplit
+
+from newrelic_api.testing.fixtures import DEFAULT_SIZES, Fixtures, MetricNames, format_time, generate
+
+# The default number of entities in a page of a listing
+PAGE_SIZE = 200
+
+# The default number of metric names in a page of a metric names listing
+METRIC_NAMES_PAGE_SIZE = 1000
+
+# Maps each collection to the keys of its list and show responses, and its
+# list filters to the field they match and how
+COLLECTIONS = {
+    'alerts_channels': ('channels', 'channels', {}),
+    'alerts_conditions': ('conditions', 'condition', {}),
+    'alerts_nrql_conditions': ('nrql_conditions', 'nrql_condition', {}),
+    'alerts_policies': ('policies', 'policy', {'filter[name]': ('name', 'contains')}),
+    'application_hosts': ('application_hosts', 'application_host', {
+        'filter[hostname]': ('host', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'application_instances': ('application_instances', 'application_instance', {
+        'filter[hostname]': ('host', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'applications': ('applications', 'application', {
+        'filter[name]': ('name', 'contains'), 'filter[ids]': ('id', 'in'), 'filter[language]': ('language', 'in')}),
+    'browser_applications': ('browser_applications', 'browser_application', {
+        'filter[name]': ('name', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'components': ('components', 'component', {'filter[name]': ('name', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'dashboards': ('dashboards', 'dashboard', {'filter[title]': ('title', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'infra_conditions': ('data', 'data', {}),
+    'key_transactions': ('key_transactions', 'key_transaction', {
+        'filter[name]': ('name', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'labels': ('labels', 'label', {}),
+    'plugins': ('plugins', 'plugin', {'filter[guid]': ('guid', 'equals'), 'filter[ids]': ('id', 'in')}),
+    'servers': ('servers', 'server', {'filter[name]': ('name', 'contains'), 'filter[ids]': ('id', 'in')}),
+    'users': ('users', 'user', {'filter[email]': ('email', 'contains'), 'filter[ids]': ('id', 'in')}),
+}
+
+# The collections listed per parent, and the query parameter naming it
+_SCOPED = {
+    'alerts_conditions': 'policy_id',
+    'alerts_nrql_conditions': 'policy_id',
+    'infra_conditions': 'policy_id',
+}
+
+# The collections nested under an application
+_NESTED = {'hosts': 'application_hosts', 'instances': 'application_instances'}
+
+# The sizes of DEFAULT_SIZES that do not grow with the scale of populate
+_PER_PARENT = ('_per_application', '_per_policy', '_metric_names')
+
+_VERSION_ROOT = re.compile(r'^[a-z]+://[^/]+/v2/')
+
+# Maps url paths, relative to the version root, to the Backend methods
+# answering them. The first match wins.
+_ROUTES = [(re.compile(pattern), handler) for pattern, handler in (
+    (r'^alerts/conditions$', '_infra_conditions'),
+    (r'^alerts/conditions/(?P<key>\d+)$', '_infra_condition'),
+    (r'^(?P<path>.+)/metrics\.json$', '_metric_names'),
+    (r'^(?P<path>.+)/metrics/data\.json$', '_metric_data'),
+    (r'^alerts_policy_channels\.json$', '_policy_channels'),
+    (r'^labels/labels/(?P<key>.+)\.json$', '_label'),
+    (r'^(?P<collection>alerts_conditions|alerts_nrql_conditions)/policies/(?P<parent>\d+)\.json$',
+     '_policy_conditions'),
+    (r'^applications/(?P<parent>\d+)/(?P<nested>hosts|instances)\.json$', '_nested'),
+    (r'^(?P<collection>[a-z_]+)\.json$', '_collection'),
+    (r'^(?P<path>[a-z_]+/\d+(?:/(?:hosts|instances)/\d+)?)\.json$', '_entity'),
+)]
+_ENTITY = re.compile(r'^(?P<collection>[a-z_]+)/(?P<id>\d+)(?:/(?P<nested>hosts|instances)/(?P<nested_id>\d+))?$')
+_TIME_FORMATS = ('%Y-%m-%dT%H:%M:%S+00:00', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S')
+
+
+class BackendResponse(object):
+    """
+    The status, headers and body the backend answered a request with
+    """
+    def __init__(self, status_code, body=None, headers=None):
+        """
+        :type status_code: int
+        :param status_code: The HTTP status code
+
+        :type body: dict
+        :param body: The JSON body, or None for an empty body
+
+        :type headers: dict
+        :param headers: The response headers
+        """
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'application/json'}
+        self.headers.update(headers or {})
+        self.content = b'' if body is None else json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+    def to_response(self, url=None):
+        """
+        :type url: str
+        :param url: The url the response answers
+
+        :rtype: :class:`requests.Response`
+        :return: A response as ``requests`` returns it
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers.update(self.headers)
+        response._content = self.content
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+
+class _Request(object):
+    def __init__(self, method, base, query, body):
+        self.method = method
+        self.base = base
+        self.query = query
+        self.params = dict(query)
+        self.body = body
+
+
+def _error(status_code, title):
+    return BackendResponse(status_code, {'error': {'title': title}})
+
+
+def _parse_time(value, default):
+    for time_format in _TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, time_format)
+        except (TypeError, ValueError):
+            continue
+    return default
+
+
+def _assign(collection, entity):
+    # Fills in the fields the API sets on the entities it creates
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    millis = int((now - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
+    if collection == 'alerts_policies':
+        entity.update(created_at=millis, updated_at=millis)
+    elif collection == 'infra_conditions':
+        entity.update(created_at_epoch_millis=millis, updated_at_epoch_millis=millis)
+    elif collection == 'dashboards':
+        generated = Fixtures().dashboard(entity['id'], widgets=0)
+        for name in ('ui_url', 'api_url', 'metadata', 'visibility', 'editable'):
+            entity.setdefault(name, generated[name])
+        entity.update(created_at=format_time(now), updated_at=format_time(now))
+    elif collection == 'browser_applications':
+        generated = Fixtures().browser_application(entity['id'])
+        entity.update(browser_monitoring_key=generated['browser_monitoring_key'],
+                      loader_script=generated['loader_script'])
+
+
+def _parse(mode, value):
+    # Filters are parsed once per request rather than once per entity
+    if mode == 'in':
+        return set(value.split(','))
+    if mode == 'contains':
+        return value.lower()
+    return value
+
+
+def _matches(entity, field, mode, value):
+    actual = entity.get(field)
+    if mode == 'in':
+        return str(actual) in value
+    if mode == 'contains':
+        return value in str(actual).lower()
+    return str(actual) == value
+
+
+def _keys(ids):
+    # The ids that match a filter[ids], skipping any that are not written
+    # the way str() writes an id
+    return sorted(set(int(id) for id in ids.split(',') if id.isdigit() and str(int(id)) == id))
+
+
+class Backend(object):
+    """
+    An in-memory New Relic account that answers REST API v2 requests, and
+    Infrastructure API alert condition requests, the way the API does:
+    listings are filtered and paginated with ``Link`` headers, writes change
+    what later requests see, and unknown entities are answered with 404.
+    It is thread safe.
+
+    .. code-block:: python
+
+        >>> backend = Backend()
+        >>> backend.add('servers', {'name': 'web-01'})
+        >>> backend.handle('get', 'https://api.newrelic.com/v2/servers.json').content
+        b'{"servers":[{"name":"web-01","id":1}]}'
+    """
+    def __init__(self, page_size=PAGE_SIZE, metric_names_page_size=METRIC_NAMES_PAGE_SIZE):
+        """
+        :type page_size: int
+        :param page_size: The number of entities in a page of a listing
+
+        :type metric_names_page_size: int
+        :param metric_names_page_size: The number of names in a page of a
+            metric names listing
+        """
+        self.page_size = page_size
+        self.metric_names_page_size = metric_names_page_size
+        self.entities = dict((name, collections.OrderedDict()) for name in COLLECTIONS)
+        self.parents = {}
+        self.metric_names = {}
+        self._next_id = collections.defaultdict(int)
+        self._lock = threading.RLock()
+
+    def add(self, collection, entity, parent=None, metric_names=None):
+        """
+        Stores an entity, giving it an id if it has none
+
+        :type collection: str
+        :param collection: The collection, a key of COLLECTIONS
+
+        :type entity: dict
+        :param entity: The entity as the API returns it
+
+        :type parent: int
+        :param parent: The policy of an alert condition, or the application
+            of a host or instance
+
+        :type metric_names: list of str or :class:`newrelic_api.testing.fixtures.MetricNames`
+        :param metric_names: The names of the metrics the entity reports.
+            Generated names are kept as they are, lists are copied.
+
+        :rtype: dict
+        :return: The stored entity
+        """
+        with self._lock:
+            if collection == 'labels':
+                entity.setdefault('key', '{0}:{1}'.format(entity['category'], entity['name']))
+                key = entity['key']
+            else:
+                if 'id' not in entity:
+                    self._next_id[collection] += 1
+                    entity['id'] = self._next_id[collection]
+                self._next_id[collection] = max(self._next_id[collection], entity['id'])
+                key = entity['id']
+            self.entities[collection][key] = entity
+            if parent is not None:
+                self.parents[(collection, key)] = parent
+            if metric_names is not None:
+                if not isinstance(metric_names, MetricNames):
+                    metric_names = list(metric_names)
+                self.metric_names[(collection, key)] = metric_names
+            return entity
+
+    def get(self, collection, key):
+        """
+        :rtype: dict
+        :return: A stored entity, or None
+        """
+        with self._lock:
+            return self.entities[collection].get(key)
+
+    def handle(self, method, url, params=None, data=None):
+        """
+        Answers a request
+
+        :type method: str
+        :param method: The HTTP verb
+
+        :type url: str
+        :param url: The url, its host is ignored
+
+        :type params: str or dict
+        :param params: The query string or parameters, in addition to those
+            of the url
+
+        :type data: str
+        :param data: The JSON request body
+
+        :rtype: :class:`BackendResponse`
+        """
+        split = urlsplit(url)
+        query = parse_qsl(split.query, keep_blank_values=True)
+        if isinstance(params, dict):
+            query.extend(params.items())
+        elif params:
+            query.extend(parse_qsl(params, keep_blank_values=True))
+        base = '{0}://{1}{2}'.format(split.scheme, split.netloc, split.path)
+        try:
+            body = json.loads(data) if data else {}
+        except ValueError:
+            return _error(400, 'The request body is not valid JSON')
+
+        request = _Request(method.lower(), base, query, body)
+        path = _VERSION_ROOT.sub('', base)
+        for pattern, handler in _ROUTES:
+            match = pattern.match(path)
+            if match is not None:
+                with self._lock:
+                    return getattr(self, handler)(request, **match.groupdict())
+        return _error(404, 'Not found')
+
+    def _collection(self, request, collection):
+        if collection not in COLLECTIONS:
+            return _error(404, 'Not found')
+        if request.method == 'get':
+            return self._list(collection, request)
+        if request.method == 'post':
+            return self._create(collection, request.body)
+        if collection == 'labels' and request.method == 'put':
+            return self._put_label(request.body)
+        return _error(405, 'Method not allowed')
+
+    def _entity(self, request, path):
+        resolved = self._resolve(path)
+        if resolved is None:
+            return _error(404, 'Not found')
+        if request.method == 'get':
+            return self._show(*resolved)
+        if request.method == 'put':
+            return self._update(resolved[0], resolved[1], request.body)
+        if request.method == 'delete':
+            return self._delete(*resolved)
+        return _error(405, 'Method not allowed')
+
+    def _nested(self, request, parent, nested):
+        if request.method != 'get':
+            return _error(405, 'Method not allowed')
+        return self._list(_NESTED[nested], request, parent=int(parent))
+
+    def _policy_conditions(self, request, collection, parent):
+        if request.method != 'post':
+            return _error(405, 'Method not allowed')
+        return self._create(collection, request.body, parent=int(parent))
+
+    def _label(self, request, key):
+        if request.method != 'delete':
+            return _error(405, 'Method not allowed')
+        return self._delete('labels', key)
+
+    def _resolve(self, path):
+        match = _ENTITY.match(path)
+        if match is None:
+            return None
+        collection, key = match.group('collection'), int(match.group('id'))
+        if match.group('nested'):
+            collection, parent, key = _NESTED[match.group('nested')], key, int(match.group('nested_id'))
+            if self.parents.get((collection, key)) != parent:
+                return None
+        if collection not in COLLECTIONS:
+            return None
+        return collection, key
+
+    def _filtered(self, collection, params, parent=None):
+        filters = COLLECTIONS[collection][2]
+        scope = _SCOPED.get(collection)
+        if scope is not None:
+            parent = int(params.get(scope, 0))
+        entities = self.entities[collection]
+        active = [(field, mode, _parse(mode, params[name])) for name, (field, mode) in filters.items()
+                  if params.get(name)]
+        if parent is None and not active and not params.get('filter[labels]'):
+            return list(entities.values())
+        if 'filter[ids]' in filters and params.get('filter[ids]'):
+            # Looked up directly, as scanning a large account for a few ids is slow
+            keys = [key for key in _keys(params['filter[ids]']) if key in entities]
+        else:
+            keys = list(entities)
+        selected = []
+        for key in keys:
+            if parent is not None and self.parents.get((collection, key)) != parent:
+                continue
+            entity = entities[key]
+            if all(_matches(entity, field, mode, value) for field, mode, value in active):
+                selected.append(entity)
+        if collection == 'servers' and params.get('filter[labels]'):
+            selected = self._labelled(selected, params['filter[labels]'])
+        return selected
+
+    def _labelled(self, servers, labels):
+        for key in labels.split(';'):
+            label = self.entities['labels'].get(key)
+            ids = set(label['links']['servers']) if label else set()
+            servers = [server for server in servers if server['id'] in ids]
+        return servers
+
+    def _page(self, items, request, page_size):
+        try:
+            page = max(1, int(request.params.get('page') or 1))
+        except ValueError:
+            return None, None
+        last = max(1, (len(items) + page_size - 1) // page_size)
+        links = []
+        kept = [(name, value) for name, value in request.query if name != 'page']
+
+        def link(number, rel):
+            links.append('<{0}?{1}>; rel="{2}"'.format(request.base, urlencode(kept + [('page', number)]), rel))
+        if page < last:
+            link(page + 1, 'next')
+            link(last, 'last')
+        if page > 1:
+            link(1, 'first')
+            link(page - 1, 'prev')
+        headers = {'Link': ', '.join(links)} if links else {}
+        return items[(page - 1) * page_size:page * page_size], headers
+
+    def _list(self, collection, request, parent=None):
+        list_key = COLLECTIONS[collection][0]
+        entities, headers = self._page(self._filtered(collection, request.params, parent), request, self.page_size)
+        if entities is None:
+            return _error(400, 'Invalid page')
+        return BackendResponse(200, {list_key: entities}, headers)
+
+    def _show(self, collection, key):
+        entity = self.entities[collection].get(key)
+        if entity is None:
+            return _error(404, 'Not found')
+        return BackendResponse(200, {COLLECTIONS[collection][1]: entity})
+
+    def _create(self, collection, body, parent=None):
+        item_key = COLLECTIONS[collection][1]
+        fields = body.get('channel' if collection == 'alerts_channels' else item_key)
+        if not isinstance(fields, dict):
+            return _error(422, 'The request body must hold a {0!r} object'.format(item_key))
+        entity = dict(fields)
+        entity.pop('id', None)
+        if collection == 'alerts_channels':
+            entity.setdefault('links', {'policy_ids': []})
+        entity = self.add(collection, entity, parent=parent)
+        _assign(collection, entity)
+        return BackendResponse(201, {item_key: entity})
+
+    def _update(self, collection, key, body):
+        entity = self.entities[collection].get(key)
+        if entity is None:
+            return _error(404, 'Not found')
+        fields = body.get(COLLECTIONS[collection][1])
+        if not isinstance(fields, dict):
+            return _error(422, 'The request body must hold a {0!r} object'.format(COLLECTIONS[collection][1]))
+        for name, value in fields.items():
+            if isinstance(value, dict) and isinstance(entity.get(name), dict):
+                entity[name].update(value)
+            elif name != 'id':
+                entity[name] = value
+        return BackendResponse(200, {COLLECTIONS[collection][1]: entity})
+
+    def _delete(self, collection, key):
+        entity = self.entities[collection].pop(key, None)
+        if entity is None:
+            return _error(404, 'Not found')
+        self.parents.pop((collection, key), None)
+        self.metric_names.pop((collection, key), None)
+        return BackendResponse(200, {COLLECTIONS[collection][1]: entity})
+
+    def _put_label(self, body):
+        fields = body.get('label')
+        if not isinstance(fields, dict) or 'category' not in fields or 'name' not in fields:
+            return _error(422, 'A label needs a category and a name')
+        key = '{0}:{1}'.format(fields['category'], fields['name'])
+        links = fields.get('links') or {}
+        label = self.entities['labels'].get(key) or self.add('labels', {
+            'key': key, 'category': fields['category'], 'name': fields['name'],
+            'links': {'applications': [], 'servers': []}})
+        for kind in ('applications', 'servers'):
+            label['links'][kind] = sorted(set(label['links'][kind]) | set(links.get(kind) or []))
+        return BackendResponse(200, {'label': label})
+
+    def _policy_channels(self, request):
+        method, params = request.method, request.params
+        try:
+            policy_id = int(params['policy_id'])
+            channel_ids = [int(value) for value in (params.get('channel_ids') or params['channel_id']).split(',')]
+        except (KeyError, ValueError):
+            return _error(422, 'policy_id and channel_ids are required')
+        if policy_id not in self.entities['alerts_policies']:
+            return _error(404, 'Not found')
+        channels = [self.entities['alerts_channels'].get(channel_id) for channel_id in channel_ids]
+        if None in channels:
+            return _error(404, 'Not found')
+        for channel in channels:
+            policy_ids = set(channel['links']['policy_ids'])
+            if method == 'put':
+                policy_ids.add(policy_id)
+            else:
+                policy_ids.discard(policy_id)
+            channel['links']['policy_ids'] = sorted(policy_ids)
+        if method == 'put':
+            linked = [
+                channel['id'] for channel in self.entities['alerts_channels'].values()
+                if policy_id in channel['links']['policy_ids']]
+            return BackendResponse(200, {'policy': {'id': policy_id, 'channel_ids': linked}})
+        return BackendResponse(200, {'channel': channels[0]})
+
+    def _metric_names(self, request, path):
+        params = request.params
+        resolved = self._resolve(path)
+        if resolved is None or resolved[1] not in self.entities[resolved[0]]:
+            return _error(404, 'Not found')
+        names = self.metric_names.get(resolved, [])
+        if params.get('name'):
+            names = [name for name in names if params['name'] in name]
+        names, headers = self._page(names, request, self.metric_names_page_size)
+        if names is None:
+            return _error(400, 'Invalid page')
+        return BackendResponse(200, {'metrics': [{'name': name, 'values': _values(name)} for name in names]}, headers)
+
+    def _metric_data(self, request, path):
+        query, params = request.query, request.params
+        resolved = self._resolve(path)
+        if resolved is None or resolved[1] not in self.entities[resolved[0]]:
+            return _error(404, 'Not found')
+        requested = [value for name, value in query if name == 'names[]']
+        values = [value for name, value in query if name == 'values[]']
+        known = self.metric_names.get(resolved, ())
+        if not isinstance(known, MetricNames):
+            known = set(known)
+        end = _parse_time(params.get('to'), datetime.datetime.utcnow().replace(second=0, microsecond=0))
+        start = _parse_time(params.get('from'), end - datetime.timedelta(minutes=30))
+        summarize = params.get('summarize') == 'true'
+        metrics = [
+            {'name': name, 'timeslices': _timeslices(resolved, name, values or _values(name), start, end, summarize)}
+            for name in requested if name in known
+        ]
+        return BackendResponse(200, {'metric_data': {
+            'from': format_time(start),
+            'to': format_time(end),
+            'metrics_not_found': [name for name in requested if name not in known],
+            'metrics_found': [metric['name'] for metric in metrics],
+            'metrics': metrics,
+        }})
+
+    def _infra_conditions(self, request):
+        if request.method == 'post':
+            fields = request.body.get('data')
+            if not isinstance(fields, dict) or 'policy_id' not in fields:
+                return _error(422, 'A condition needs a policy_id')
+            return self._create('infra_conditions', request.body, parent=int(fields['policy_id']))
+        conditions = self._filtered('infra_conditions', request.params)
+        limit, offset = int(request.params.get('limit') or 50), int(request.params.get('offset') or 0)
+        return BackendResponse(200, {
+            'data': conditions[offset:offset + limit],
+            'meta': {'limit': limit, 'offset': offset, 'total': len(conditions)},
+        })
+
+    def _infra_condition(self, request, key):
+        key = int(key)
+        if request.method == 'delete':
+            if self.entities['infra_conditions'].pop(key, None) is None:
+                return _error(404, 'Not found')
+            self.parents.pop(('infra_conditions', key), None)
+            return BackendResponse(204)
+        if request.method == 'put':
+            return self._update('infra_conditions', key, request.body)
+        return self._show('infra_conditions', key)
+
+
+def _values(name):
+    if name.startswith('Apdex') or name.startswith('EndUser/Apdex'):
+        return ['s', 't', 'f', 'count', 'score', 'value', 'threshold', 'threshold_min']
+    return ['average_response_time', 'calls_per_minute', 'call_count', 'min_response_time', 'max_response_time',
+            'average_exclusive_time', 'average_value', 'total_call_time_per_minute', 'requests_per_minute',
+            'standard_deviation']
+
+
+def _timeslices(entity, name, values, start, end, summarize):
+    # Seeded by the entity and metric, so that the same request gets the
+    # same data
+    rng = random.Random(zlib.crc32('{0}/{1}/{2}'.format(entity[0], entity[1], name).encode('utf-8')))
+    if summarize:
+        bounds = [(start, end)]
+    else:
+        minutes = max(1, int((end - start).total_seconds() // 60))
+        bounds = [(start + datetime.timedelta(minutes=index), start + datetime.timedelta(minutes=index + 1))
+                  for index in range(minutes)]
+    return [
+        {
+            'from': format_time(lower),
+            'to': format_time(upper),
+            'values': dict((value, round(rng.uniform(0, 100), 3)) for value in values),
+        }
+        for lower, upper in bounds
+    ]
+
+
+def populate(backend, scale=1, seed=0):
+    """
+    Fills a backend with an account whose size grows with ``scale``: per
+    unit of scale, 20 applications with 2 hosts, 2 instances and 50 metric
+    names each, 50 servers, 5 alert policies with their conditions and
+    channels, and a few of every other entity. See
+    :func:`newrelic_api.testing.fixtures.generate` to pick the size of
+    every resource.
+
+    :type backend: :class:`Backend`
+    :param backend: The backend to fill
+
+    :type scale: int
+    :param scale: The size of the account
+
+    :type seed: int
+    :param seed: Seeds the generated values, so that the same seed gives
+        the same account
+
+    :rtype: :class:`Backend`
+    :return: The backend
+    """
+    sizes = dict(
+        (name, count if name.endswith(_PER_PARENT) else count * scale) for name, count in DEFAULT_SIZES.items())
+    return generate(backend, seed=seed, **sizes)
@@ -0,0 +1,389 @@
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+import requests
+
+from newrelic_api.base import Resource, build_headers
+from newrelic_api.concurrency import fan_out
+from newrelic_api.exceptions import ConfigurationException
+from newrelic_api.interning import StringInterner
+from newrelic_api.servers import Servers
+from newrelic_api.testing.backend import Backend, populate
+from newrelic_api.testing.fixtures import generate
+from newrelic_api.testing.server import StandInServer
+from newrelic_api.transport import Transport, monotonic
+from newrelic_api.version import __version__
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+# Bumped whenever the format of saved results changes
+RESULTS_VERSION = 1
+
+# The number of concurrent requests metric data is fetched with
+DEFAULT_CONCURRENCY = (1, 4, 16)
+
+# The relative change beyond which a benchmark counts as a regression
+DEFAULT_TOLERANCE = 0.1
+
+_SERVERS_URL = 'https://api.newrelic.com/v2/servers.json'
+
+
+def result(value, unit, higher_is_better=False):
+    """
+    Returns the result of a benchmark
+
+    :type value: float
+    :param value: The measurement
+
+    :type unit: str
+    :param unit: The unit of the measurement, e.g. 'us/call'
+
+    :type higher_is_better: bool
+    :param higher_is_better: Whether a higher value is an improvement, as
+        for throughputs
+
+    :rtype: dict
+    """
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def time_per_call(func, iterations, repeat=3):
+    """
+    Returns the seconds one call of ``func`` takes, from the fastest of
+    ``repeat`` runs of ``iterations`` calls
+
+    :rtype: float
+    """
+    return min(timeit.Timer(func).repeat(repeat=repeat, number=iterations)) / iterations
+
+
+def _page(backend, page=1):
+    return backend.handle('get', _SERVERS_URL, params='page={0}'.format(page))
+
+
+class _CannedTransport(Transport):
+    """
+    A transport answering every request with the same response, to time
+    the work the client does around a request
+    """
+    def __init__(self, response, **kwargs):
+        super(_CannedTransport, self).__init__(**kwargs)
+        self.response = response
+
+    def _send(self, method, url, **kwargs):
+        return self.response
+
+
+def call_overhead(backend, iterations=10000):
+    """
+    Times the work the client does for every call, without the network:
+    building parameters and headers, decoding a page of servers, and a
+    whole ``list`` call answered by a canned response
+
+    :type backend: :class:`newrelic_api.testing.backend.Backend`
+    :param backend: The account the page of servers is taken from
+
+    :type iterations: int
+    :param iterations: The number of calls timed for the cheapest
+        benchmarks. Costlier ones are timed with fewer calls.
+
+    :rtype: dict
+    :return: The results by name
+    """
+    page = _page(backend)
+    resource = Resource(api_key='benchmark')
+    interned = Resource(api_key='benchmark', object_pairs_hook=StringInterner())
+    servers = Servers(api_key='benchmark', transport=_CannedTransport(page.to_response()))
+    filters = ['filter[name]=web', None, 'filter[ids]=1,2,3', None, 'page=2']
+    count = len(json.loads(page.content.decode('utf-8'))['servers'])
+    decode_iterations = max(1, iterations // 100)
+
+    return {
+        'build_param_string': result(
+            time_per_call(lambda: resource.build_param_string(filters), iterations) * 1e6, 'us/call'),
+        'build_headers': result(time_per_call(lambda: build_headers('benchmark'), iterations) * 1e6, 'us/call'),
+        'decode_page': result(
+            time_per_call(lambda: resource._decode(page.to_response()), decode_iterations) * 1e6 / count, 'us/entity'),
+        'decode_page_interned': result(
+            time_per_call(lambda: interned._decode(page.to_response()), decode_iterations) * 1e6 / count, 'us/entity'),
+        'list_call': result(time_per_call(servers.list, decode_iterations) * 1e6, 'us/call'),
+    }
+
+
+def _session(pool_size):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    return session
+
+
+def pagination(server, repeat=3):
+    """
+    Measures the throughput of fetching every page of the servers of a
+    stand-in server
+
+    :type server: :class:`newrelic_api.testing.server.StandInServer`
+    :param server: The running server
+
+    :type repeat: int
+    :param repeat: The number of listings, the fastest is kept
+
+    :rtype: dict
+    :return: The results by name
+    """
+    servers = Servers(api_key='benchmark', transport=server.transport(session=_session(1)))
+    durations = []
+    for _ in range(repeat):
+        start = monotonic()
+        entities = servers._list_all(servers.list, 'servers')
+        durations.append(monotonic() - start)
+    pages = -(-len(entities) // server.backend.page_size)
+    return {
+        'pagination_pages': result(pages / min(durations), 'pages/s', higher_is_better=True),
+        'pagination_entities': result(len(entities) / min(durations), 'entities/s', higher_is_better=True),
+    }
+
+
+def metric_data_fan_out(server, concurrency=DEFAULT_CONCURRENCY, calls=64):
+    """
+    Measures the throughput of fetching the metric data of many servers of
+    a stand-in server at several concurrencies
+
+    :type server: :class:`newrelic_api.testing.server.StandInServer`
+    :param server: The running server
+
+    :type concurrency: tuple of int
+    :param concurrency: The numbers of concurrent requests to measure
+
+    :type calls: int
+    :param calls: The number of ``metric_data`` calls at each concurrency
+
+    :rtype: dict
+    :return: The results by name
+    """
+    ids = list(server.backend.entities['servers'])
+    ids = [ids[index % len(ids)] for index in range(calls)]
+    names = server.backend.metric_names[('servers', ids[0])][:5]
+    servers = Servers(api_key='benchmark', transport=server.transport(session=_session(max(concurrency))))
+
+    def fetch(id):
+        return servers.metric_data(id, names, summarize=True)
+
+    results = {}
+    for workers in concurrency:
+        start = monotonic()
+        fan_out(fetch, ids, max_workers=workers)
+        results['metric_data_fan_out[{0}]'.format(workers)] = result(
+            calls / (monotonic() - start), 'calls/s', higher_is_better=True)
+    return results
+
+
+def _retained(decode, bodies):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        decoded = [decode(body) for body in bodies]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del decoded
+    return size
+
+
+def memory(backend):
+    """
+    Measures the memory the decoded servers of an account take, as bytes
+    per 10k servers, with and without a
+    :class:`newrelic_api.interning.StringInterner`. Needs the ``tracemalloc``
+    module of Python 3.4 and later, no results are returned without it.
+
+    :type backend: :class:`newrelic_api.testing.backend.Backend`
+    :param backend: The account
+
+    :rtype: dict
+    :return: The results by name
+    """
+    if tracemalloc is None:  # pragma: no cover
+        return {}
+    pages = -(-len(backend.entities['servers']) // backend.page_size)
+    bodies = [_page(backend, page).content.decode('utf-8') for page in range(1, pages + 1)]
+    per_10k = 10000.0 / len(backend.entities['servers'])
+    interner = StringInterner()
+    return {
+        'memory_servers': result(_retained(json.loads, bodies) * per_10k, 'bytes/10k'),
+        'memory_servers_interned': result(
+            _retained(lambda body: json.loads(body, object_pairs_hook=interner), bodies) * per_10k, 'bytes/10k'),
+    }
+
+
+def run(scale=20, latency=0.01, concurrency=DEFAULT_CONCURRENCY, iterations=10000, memory_servers=10000):
+    """
+    Runs every benchmark. The throughputs are measured against a stand-in
+    server on a local port.
+
+    :type scale: int
+    :param scale: The size of the account served, see
+        :func:`newrelic_api.testing.backend.populate`
+
+    :type latency: float
+    :param latency: The seconds the stand-in takes to answer, standing in
+        for the round trip to the API
+
+    :type concurrency: tuple of int
+    :param concurrency: The numbers of concurrent requests metric data is
+        fetched with
+
+    :type iterations: int
+    :param iterations: The number of calls timed for per-call overheads
+
+    :type memory_servers: int
+    :param memory_servers: The number of servers decoded to measure memory
+
+    :rtype: dict
+    :return: The results, with the versions and platform they were measured
+        on
+    """
+    benchmarks = call_overhead(populate(Backend(), scale=4), iterations=iterations)
+    with StandInServer(backend=populate(Backend(), scale=scale), latency=latency) as server:
+        benchmarks.update(pagination(server))
+        benchmarks.update(metric_data_fan_out(server, concurrency=concurrency))
+    benchmarks.update(memory(generate(Backend(), servers=memory_servers)))
+    return {
+        'version': RESULTS_VERSION,
+        'newrelic_api': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'benchmarks': benchmarks,
+    }
+
+
+def save_results(results, path):
+    """
+    Writes results to a JSON file
+
+    :type results: dict
+    :param results: The results returned by :func:`run`
+
+    :type path: str
+    :param path: The path of the file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    os.rename(temporary, path)
+
+
+def load_results(path):
+    """
+    Reads results written by :func:`save_results`
+
+    :rtype: dict
+
+    :raises: :class:`newrelic_api.exceptions.ConfigurationException` if the
+        results were saved in another format
+    """
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ConfigurationException('Benchmark results version {0} is not supported, expected {1}'.format(
+            results.get('version'), RESULTS_VERSION))
+    return results
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the benchmarks two runs have in common
+
+    :type baseline: dict
+    :param baseline: The results to compare against
+
+    :type current: dict
+    :param current: The new results
+
+    :type tolerance: float
+    :param tolerance: The relative change beyond which a benchmark that got
+        worse counts as a regression
+
+    :rtype: list of dict
+    :return: The name, both values, the relative change and whether it is a
+        regression, for every benchmark
+    """
+    comparisons = []
+    for name in sorted(set(baseline['benchmarks']) & set(current['benchmarks'])):
+        before = baseline['benchmarks'][name]
+        after = current['benchmarks'][name]
+        change = (after['value'] - before['value']) / before['value'] if before['value'] else 0.0
+        worse = -change if after['higher_is_better'] else change
+        comparisons.append({
+            'name': name, 'baseline': before['value'], 'current': after['value'], 'unit': after['unit'],
+            'change': change, 'regression': worse > tolerance,
+        })
+    return comparisons
+
+
+def report(results, comparisons=None):
+    """
+    Formats results, and their comparison with a baseline if there is one,
+    as a table
+
+    :rtype: str
+    """
+    lines = ['newrelic_api {0} on Python {1}'.format(results['newrelic_api'], results['python'])]
+    changes = dict((comparison['name'], comparison) for comparison in comparisons or [])
+    for name in sorted(results['benchmarks']):
+        benchmark = results['benchmarks'][name]
+        line = '{0:<28} {1:>14.2f} {2:<10}'.format(name, benchmark['value'], benchmark['unit'])
+        if name in changes:
+            line = '{0} {1:>+8.1%}{2}'.format(
+                line, changes[name]['change'], '  REGRESSION' if changes[name]['regression'] else '')
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks from the command line, optionally saving the
+    results and comparing them with a baseline:
+
+    .. code-block:: bash
+
+        $ python -m newrelic_api.testing.benchmarks --output 1.0.7.json
+        $ python -m newrelic_api.testing.benchmarks --baseline 1.0.7.json
+
+    :rtype: int
+    :return: The exit status, 1 if a benchmark regressed
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks the newrelic_api client against a local stand-in')
+    parser.add_argument('--scale', type=int, default=20, help='the size of the account served')
+    parser.add_argument('--latency', type=float, default=0.01, help='the seconds the stand-in takes to answer')
+    parser.add_argument('--iterations', type=int, default=10000, help='the calls timed for per-call overheads')
+    parser.add_argument('--output', help='a file to save the results to')
+    parser.add_argument('--baseline', help='a file of saved results to compare with')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='the relative change counted as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(scale=args.scale, latency=args.latency, iterations=args.iterations)
+    comparisons = compare(load_results(args.baseline), results, args.tolerance) if args.baseline else None
+    if args.output:
+        save_results(results, args.output)
+    print(report(results, comparisons))
+    return 1 if any(comparison['regression'] for comparison in comparisons or []) else 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import datetime
+
+from newrelic_api.client import NewRelicClient
+from newrelic_api.testing.backend import Backend
+from newrelic_api.testing.fixtures import generate
+from newrelic_api.transport import Transport
+
+
+class FakeTransport(Transport):
+    """
+    A transport answering requests from an in-memory
+    :class:`newrelic_api.testing.backend.Backend` instead of sending them.
+    Responses have the shapes, pagination and errors of the API, and writes
+    change what later requests see, so code using this library can be
+    tested without HTTP or mocks. Caching, hedging and the other transport
+    features work as they do against the API.
+
+    .. code-block:: python
+
+        >>> backend = Backend()
+        >>> client = NewRelicClient(api_key='fake', transport=FakeTransport(backend))
+        >>> client.alert_policies.create(name='ops', incident_preference='PER_POLICY')
+        >>> backend.entities['alerts_policies'][1]['name']
+        'ops'
+    """
+    def __init__(self, backend=None, **kwargs):
+        """
+        :type backend: :class:`newrelic_api.testing.backend.Backend`
+        :param backend: The account requests are answered from. If no
+            backend is passed, an empty one is created.
+
+        The other keyword arguments are passed to
+        :class:`newrelic_api.transport.Transport`.
+        """
+        super(FakeTransport, self).__init__(**kwargs)
+        self.backend = backend if backend is not None else Backend()
+        #: The method, url, params and data of every request answered, in
+        #: order
+        self.requests = []
+
+    def _send(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get('params'), kwargs.get('data')))
+        response = self.backend.handle(
+            method, url, params=kwargs.get('params'), data=kwargs.get('data')).to_response(url)
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+
+def fake_client(backend=None, seed=0, **sizes):
+    """
+    Returns a client answered by a :class:`FakeTransport`. Unless a backend
+    is passed, it answers from an account generated with
+    :func:`newrelic_api.testing.fixtures.generate`.
+
+    .. code-block:: python
+
+        >>> client = fake_client(servers=500)
+        >>> len(client.servers.show_many(range(1, 501)))
+        500
+
+    :type backend: :class:`newrelic_api.testing.backend.Backend`
+    :param backend: The account to answer from
+
+    :type seed: int
+    :param seed: Seeds the generated account
+
+    The other keyword arguments are the sizes of the generated account.
+
+    :rtype: :class:`newrelic_api.client.NewRelicClient`
+    """
+    if backend is None:
+        backend = generate(Backend(), seed=seed, **sizes)
+    return NewRelicClient(api_key='fake', transport=FakeTransport(backend))
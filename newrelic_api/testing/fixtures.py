@@ -0,0 +1,694 @@
+import datetime
+import random
+import re
+import zlib
+
+try:
+    from collections.abc import Sequence
+except ImportError:  # pragma: no cover
+    from collections import Sequence
+
+from newrelic_api.exceptions import ConfigurationException
+
+# The time generated timestamps are relative to, so that accounts generated
+# with the same seed are identical
+EPOCH = datetime.datetime(2024, 1, 1)
+
+# The account every generated entity belongs to
+ACCOUNT_ID = 1000000
+
+# The number of entities a generated account has, by default. The sizes
+# ending in _per_application or _per_policy are counted per parent, and the
+# metric_names sizes per entity.
+DEFAULT_SIZES = {
+    'applications': 20,
+    'hosts_per_application': 2,
+    'instances_per_application': 2,
+    'application_metric_names': 50,
+    'servers': 50,
+    'server_metric_names': 20,
+    'alert_policies': 5,
+    'conditions_per_policy': 4,
+    'nrql_conditions_per_policy': 1,
+    'infra_conditions_per_policy': 1,
+    'notification_channels': 5,
+    'dashboards': 10,
+    'key_transactions': 10,
+    'users': 10,
+    'components': 10,
+    'component_metric_names': 20,
+    'plugins': 5,
+    'browser_applications': 5,
+    'labels': 5,
+}
+
+# The metrics every application, server and component reports, before the
+# generated ones
+APPLICATION_METRICS = (
+    'HttpDispatcher', 'Apdex', 'EndUser', 'EndUser/Apdex', 'Errors/all', 'OtherTransaction/all',
+    'Datastore/all', 'External/all', 'CPU/User Time', 'Memory/Physical',
+)
+SERVER_METRICS = (
+    'System/CPU/User/percent', 'System/CPU/System/percent', 'System/CPU/IO Wait/percent',
+    'System/Memory/Used/bytes', 'System/Load', 'System/Network/All/All/bytes/sec',
+)
+COMPONENT_METRICS = ('Component/Summary/Throughput', 'Component/Summary/Errors')
+
+_LANGUAGES = ('python', 'java', 'ruby', 'nodejs', 'php', 'dotnet', 'go')
+_HEALTH_STATUSES = ('green', 'green', 'green', 'orange', 'red', 'gray')
+_FIRST_NAMES = ('Ada', 'Alan', 'Grace', 'Edsger', 'Barbara', 'Donald', 'Frances', 'Ken')
+_LAST_NAMES = ('Lovelace', 'Turing', 'Hopper', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'Thompson')
+_LABEL_CATEGORIES = ('Team', 'Environment', 'Region')
+
+
+def format_time(value):
+    """
+    Formats a datetime the way the API does, e.g.
+    '2024-01-01T00:00:00+00:00'
+
+    :type value: :class:`datetime.datetime`
+    :param value: The UTC time
+
+    :rtype: str
+    """
+    return value.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+class MetricNames(Sequence):
+    """
+    The names of the metrics an entity reports: a few fixed names, then
+    names generated from a template on demand. Names are never stored, so
+    an account can have hundreds of thousands of names per entity.
+
+    .. code-block:: python
+
+        >>> names = MetricNames(['Apdex'], 'WebTransaction/Function/view_{0}', 3)
+        >>> list(names)
+        ['Apdex', 'WebTransaction/Function/view_0', 'WebTransaction/Function/view_1']
+        >>> 'WebTransaction/Function/view_1' in names
+        True
+    """
+    def __init__(self, fixed, template, count):
+        """
+        :type fixed: list of str
+        :param fixed: The names that come first
+
+        :type template: str
+        :param template: The format of the generated names, with a ``{0}``
+            placeholder for their index
+
+        :type count: int
+        :param count: The total number of names, fixed ones included. Fixed
+            names beyond it are left out.
+        """
+        self.fixed = tuple(fixed)[:count]
+        self.template = template
+        self.count = count
+        prefix, _, suffix = template.partition('{0}')
+        self._pattern = re.compile(r'^{0}(0|[1-9][0-9]*){1}$'.format(re.escape(prefix), re.escape(suffix)))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('metric name index out of range')
+        if index < len(self.fixed):
+            return self.fixed[index]
+        return self.template.format(index - len(self.fixed))
+
+    def __iter__(self):
+        for name in self.fixed:
+            yield name
+        for index in range(self.count - len(self.fixed)):
+            yield self.template.format(index)
+
+    def __contains__(self, name):
+        if name in self.fixed:
+            return True
+        match = self._pattern.match(name)
+        return match is not None and int(match.group(1)) < self.count - len(self.fixed)
+
+
+class Fixtures(object):
+    """
+    Builds entities shaped like the responses of the API, with plausible
+    values. Every entity is derived from the seed, its kind and its id
+    only, so any entity of an account of any size can be built on its own,
+    in any order.
+
+    .. code-block:: python
+
+        >>> fixtures = Fixtures(seed=7)
+        >>> fixtures.server(12)['host']
+        'host-12.example.com'
+        >>> fixtures.server(12) == Fixtures(seed=7).server(12)
+        True
+    """
+    def __init__(self, seed=0):
+        """
+        :type seed: int
+        :param seed: Seeds the generated values
+        """
+        self.seed = seed
+
+    def _random(self, kind, id):
+        return random.Random(zlib.crc32('{0}/{1}/{2}'.format(self.seed, kind, id).encode('utf-8')))
+
+    def _time(self, rng, max_days=0, max_minutes=0):
+        return EPOCH - datetime.timedelta(days=rng.randint(0, max_days), minutes=rng.randint(0, max_minutes))
+
+    def _application_summary(self, rng, apdex_target=None):
+        summary = {
+            'response_time': round(rng.uniform(5, 900), 1),
+            'throughput': round(rng.uniform(0, 20000), 1),
+            'error_rate': round(rng.uniform(0, 5), 2),
+            'apdex_score': round(rng.uniform(0.5, 1), 2),
+        }
+        if apdex_target is not None:
+            summary['apdex_target'] = apdex_target
+        return summary
+
+    def _end_user_summary(self, rng, apdex_target=None):
+        summary = {
+            'response_time': round(rng.uniform(0.5, 8), 3),
+            'throughput': round(rng.uniform(0, 5000), 1),
+            'apdex_score': round(rng.uniform(0.5, 1), 2),
+        }
+        if apdex_target is not None:
+            summary['apdex_target'] = apdex_target
+        return summary
+
+    def _summary_metrics(self, rng, names):
+        metrics = []
+        for index, name in enumerate(names):
+            raw = round(rng.uniform(0, 1000), 2)
+            metrics.append({
+                'id': index + 1, 'name': name.rsplit('/', 1)[-1], 'metric': name,
+                'value_function': rng.choice(['average_value', 'rate', 'total_value']),
+                'thresholds': {'caution': 500.0, 'critical': 900.0},
+                'values': {'raw': raw, 'formatted': '{0:.1f}'.format(raw)},
+            })
+        return metrics
+
+    def _terms(self, rng):
+        return [{
+            'duration': str(rng.choice([5, 10, 15, 30])), 'operator': rng.choice(['above', 'below']),
+            'priority': 'critical', 'threshold': str(rng.randint(1, 100)), 'time_function': rng.choice(['all', 'any']),
+        }]
+
+    def application(self, id, server_ids=(), host_ids=(), instance_ids=()):
+        """
+        :rtype: dict
+        :return: An application, as in the ``application`` key of
+            :meth:`newrelic_api.applications.Applications.show`
+        """
+        rng = self._random('application', id)
+        apdex, end_user_apdex = rng.choice([0.1, 0.3, 0.5, 1.0]), rng.choice([3.0, 7.0])
+        return {
+            'id': id,
+            'name': 'app-{0}'.format(id),
+            'language': rng.choice(_LANGUAGES),
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'reporting': rng.random() < 0.95,
+            'last_reported_at': format_time(self._time(rng, max_minutes=60)),
+            'application_summary': self._application_summary(rng, apdex),
+            'end_user_summary': self._end_user_summary(rng, end_user_apdex),
+            'settings': {
+                'app_apdex_threshold': apdex,
+                'end_user_apdex_threshold': end_user_apdex,
+                'enable_real_user_monitoring': rng.random() < 0.8,
+                'use_server_side_config': rng.random() < 0.2,
+            },
+            'links': {
+                'servers': list(server_ids),
+                'application_hosts': list(host_ids),
+                'application_instances': list(instance_ids),
+            },
+        }
+
+    def application_host(self, id, application, server_id=None, instance_ids=()):
+        """
+        :type application: dict
+        :param application: The application of the host
+
+        :rtype: dict
+        :return: A host, as in the ``application_host`` key of
+            :meth:`newrelic_api.application_hosts.ApplicationHosts.show`
+        """
+        rng = self._random('application_host', id)
+        return {
+            'id': id,
+            'application_name': application['name'],
+            'host': 'host-{0}.example.com'.format(server_id or id),
+            'language': application['language'],
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'application_summary': self._application_summary(rng),
+            'end_user_summary': self._end_user_summary(rng),
+            'links': {'application': application['id'], 'application_instances': list(instance_ids),
+                      'server': server_id},
+        }
+
+    def application_instance(self, id, application, host):
+        """
+        :type application: dict
+        :param application: The application of the instance
+
+        :type host: dict
+        :param host: The host the instance runs on
+
+        :rtype: dict
+        :return: An instance, as in the ``application_instance`` key of
+            :meth:`newrelic_api.application_instances.ApplicationInstances.show`
+        """
+        rng = self._random('application_instance', id)
+        return {
+            'id': id,
+            'application_name': application['name'],
+            'host': host['host'],
+            'port': rng.choice([80, 443, 8000, 8080, 9000]),
+            'language': application['language'],
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'application_summary': self._application_summary(rng),
+            'end_user_summary': self._end_user_summary(rng),
+            'links': {'application': application['id'], 'application_host': host['id'],
+                      'server': host['links']['server']},
+        }
+
+    def server(self, id):
+        """
+        :rtype: dict
+        :return: A server, as in the ``server`` key of
+            :meth:`newrelic_api.servers.Servers.show`
+        """
+        rng = self._random('server', id)
+        memory_total = rng.choice([4, 8, 16, 32, 64]) * 1024 ** 3
+        memory_used = int(memory_total * rng.uniform(0.1, 0.95))
+        return {
+            'id': id,
+            'account_id': ACCOUNT_ID,
+            'name': '{0}-{1}'.format(rng.choice(['web', 'worker', 'db', 'cache']), id),
+            'host': 'host-{0}.example.com'.format(id),
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'reporting': rng.random() < 0.95,
+            'last_reported_at': format_time(self._time(rng, max_minutes=60)),
+            'summary': {
+                'cpu': round(rng.uniform(0, 100), 2),
+                'cpu_stolen': round(rng.uniform(0, 2), 2),
+                'disk_io': round(rng.uniform(0, 100), 2),
+                'memory': round(100.0 * memory_used / memory_total, 2),
+                'memory_used': memory_used,
+                'memory_total': memory_total,
+                'fullest_disk': round(rng.uniform(0, 100), 2),
+                'fullest_disk_free': rng.randint(0, 500) * 1024 ** 3,
+            },
+            'links': {},
+        }
+
+    def key_transaction(self, id, application_id=None):
+        """
+        :rtype: dict
+        :return: A key transaction, as in the ``key_transaction`` key of
+            :meth:`newrelic_api.key_transactions.KeyTransactions.show`
+        """
+        rng = self._random('key_transaction', id)
+        apdex = rng.choice([0.1, 0.5, 1.0])
+        return {
+            'id': id,
+            'name': 'key-transaction-{0}'.format(id),
+            'transaction_name': 'WebTransaction/Function/app.views:view_{0}'.format(id),
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'reporting': rng.random() < 0.95,
+            'last_reported_at': format_time(self._time(rng, max_minutes=60)),
+            'application_summary': self._application_summary(rng, apdex),
+            'end_user_summary': self._end_user_summary(rng, 7.0),
+            'links': {'application': application_id},
+        }
+
+    def plugin(self, id):
+        """
+        :rtype: dict
+        :return: A plugin, as in the ``plugin`` key of
+            :meth:`newrelic_api.plugins.Plugins.show`
+        """
+        rng = self._random('plugin', id)
+        created = self._time(rng, max_days=900)
+        return {
+            'id': id,
+            'name': 'Plugin {0}'.format(id),
+            'guid': 'com.example.plugin{0}'.format(id),
+            'publisher': 'Example',
+            'component_agent_count': rng.randint(0, 50),
+            'details': {
+                'description': 'Monitors service {0}'.format(id),
+                'is_public': rng.random() < 0.5,
+                'created_at': format_time(created),
+                'updated_at': format_time(created + datetime.timedelta(days=30)),
+                'last_published_at': format_time(created + datetime.timedelta(days=30)),
+                'has_unpublished_changes': False,
+                'branding_image_url': 'https://example.com/plugins/{0}.png'.format(id),
+                'upgraded_at': format_time(created + datetime.timedelta(days=30)),
+                'short_name': 'plugin{0}'.format(id),
+                'publisher_about_url': 'https://example.com/about',
+                'publisher_support_url': 'https://example.com/support',
+                'download_url': 'https://example.com/plugins/{0}.tar.gz'.format(id),
+                'first_edited_at': format_time(created),
+                'last_edited_at': format_time(created + datetime.timedelta(days=30)),
+                'first_published_at': format_time(created),
+                'published_version': '1.{0}.0'.format(rng.randint(0, 9)),
+            },
+            'summary_metrics': self._summary_metrics(rng, COMPONENT_METRICS),
+        }
+
+    def component(self, id):
+        """
+        :rtype: dict
+        :return: A component, as in the ``component`` key of
+            :meth:`newrelic_api.components.Components.show`
+        """
+        rng = self._random('component', id)
+        return {
+            'id': id,
+            'name': 'component-{0}'.format(id),
+            'health_status': rng.choice(_HEALTH_STATUSES),
+            'summary_metrics': self._summary_metrics(rng, COMPONENT_METRICS),
+        }
+
+    def browser_application(self, id):
+        """
+        :rtype: dict
+        :return: A browser application, as in the ``browser_applications``
+            key of :meth:`newrelic_api.browser_applications.BrowserApplications.list`
+        """
+        key = '{0:010x}'.format(self._random('browser_application', id).getrandbits(40))
+        return {
+            'id': id,
+            'name': 'browser-{0}'.format(id),
+            'browser_monitoring_key': key,
+            'loader_script': (
+                '<script type="text/javascript">window.NREUM||(NREUM={{}});'
+                'NREUM.info={{applicationID:"{0}",licenseKey:"{1}"}}</script>'.format(id, key)),
+        }
+
+    def user(self, id):
+        """
+        :rtype: dict
+        :return: A user, as in the ``user`` key of
+            :meth:`newrelic_api.users.Users.show`
+        """
+        rng = self._random('user', id)
+        first_name, last_name = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        return {
+            'id': id,
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': '{0}.{1}.{2}@example.com'.format(first_name, last_name, id).lower(),
+            'role': rng.choice(['owner', 'admin', 'user', 'user', 'user', 'restricted']),
+        }
+
+    def label(self, id, application_ids=(), server_ids=()):
+        """
+        :rtype: dict
+        :return: A label, as in the ``label`` key of
+            :meth:`newrelic_api.labels.Labels.create`
+        """
+        category = _LABEL_CATEGORIES[id % len(_LABEL_CATEGORIES)]
+        name = '{0}-{1}'.format(category.lower(), id)
+        return {
+            'key': '{0}:{1}'.format(category, name),
+            'category': category,
+            'name': name,
+            'links': {'applications': list(application_ids), 'servers': list(server_ids)},
+        }
+
+    def alert_policy(self, id):
+        """
+        :rtype: dict
+        :return: A policy, as in the ``policy`` key of
+            :meth:`newrelic_api.alert_policies.AlertPolicies.create`
+        """
+        rng = self._random('alert_policy', id)
+        created = self._time(rng, max_days=365)
+        return {
+            'id': id,
+            'name': 'policy-{0}'.format(id),
+            'incident_preference': rng.choice(['PER_POLICY', 'PER_CONDITION', 'PER_CONDITION_AND_TARGET']),
+            'created_at': int((created - datetime.datetime(1970, 1, 1)).total_seconds() * 1000),
+            'updated_at': int((created - datetime.datetime(1970, 1, 1)).total_seconds() * 1000),
+        }
+
+    def notification_channel(self, id, policy_ids=()):
+        """
+        :rtype: dict
+        :return: A channel, as in the ``channels`` key of
+            :meth:`newrelic_api.notification_channels.NotificationChannels.create`
+        """
+        rng = self._random('notification_channel', id)
+        kind = rng.choice(['email', 'slack', 'webhook'])
+        configuration = {
+            'email': {'recipients': 'team-{0}@example.com'.format(id), 'include_json_attachment': 'false'},
+            'slack': {'channel': '#alerts-{0}'.format(id)},
+            'webhook': {'base_url': 'https://example.com/hooks/{0}'.format(id)},
+        }[kind]
+        return {
+            'id': id,
+            'name': 'channel-{0}'.format(id),
+            'type': kind,
+            'configuration': configuration,
+            'links': {'policy_ids': list(policy_ids)},
+        }
+
+    def alert_condition(self, id, entity_ids=()):
+        """
+        :rtype: dict
+        :return: A condition, as in the ``condition`` key of
+            :meth:`newrelic_api.alert_conditions.AlertConditions.create`
+        """
+        rng = self._random('alert_condition', id)
+        return {
+            'id': id,
+            'type': 'apm_app_metric',
+            'condition_scope': 'application',
+            'name': 'condition-{0}'.format(id),
+            'enabled': rng.random() < 0.9,
+            'entities': [str(entity_id) for entity_id in entity_ids],
+            'metric': rng.choice(['apdex', 'error_percentage', 'response_time_web', 'throughput_web']),
+            'runbook_url': 'https://example.com/runbooks/{0}'.format(id),
+            'terms': self._terms(rng),
+        }
+
+    def nrql_condition(self, id):
+        """
+        :rtype: dict
+        :return: A NRQL condition, as in the ``nrql_condition`` key of
+            :meth:`newrelic_api.alert_conditions_nrql.AlertConditionsNRQL.create`
+        """
+        rng = self._random('nrql_condition', id)
+        return {
+            'id': id,
+            'type': 'static',
+            'name': 'nrql-{0}'.format(id),
+            'runbook_url': 'https://example.com/runbooks/nrql-{0}'.format(id),
+            'enabled': rng.random() < 0.9,
+            'value_function': 'single_value',
+            'terms': self._terms(rng),
+            'nrql': {
+                'query': "SELECT count(*) FROM Transaction WHERE appName = 'app-{0}'".format(id),
+                'since_value': str(rng.choice([1, 3, 5])),
+            },
+        }
+
+    def infra_condition(self, id, policy_id):
+        """
+        :rtype: dict
+        :return: An Infrastructure condition, as in the ``data`` key of
+            :meth:`newrelic_api.alert_conditions_infra.AlertConditionsInfra.create`
+        """
+        rng = self._random('infra_condition', id)
+        created = int((self._time(rng, max_days=365) - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
+        return {
+            'id': id,
+            'policy_id': policy_id,
+            'type': 'infra_metric',
+            'name': 'infra-{0}'.format(id),
+            'enabled': rng.random() < 0.9,
+            'where_clause': "(`hostname` LIKE '%web%')",
+            'comparison': 'above',
+            'filter': {'and': [{'like': {'hostname': 'web'}}]},
+            'critical_threshold': {'value': rng.randint(50, 99), 'duration_minutes': 5, 'time_function': 'all'},
+            'event_type': 'SystemSample',
+            'select_value': rng.choice(['cpuPercent', 'memoryUsedBytes', 'diskUsedPercent']),
+            'created_at_epoch_millis': created,
+            'updated_at_epoch_millis': created,
+        }
+
+    def dashboard(self, id, widgets=3):
+        """
+        :type widgets: int
+        :param widgets: The number of widgets on the dashboard
+
+        :rtype: dict
+        :return: A dashboard, as in the ``dashboard`` key of
+            :meth:`newrelic_api.dashboards.Dashboards.show`
+        """
+        rng = self._random('dashboard', id)
+        created = self._time(rng, max_days=365)
+        return {
+            'id': id,
+            'title': 'dashboard-{0}'.format(id),
+            'description': 'Dashboard {0}'.format(id),
+            'icon': rng.choice(['bar-chart', 'line-chart', 'none']),
+            'created_at': format_time(created),
+            'updated_at': format_time(created + datetime.timedelta(days=1)),
+            'visibility': rng.choice(['all', 'owner']),
+            'editable': rng.choice(['editable_by_all', 'editable_by_owner', 'read_only']),
+            'ui_url': 'https://insights.newrelic.com/accounts/{0}/dashboards/{1}'.format(ACCOUNT_ID, id),
+            'api_url': 'https://api.newrelic.com/v2/dashboards/{0}'.format(id),
+            'owner_email': 'owner-{0}@example.com'.format(id),
+            'metadata': {'version': 1},
+            'widgets': [{
+                'visualization': rng.choice(['billboard', 'line_chart', 'facet_table']),
+                'layout': {'width': 1, 'height': 1, 'row': index // 3 + 1, 'column': index % 3 + 1},
+                'widget_id': id * 100 + index,
+                'account_id': ACCOUNT_ID,
+                'data': [{'nrql': 'SELECT count(*) FROM Transaction TIMESERIES'}],
+                'presentation': {'title': 'Widget {0}'.format(index + 1), 'notes': None},
+            } for index in range(widgets)],
+            'filter': {'event_types': ['Transaction'], 'attributes': ['appName']},
+        }
+
+    def application_metric_names(self, count):
+        """
+        :rtype: :class:`MetricNames`
+        :return: ``count`` names of metrics reported by applications
+        """
+        return MetricNames(APPLICATION_METRICS, 'WebTransaction/Function/app.views:view_{0}', count)
+
+    def server_metric_names(self, count):
+        """
+        :rtype: :class:`MetricNames`
+        :return: ``count`` names of metrics reported by servers
+        """
+        return MetricNames(SERVER_METRICS, 'System/Disk/^dev^sd{0}/Utilization/percent', count)
+
+    def component_metric_names(self, count):
+        """
+        :rtype: :class:`MetricNames`
+        :return: ``count`` names of metrics reported by components
+        """
+        return MetricNames(COMPONENT_METRICS, 'Component/Custom/metric_{0}[units]', count)
+
+
+def _sizes(sizes):
+    unknown = set(sizes) - set(DEFAULT_SIZES)
+    if unknown:
+        raise ConfigurationException('Unknown fixture sizes: {0}'.format(', '.join(sorted(unknown))))
+    merged = dict(DEFAULT_SIZES)
+    merged.update(sizes)
+    return merged
+
+
+def _spread(index, count, total):
+    # The ids of ``count`` entities out of ``total`` assigned to the index-th
+    # parent, wrapping around so that every parent gets some
+    return [(index * count + offset) % total + 1 for offset in range(count)] if total else []
+
+
+def _add_applications(backend, fixtures, sizes):
+    hosts, instances = sizes['hosts_per_application'], sizes['instances_per_application']
+    metric_names = fixtures.application_metric_names(sizes['application_metric_names'])
+    for index in range(sizes['applications']):
+        id = index + 1
+        host_ids = [index * hosts + offset + 1 for offset in range(hosts)]
+        instance_ids = [index * instances + offset + 1 for offset in range(instances)]
+        server_ids = _spread(index, hosts, sizes['servers'])
+        application = backend.add('applications', fixtures.application(
+            id, sorted(set(server_ids)), host_ids, instance_ids), metric_names=metric_names)
+        host_entities = []
+        for offset, host_id in enumerate(host_ids):
+            on_host = instance_ids[offset::hosts] if hosts else []
+            host = fixtures.application_host(host_id, application, server_ids[offset] if server_ids else None, on_host)
+            host_entities.append(backend.add('application_hosts', host, parent=id, metric_names=metric_names))
+        for offset, instance_id in enumerate(instance_ids):
+            if host_entities:
+                instance = fixtures.application_instance(instance_id, application, host_entities[offset % hosts])
+                backend.add('application_instances', instance, parent=id, metric_names=metric_names)
+
+
+def _add_alerts(backend, fixtures, sizes):
+    policies = sizes['alert_policies']
+    conditions, nrql_conditions, infra_conditions = (
+        sizes['conditions_per_policy'], sizes['nrql_conditions_per_policy'], sizes['infra_conditions_per_policy'])
+    for index in range(policies):
+        id = index + 1
+        backend.add('alerts_policies', fixtures.alert_policy(id))
+        for offset in range(conditions):
+            condition_id = index * conditions + offset + 1
+            entity_ids = _spread(condition_id, 1, sizes['applications'])
+            backend.add('alerts_conditions', fixtures.alert_condition(condition_id, entity_ids), parent=id)
+        for offset in range(nrql_conditions):
+            backend.add('alerts_nrql_conditions', fixtures.nrql_condition(index * nrql_conditions + offset + 1),
+                        parent=id)
+        for offset in range(infra_conditions):
+            backend.add('infra_conditions', fixtures.infra_condition(index * infra_conditions + offset + 1, id),
+                        parent=id)
+    for index in range(sizes['notification_channels']):
+        backend.add('alerts_channels', fixtures.notification_channel(index + 1, _spread(index, 1, policies)))
+
+
+def generate(backend, seed=0, **sizes):
+    """
+    Fills a backend with a generated account. Entities link to each other
+    as in a real account: applications to their hosts, instances and
+    servers, conditions to their policy and applications, channels to
+    policies and labels to applications and servers. Metric names are
+    generated on demand, so they cost no memory however many there are.
+
+    .. code-block:: python
+
+        >>> backend = generate(Backend(), servers=50000, applications=5000, application_metric_names=100000)
+
+    :type backend: :class:`newrelic_api.testing.backend.Backend`
+    :param backend: The backend to fill
+
+    :type seed: int
+    :param seed: Seeds the generated values, so that the same seed and
+        sizes give the same account
+
+    The other keyword arguments override the sizes in DEFAULT_SIZES.
+
+    :rtype: :class:`newrelic_api.testing.backend.Backend`
+    :return: The backend
+
+    :raises: :class:`newrelic_api.exceptions.ConfigurationException` for
+        sizes that are not in DEFAULT_SIZES
+    """
+    sizes = _sizes(sizes)
+    fixtures = Fixtures(seed)
+
+    server_metric_names = fixtures.server_metric_names(sizes['server_metric_names'])
+    for index in range(sizes['servers']):
+        backend.add('servers', fixtures.server(index + 1), metric_names=server_metric_names)
+    _add_applications(backend, fixtures, sizes)
+    _add_alerts(backend, fixtures, sizes)
+
+    for index in range(sizes['key_transactions']):
+        backend.add('key_transactions', fixtures.key_transaction(
+            index + 1, (_spread(index, 1, sizes['applications']) or [None])[0]))
+    component_metric_names = fixtures.component_metric_names(sizes['component_metric_names'])
+    for index in range(sizes['components']):
+        backend.add('components', fixtures.component(index + 1), metric_names=component_metric_names)
+    for kind, collection in (('dashboard', 'dashboards'), ('user', 'users'), ('plugin', 'plugins'),
+                             ('browser_application', 'browser_applications')):
+        for index in range(sizes[collection]):
+            backend.add(collection, getattr(fixtures, kind)(index + 1))
+    labels = sizes['labels']
+    for index in range(labels):
+        application_ids = range(index + 1, sizes['applications'] + 1, labels)
+        server_ids = range(index + 1, sizes['servers'] + 1, labels)
+        backend.add('labels', fixtures.label(index + 1, application_ids, server_ids))
+    return backend
@@ -0,0 +1,232 @@
+import json
+import random
+import re
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from newrelic_api.testing.backend import Backend, populate
+from newrelic_api.transport import Transport
+
+# The roots of the APIs the stand-in answers for
+_API_ROOT = re.compile(r'^https://(?:api|infra-api)\.newrelic\.com/v2/')
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, which Nagle's algorithm
+    # would delay on kept alive connections
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle('get')
+
+    def do_POST(self):
+        self._handle('post')
+
+    def do_PUT(self):
+        self._handle('put')
+
+    def do_DELETE(self):
+        self._handle('delete')
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length).decode('utf-8') if length else None
+        stand_in = self.server.stand_in
+        url = 'http://{0}:{1}{2}'.format(stand_in.host, stand_in.port, self.path)
+        status_code, headers, content = stand_in.respond(
+            method, url, data, self.headers.get('X-Api-Key'))
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(object):
+    """
+    A local HTTP server standing in for the New Relic REST API v2 and the
+    Infrastructure API, backed by a :class:`newrelic_api.testing.backend.Backend`.
+    It can add latency and answer a share of requests with 500 or 429
+    errors, to load test a client end to end.
+
+    .. code-block:: python
+
+        >>> with StandInServer(scale=10, latency=0.05, throttle_rate=0.01) as server:
+        ...     client = NewRelicClient(api_key='stand-in', transport=server.transport(pooled=True))
+        ...     client.servers.show_many(range(1, 501))
+    """
+    def __init__(
+            self, backend=None, scale=1, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, throttle_rate=0.0,
+            retry_after=1, api_key=None, seed=None):
+        """
+        :type backend: :class:`newrelic_api.testing.backend.Backend`
+        :param backend: The account to serve. If no backend is passed, one
+            is generated at ``scale``.
+
+        :type scale: int
+        :param scale: The size of the generated account, see
+            :func:`newrelic_api.testing.backend.populate`
+
+        :type host: str
+        :param host: The address to listen on
+
+        :type port: int
+        :param port: The port to listen on, 0 picks a free one
+
+        :type latency: float or callable
+        :param latency: Seconds added to every response, or a callable
+            returning them, e.g. to draw latencies from a distribution
+
+        :type error_rate: float
+        :param error_rate: The share of requests answered with a 500 error
+
+        :type throttle_rate: float
+        :param throttle_rate: The share of requests answered with a 429
+            error, as when the rate limit of the API is exceeded
+
+        :type retry_after: int
+        :param retry_after: The seconds in the ``Retry-After`` header of 429
+            responses
+
+        :type api_key: str
+        :param api_key: If set, requests without this ``X-Api-Key`` header
+            are answered with 401
+
+        :type seed: int
+        :param seed: Seeds the injected errors
+        """
+        self.backend = backend if backend is not None else populate(Backend(), scale=scale)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.api_key = api_key
+        #: The number of requests received, and of those answered with an
+        #: injected error or throttled
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        """
+        The root url of the API served, e.g. 'http://127.0.0.1:8000/v2/'
+        """
+        return 'http://{0}:{1}/v2/'.format(self.host, self.port)
+
+    def start(self):
+        """
+        Starts serving on a background thread
+
+        :rtype: :class:`StandInServer`
+        :return: The server
+        """
+        self._server = _ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.stand_in = self
+        self.port = self._server.server_port
+        # A short poll interval keeps stop() from blocking for long
+        thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the socket
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def transport(self, **kwargs):
+        """
+        Returns a transport sending the requests of resources to this server
+
+        The keyword arguments are passed to :class:`StandInTransport`.
+
+        :rtype: :class:`StandInTransport`
+        """
+        return StandInTransport(self.url, **kwargs)
+
+    def respond(self, method, url, data, api_key):
+        """
+        Answers a request, adding the configured latency and errors
+
+        :rtype: tuple
+        :return: The status code, headers and body
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            draw = self._random.random()
+            if draw < self.throttle_rate:
+                self.stats['throttled'] += 1
+            elif draw < self.throttle_rate + self.error_rate:
+                self.stats['errors'] += 1
+
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if self.api_key is not None and api_key != self.api_key:
+            return self._error(401, 'Invalid API key')
+        if draw < self.throttle_rate:
+            status_code, headers, content = self._error(429, 'Rate limit exceeded')
+            headers['Retry-After'] = str(self.retry_after)
+            return status_code, headers, content
+        if draw < self.throttle_rate + self.error_rate:
+            return self._error(500, 'Internal server error')
+
+        response = self.backend.handle(method, url, data=data)
+        return response.status_code, response.headers, response.content
+
+    def _error(self, status_code, title):
+        content = json.dumps({'error': {'title': title}}).encode('utf-8')
+        return status_code, {'Content-Type': 'application/json'}, content
+
+
+class StandInTransport(Transport):
+    """
+    A transport that sends requests meant for New Relic to a stand-in
+    server. Urls are rewritten as requests are sent, so caching, hedging
+    and instrumentation see the urls of the real API.
+    """
+    def __init__(self, url, **kwargs):
+        """
+        :type url: str
+        :param url: The root url of the stand-in, see
+            :attr:`StandInServer.url`
+
+        The other keyword arguments are passed to
+        :class:`newrelic_api.transport.Transport`.
+        """
+        super(StandInTransport, self).__init__(**kwargs)
+        self.url = url
+
+    def _send(self, method, url, **kwargs):
+        return super(StandInTransport, self)._send(method, _API_ROOT.sub(self.url, url), **kwargs)
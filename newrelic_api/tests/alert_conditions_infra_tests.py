@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.alert_conditions_infra import AlertConditionsInfra
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRAlertConditionsInfraInfraTests(TestCase):
@@ -164,5 +165,6 @@ class NRAlertConditionsInfraInfraTests(TestCase):
 
         mock_delete.assert_called_once_with(
             url='https://infra-api.newrelic.com/v2/alerts/conditions/100',
-            headers=self.alert_conditions_infra.headers
+            headers=self.alert_conditions_infra.headers,
+            timeout=DEFAULT_TIMEOUT
         )
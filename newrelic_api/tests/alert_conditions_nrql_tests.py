@@ -5,6 +5,7 @@ import requests
 
 from newrelic_api.alert_conditions_nrql import AlertConditionsNRQL
 from newrelic_api.exceptions import NoEntityException
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRAlertConditionsNRQLTests(TestCase):
@@ -200,5 +201,6 @@ class NRAlertConditionsNRQLTests(TestCase):
 
         mock_delete.assert_called_once_with(
             url='https://api.newrelic.com/v2/alerts_nrql_conditions/100.json',
-            headers=self.alert_conditions_nrql.headers
+            headers=self.alert_conditions_nrql.headers,
+            timeout=DEFAULT_TIMEOUT
         )
@@ -5,6 +5,7 @@ import requests
 
 from newrelic_api.alert_conditions import AlertConditions
 from newrelic_api.exceptions import NoEntityException, ConfigurationException
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRAlertConditionsTests(TestCase):
@@ -213,5 +214,6 @@ class NRAlertConditionsTests(TestCase):
 
         mock_delete.assert_called_once_with(
             url='https://api.newrelic.com/v2/alerts_conditions/100.json',
-            headers=self.alert_conditions.headers
+            headers=self.alert_conditions.headers,
+            timeout=DEFAULT_TIMEOUT
         )
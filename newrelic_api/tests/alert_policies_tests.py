@@ -5,6 +5,7 @@ import json
 import requests
 
 from newrelic_api.alert_policies import AlertPolicies
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRAlertPoliciesTests(TestCase):
@@ -69,7 +70,8 @@ class NRAlertPoliciesTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/alerts_policies.json',
             headers=self.policies.headers,
-            params='filter[name]=Default Server Policy'
+            params='filter[name]=Default Server Policy',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -103,7 +105,8 @@ class NRAlertPoliciesTests(TestCase):
                     "name": self.policy_single_response['policy']['name'],
                     "incident_preference": self.policy_single_response['policy']['incident_preference']
                 }
-            })
+            }),
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'put')
@@ -127,7 +130,8 @@ class NRAlertPoliciesTests(TestCase):
                     "name": self.policy_single_response['policy']['name'],
                     "incident_preference": self.policy_single_response['policy']['incident_preference']
                 }
-            })
+            }),
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'delete')
@@ -142,7 +146,8 @@ class NRAlertPoliciesTests(TestCase):
             url='https://api.newrelic.com/v2/alerts_policies/{0}.json'.format(
                 self.policy_single_response['policy']['id']
             ),
-            headers=self.policies.headers
+            headers=self.policies.headers,
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'put')
@@ -160,7 +165,8 @@ class NRAlertPoliciesTests(TestCase):
                 self.policy_single_response['policy']['id'],
                 self.channel_single_response['channel']['id']
             ),
-            headers=self.policies.headers
+            headers=self.policies.headers,
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'put')
@@ -178,5 +184,6 @@ class NRAlertPoliciesTests(TestCase):
                 self.policy_single_response['policy']['id'],
                 self.channel_single_response['channel']['id']
             ),
-            headers=self.policies.headers
+            headers=self.policies.headers,
+            timeout=DEFAULT_TIMEOUT
         )
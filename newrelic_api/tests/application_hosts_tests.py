@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.application_hosts import ApplicationHosts
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRApplicationHostsTests(TestCase):
@@ -136,7 +137,8 @@ class NRApplicationHostsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/applications/2345678/hosts.json',
             headers=self.app_hosts.headers,
-            params='filter[ids]=1234567'
+            params='filter[ids]=1234567',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
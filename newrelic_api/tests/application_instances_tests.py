@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.application_instances import ApplicationInstances
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRApplicationInstancesTests(TestCase):
@@ -134,7 +135,8 @@ class NRApplicationInstancesTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/applications/2345678/instances.json',
             headers=self.app_instances.headers,
-            params='filter[ids]=1234567'
+            params='filter[ids]=1234567',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
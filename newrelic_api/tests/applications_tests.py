@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.applications import Applications
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRApplicationsTests(TestCase):
@@ -150,7 +151,8 @@ class NRApplicationsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/applications.json',
             headers=self.app.headers,
-            params='filter[ids]=1234567'
+            params='filter[ids]=1234567',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -292,3 +294,14 @@ class NRApplicationsTests(TestCase):
         response = self.app.metric_data(id=1234567, names=['CPU/User Time'], values=['percent'], summarize=True)
 
         self.assertIsInstance(response, dict)
+
+    def test_show_many(self):
+        """
+        Test applications .show_many() fetches applications by id through .list()
+        """
+        with patch.object(self.app, '_show_many') as mock_show_many:
+            response = self.app.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.app.list, 'applications', [1, 2], batch_size=10, max_workers=3)
@@ -0,0 +1,185 @@
+import json
+from unittest import TestCase
+
+from newrelic_api.testing.backend import Backend, populate
+
+ROOT = 'https://api.newrelic.com/v2/'
+
+
+class _Unscannable(dict):
+    def items(self):
+        raise AssertionError('scanned')
+
+    def keys(self):
+        raise AssertionError('scanned')
+
+    def __iter__(self):
+        raise AssertionError('scanned')
+
+
+class BackendTests(TestCase):
+    def setUp(self):
+        super(BackendTests, self).setUp()
+        self.backend = Backend(page_size=2, metric_names_page_size=2)
+
+    def request(self, method, path, params=None, data=None):
+        response = self.backend.handle(
+            method, ROOT + path, params=params, data=json.dumps(data) if data is not None else None)
+        return response.status_code, json.loads(response.content.decode('utf-8')) if response.content else None
+
+    def test_list_pages(self):
+        """
+        Test listings are paginated with Link headers keeping the filters
+        """
+        for index in range(5):
+            self.backend.add('servers', {'name': 'web-{0}'.format(index)})
+
+        response = self.backend.handle('get', ROOT + 'servers.json', params='filter[name]=web&page=2')
+        body = json.loads(response.content.decode('utf-8'))
+
+        self.assertEqual([server['id'] for server in body['servers']], [3, 4])
+        self.assertIn('<https://api.newrelic.com/v2/servers.json?filter%5Bname%5D=web&page=3>; rel="next"',
+                      response.headers['Link'])
+        self.assertIn('rel="prev"', response.headers['Link'])
+        last = self.backend.handle('get', ROOT + 'servers.json', params='page=3')
+        self.assertNotIn('rel="next"', last.headers.get('Link', ''))
+
+    def test_filters(self):
+        """
+        Test the filters of a listing
+        """
+        self.backend.add('applications', {'name': 'Shop', 'language': 'python'})
+        self.backend.add('applications', {'name': 'shop-admin', 'language': 'java'})
+        self.backend.add('applications', {'name': 'billing', 'language': 'python'})
+
+        self.assertEqual(len(self.request('get', 'applications.json', 'filter[name]=shop')[1]['applications']), 2)
+        self.assertEqual(len(self.request('get', 'applications.json', 'filter[language]=java')[1]['applications']), 1)
+        self.assertEqual(
+            [app['id'] for app in self.request('get', 'applications.json', 'filter[ids]=1,3')[1]['applications']],
+            [1, 3])
+        self.assertEqual(
+            [app['id'] for app in self.request(
+                'get', 'applications.json', 'filter[ids]=3,01,2,9,x,3&filter[name]=SHOP')[1]['applications']],
+            [2])
+
+    def test_ids_filter_looks_up(self):
+        """
+        Test filtering a large account by ids does not scan every entity
+        """
+        populate(self.backend, scale=1)
+        entities = self.backend.entities['servers'] = _Unscannable(self.backend.entities['servers'])
+
+        servers = self.request('get', 'servers.json', 'filter[ids]=2,1')[1]['servers']
+
+        self.assertEqual([server['id'] for server in servers], [1, 2])
+        self.assertEqual(servers[0], entities[1])
+
+    def test_crud(self):
+        """
+        Test entities can be created, shown, updated and deleted
+        """
+        status, body = self.request('post', 'dashboards.json', data={'dashboard': {'title': 'ops'}})
+        self.assertEqual(status, 201)
+        dashboard_id = body['dashboard']['id']
+
+        status, body = self.request('put', 'dashboards/{0}.json'.format(dashboard_id), data={
+            'dashboard': {'title': 'operations'}})
+        self.assertEqual(body['dashboard']['title'], 'operations')
+        self.assertEqual(self.request('get', 'dashboards/{0}.json'.format(dashboard_id))[1], body)
+
+        self.assertEqual(self.request('delete', 'dashboards/{0}.json'.format(dashboard_id))[0], 200)
+        status, body = self.request('get', 'dashboards/{0}.json'.format(dashboard_id))
+        self.assertEqual(status, 404)
+        self.assertIn('error', body)
+
+    def test_scoped(self):
+        """
+        Test alert conditions are listed per policy and hosts per
+        application
+        """
+        self.request('post', 'alerts_conditions/policies/1.json', data={'condition': {'name': 'a'}})
+        self.request('post', 'alerts_conditions/policies/2.json', data={'condition': {'name': 'b'}})
+        self.backend.add('application_hosts', {'host': 'h'}, parent=7)
+
+        conditions = self.request('get', 'alerts_conditions.json', 'policy_id=2')[1]['conditions']
+        self.assertEqual([condition['name'] for condition in conditions], ['b'])
+        self.assertEqual(len(self.request('get', 'applications/7/hosts.json')[1]['application_hosts']), 1)
+        self.assertEqual(self.request('get', 'applications/7/hosts/1.json')[0], 200)
+        self.assertEqual(self.request('get', 'applications/8/hosts/1.json')[0], 404)
+
+    def test_policy_channels(self):
+        """
+        Test channels are associated with and dissociated from policies
+        """
+        policy = self.backend.add('alerts_policies', {'name': 'p'})
+        channel = self.backend.add('alerts_channels', {'name': 'c', 'links': {'policy_ids': []}})
+
+        status, body = self.request('put', 'alerts_policy_channels.json?policy_id=1&channel_ids=1')
+        self.assertEqual(body, {'policy': {'id': policy['id'], 'channel_ids': [channel['id']]}})
+        self.assertEqual(channel['links']['policy_ids'], [1])
+
+        self.request('delete', 'alerts_policy_channels.json?policy_id=1&channel_id=1')
+        self.assertEqual(channel['links']['policy_ids'], [])
+
+    def test_labels(self):
+        """
+        Test labels are merged by key, filter servers and can be deleted
+        """
+        for index in range(3):
+            self.backend.add('servers', {'name': 'server-{0}'.format(index)})
+        self.request('put', 'labels.json', data={'label': {'category': 'Team', 'name': 'a', 'links': {'servers': [1]}}})
+        self.request('put', 'labels.json', data={'label': {'category': 'Team', 'name': 'a', 'links': {'servers': [3]}}})
+
+        servers = self.request('get', 'servers.json', 'filter[labels]=Team:a')[1]['servers']
+        self.assertEqual([server['id'] for server in servers], [1, 3])
+
+        self.assertEqual(self.request('delete', 'labels/labels/Team:a.json')[0], 200)
+        self.assertEqual(self.request('get', 'labels.json')[1], {'labels': []})
+
+    def test_metrics(self):
+        """
+        Test metric names are listed and their data generated
+        """
+        self.backend.add('servers', {'name': 's'}, metric_names=['CPU/User', 'CPU/System', 'Memory/Used'])
+
+        status, body = self.request('get', 'servers/1/metrics.json', 'name=CPU')
+        self.assertEqual([metric['name'] for metric in body['metrics']], ['CPU/User', 'CPU/System'])
+
+        status, body = self.request('get', 'servers/1/metrics/data.json', {
+            'names[]': 'CPU/User', 'from': '2024-01-01T00:00:00+00:00', 'to': '2024-01-01T00:10:00+00:00'})
+        data = body['metric_data']
+        self.assertEqual(data['metrics_found'], ['CPU/User'])
+        self.assertEqual(len(data['metrics'][0]['timeslices']), 10)
+        self.assertEqual(self.request('get', 'servers/1/metrics/data.json', {
+            'names[]': 'CPU/User', 'from': '2024-01-01T00:00:00+00:00', 'to': '2024-01-01T00:10:00+00:00'})[1], body)
+
+        status, body = self.request('get', 'servers/1/metrics/data.json', 'names[]=Nope&summarize=true')
+        self.assertEqual(body['metric_data']['metrics_not_found'], ['Nope'])
+
+    def test_infra_conditions(self):
+        """
+        Test Infrastructure alert conditions are paginated by offset
+        """
+        for index in range(3):
+            self.backend.handle('post', 'https://infra-api.newrelic.com/v2/alerts/conditions', data=json.dumps({
+                'data': {'policy_id': 1, 'name': 'c{0}'.format(index)}}))
+
+        response = self.backend.handle(
+            'get', 'https://infra-api.newrelic.com/v2/alerts/conditions', params='policy_id=1&limit=2&offset=1')
+        body = json.loads(response.content.decode('utf-8'))
+
+        self.assertEqual([condition['name'] for condition in body['data']], ['c1', 'c2'])
+        self.assertEqual(body['meta'], {'limit': 2, 'offset': 1, 'total': 3})
+        deleted = self.backend.handle('delete', 'https://infra-api.newrelic.com/v2/alerts/conditions/1')
+        self.assertEqual((deleted.status_code, deleted.content), (204, b''))
+
+    def test_populate(self):
+        """
+        Test a generated account grows with its scale and is reproducible
+        """
+        backend = populate(Backend(), scale=2, seed=1)
+
+        self.assertEqual(len(backend.entities['applications']), 40)
+        self.assertEqual(len(backend.entities['servers']), 100)
+        self.assertEqual(len(backend.entities['application_hosts']), 80)
+        self.assertEqual(backend.entities, populate(Backend(), scale=2, seed=1).entities)
@@ -5,7 +5,10 @@ from mock import patch, call, Mock
 import requests
 
 from newrelic_api.base import Resource
-from newrelic_api.exceptions import ConfigurationException, NewRelicAPIServerException
+from newrelic_api.exceptions import (
+    ConfigurationException, NewRelicAPINotFoundException, NewRelicAPIServerException
+)
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class ResourceTests(TestCase):
@@ -182,8 +185,23 @@ class ResourceTests(TestCase):
 
         mock_get.assert_called_once_with(
             url=self.TEST_URL,
+            timeout=DEFAULT_TIMEOUT,
         )
 
+    @patch.object(requests, 'get')
+    def test_get_not_found(self, mock_get):
+        """
+        Test ._get() raises a distinct exception on 404
+        """
+        mock_get.return_value = Mock(name='response', ok=False, status_code=404, text='Not Found')
+
+        resource = Resource(api_key='123')
+
+        with self.assertRaises(NewRelicAPINotFoundException) as context:
+            resource._get(url=self.TEST_URL)
+
+        self.assertIsInstance(context.exception, NewRelicAPIServerException)
+
     @patch.object(requests, 'put')
     def test_put_not_ok(self, mock_put):
         """
@@ -199,6 +217,7 @@ class ResourceTests(TestCase):
 
         mock_put.assert_called_once_with(
             url=self.TEST_URL,
+            timeout=DEFAULT_TIMEOUT,
         )
 
     @patch.object(requests, 'post')
@@ -216,6 +235,7 @@ class ResourceTests(TestCase):
 
         mock_post.assert_called_once_with(
             url=self.TEST_URL,
+            timeout=DEFAULT_TIMEOUT,
         )
 
     @patch.object(requests, 'delete')
@@ -233,6 +253,7 @@ class ResourceTests(TestCase):
 
         mock_delete.assert_called_once_with(
             url=self.TEST_URL,
+            timeout=DEFAULT_TIMEOUT,
         )
 
     def test_build_param_string(self):
@@ -254,3 +275,55 @@ class ResourceTests(TestCase):
         param_str = resource.build_param_string(test_params)
 
         self.assertEqual(param_str, 'filter[name]=dev&page=1')
+
+    def test_batch_ids(self):
+        """
+        Tests ._batch_ids() bounds batches by count and length and drops duplicates
+        """
+        resource = Resource(api_key='123')
+
+        self.assertEqual(resource._batch_ids([1, 2, 2, 3, 4, 5], batch_size=2), [[1, 2], [3, 4], [5]])
+        self.assertEqual(resource._batch_ids([]), [])
+
+        resource.FILTER_IDS_MAX_LENGTH = 20
+        batches = resource._batch_ids([1234567890 + i for i in range(5)])
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1, 1, 1])
+
+    def test_show_many_leaves_out_unknown_ids(self):
+        """
+        Tests ._show_many() sends one list request per batch and only
+        returns the entities the API knows
+        """
+        resource = Resource(api_key='123')
+        known = dict((entity_id, {'id': entity_id}) for entity_id in [1, 2, 4, 5])
+        list_method = Mock(name='list', side_effect=lambda filter_ids, page: {
+            'servers': [known[entity_id] for entity_id in filter_ids if entity_id in known],
+        })
+
+        response = resource._show_many(list_method, 'servers', [1, 2, 3, 4, 5, 6, 1], batch_size=2, max_workers=1)
+
+        self.assertEqual(response, {1: {'id': 1}, 2: {'id': 2}, 4: {'id': 4}, 5: {'id': 5}})
+        list_method.assert_has_calls([
+            call(filter_ids=[1, 2], page=None),
+            call(filter_ids=[3, 4], page=None),
+            call(filter_ids=[5, 6], page=None),
+        ])
+        self.assertEqual(list_method.call_count, 3)
+
+    def test_show_many_follows_pages(self):
+        """
+        Tests ._show_many() fetches every page of a batch
+        """
+        resource = Resource(api_key='123')
+        list_method = Mock(name='list', side_effect=[
+            {'servers': [{'id': 1}], 'pages': {'next': {'url': 'page=2', 'rel': 'next'}}},
+            {'servers': [{'id': 2}]},
+        ])
+
+        response = resource._show_many(list_method, 'servers', [1, 2])
+
+        self.assertEqual(response, {1: {'id': 1}, 2: {'id': 2}})
+        list_method.assert_has_calls([
+            call(filter_ids=[1, 2], page=None),
+            call(filter_ids=[1, 2], page=2),
+        ])
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import patch
+
+from newrelic_api.exceptions import ConfigurationException
+from newrelic_api.testing import benchmarks
+from newrelic_api.testing.benchmarks import compare, load_results, main, result, run, save_results
+
+
+def results(**values):
+    return {
+        'version': benchmarks.RESULTS_VERSION, 'newrelic_api': '1.0.0', 'python': '3.11.0',
+        'benchmarks': dict((name, result(value, 'calls/s', higher_is_better=name.endswith('_rate')))
+                           for name, value in values.items()),
+    }
+
+
+class BenchmarksTests(TestCase):
+    def setUp(self):
+        super(BenchmarksTests, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(BenchmarksTests, self).tearDown()
+
+    def test_run(self):
+        """
+        Test every benchmark is run against a stand-in server
+        """
+        measured = run(scale=1, latency=0, concurrency=(1, 2), iterations=10, memory_servers=50)
+
+        self.assertEqual(sorted(measured['benchmarks']), [
+            'build_headers', 'build_param_string', 'decode_page', 'decode_page_interned', 'list_call',
+            'memory_servers', 'memory_servers_interned', 'metric_data_fan_out[1]', 'metric_data_fan_out[2]',
+            'pagination_entities', 'pagination_pages',
+        ])
+        self.assertTrue(all(benchmark['value'] > 0 for benchmark in measured['benchmarks'].values()))
+        self.assertTrue(measured['benchmarks']['pagination_pages']['higher_is_better'])
+        self.assertFalse(measured['benchmarks']['list_call']['higher_is_better'])
+
+    def test_save_and_load(self):
+        """
+        Test results are saved as JSON and loaded back
+        """
+        save_results(results(list_call=1.5), self.path)
+
+        self.assertEqual(load_results(self.path), results(list_call=1.5))
+
+    def test_incompatible_version(self):
+        """
+        Test results of another version are refused
+        """
+        with open(self.path, 'w') as f:
+            json.dump({'version': 0, 'benchmarks': {}}, f)
+
+        with self.assertRaises(ConfigurationException):
+            load_results(self.path)
+
+    def test_compare(self):
+        """
+        Test regressions are detected in the direction of each benchmark
+        """
+        baseline = results(list_call=100, decode=100, fetch_rate=100, page_rate=100, removed=1)
+        current = results(list_call=120, decode=105, fetch_rate=80, page_rate=150, added=1)
+
+        comparisons = dict((comparison['name'], comparison) for comparison in compare(baseline, current))
+
+        self.assertEqual(sorted(comparisons), ['decode', 'fetch_rate', 'list_call', 'page_rate'])
+        self.assertAlmostEqual(comparisons['list_call']['change'], 0.2)
+        self.assertEqual(
+            dict((name, comparison['regression']) for name, comparison in comparisons.items()),
+            {'decode': False, 'fetch_rate': True, 'list_call': True, 'page_rate': False})
+
+    def test_main(self):
+        """
+        Test the command line saves results and fails on a regression
+        """
+        baseline = os.path.join(self.directory, 'baseline.json')
+        save_results(results(list_call=100), baseline)
+
+        with patch.object(benchmarks, 'run', return_value=results(list_call=150)) as run_mock:
+            with patch('sys.stdout'):
+                status = main(['--scale', '2', '--output', self.path, '--baseline', baseline])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(run_mock.call_args[1]['scale'], 2)
+        self.assertEqual(load_results(self.path), results(list_call=150))
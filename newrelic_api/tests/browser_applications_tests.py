@@ -96,3 +96,14 @@ class NRBrowserApplicationsTests(TestCase):
         with self.assertRaises(ValueError):
             # Call the method
             self.browser_application.create(name='Account Global')
+
+    def test_show_many(self):
+        """
+        Test browser applications .show_many() fetches browser applications by id through .list()
+        """
+        with patch.object(self.browser_application, '_show_many') as mock_show_many:
+            response = self.browser_application.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.browser_application.list, 'browser_applications', [1, 2], batch_size=10, max_workers=3)
@@ -0,0 +1,686 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from mock import patch, Mock
+
+from newrelic_api.alert_policies import AlertPolicies
+from newrelic_api.applications import Applications
+from newrelic_api.cache import CachedResponse, MemoryCache, SQLiteCache
+from newrelic_api.client import NewRelicClient
+from newrelic_api.dashboards import Dashboards
+from newrelic_api.exceptions import (
+    ConfigurationException, NewRelicAPINotFoundException, NewRelicAPIServerException
+)
+from newrelic_api.notification_channels import NotificationChannels
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport, request_key
+from newrelic_api.users import Users
+
+
+def make_response(body, status_code=200, headers=None, links=None):
+    return CachedResponse(
+        status_code=status_code,
+        content=json.dumps(body).encode('utf-8'),
+        headers=headers or {'Content-Type': 'application/json'},
+        links=links,
+    )
+
+
+class CachedResponseTests(TestCase):
+
+    def test_from_response(self):
+        """
+        Test a requests response is copied
+        """
+        response = Mock(
+            name='response',
+            status_code=200,
+            content=b'{"users": []}',
+            headers={'ETag': '"abc"'},
+            links={'next': {'url': 'https://api.newrelic.com/v2/users.json?page=2', 'rel': 'next'}},
+        )
+
+        cached = CachedResponse.from_response(response)
+
+        self.assertTrue(cached.ok)
+        self.assertEqual(cached.json(), {'users': []})
+        self.assertEqual(cached.text, '{"users": []}')
+        self.assertEqual(cached.headers, {'etag': '"abc"'})
+        self.assertEqual(cached.links, response.links)
+        self.assertIsNot(cached.links['next'], response.links['next'])
+
+    def test_not_ok(self):
+        """
+        Test error statuses are not ok
+        """
+        self.assertFalse(make_response({}, status_code=404).ok)
+
+
+class MemoryCacheTests(TestCase):
+    def setUp(self):
+        super(MemoryCacheTests, self).setUp()
+        self.now = 0
+        self.cache = MemoryCache(clock=lambda: self.now, default_ttl=10)
+        self.url = 'https://api.newrelic.com/v2/applications/1.json'
+        self.key = request_key('get', self.url)
+
+    def test_get_and_expire(self):
+        """
+        Test responses are served until their ttl runs out
+        """
+        self.cache.set(self.key, self.url, make_response({'application': {}}))
+
+        self.assertEqual(self.cache.get(self.key).json(), {'application': {}})
+        self.now = 10
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_endpoint_ttls(self):
+        """
+        Test exact templates, patterns and the default ttl
+        """
+        cache = MemoryCache(default_ttl=5, ttls={'users.json': 3600, 'applications/*': 30})
+
+        self.assertEqual(cache.ttl('https://api.newrelic.com/v2/users.json?page=2'), 3600)
+        self.assertEqual(cache.ttl('https://api.newrelic.com/v2/applications/1.json'), 30)
+        self.assertEqual(cache.ttl('https://api.newrelic.com/v2/applications/1/metrics/data.json'), 0)
+        self.assertEqual(cache.ttl('https://api.newrelic.com/v2/servers.json'), 5)
+
+    def test_zero_ttl_is_not_stored(self):
+        """
+        Test endpoints with a ttl of 0 are never cached
+        """
+        url = 'https://api.newrelic.com/v2/applications/1/metrics/data.json'
+
+        self.cache.set(request_key('get', url), url, make_response({}))
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_entry_bound(self):
+        """
+        Test the least recently used entry is evicted first
+        """
+        self.cache.max_entries = 2
+        keys = [request_key('get', 'url{0}'.format(i)) for i in range(3)]
+        self.cache.set(keys[0], 'url0', make_response({}))
+        self.cache.set(keys[1], 'url1', make_response({}))
+        self.cache.get(keys[0])
+
+        self.cache.set(keys[2], 'url2', make_response({}))
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_byte_bound(self):
+        """
+        Test entries are evicted once the total size is over max_bytes
+        """
+        response = make_response({'name': 'x' * 100})
+        self.cache.max_bytes = response.size * 2 + 50
+
+        for i in range(3):
+            self.cache.set(request_key('get', 'url{0}'.format(i)), 'url{0}'.format(i), response)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertLessEqual(self.cache.size, self.cache.max_bytes)
+
+        self.cache.clear()
+        self.assertEqual((len(self.cache), self.cache.size), (0, 0))
+
+    def test_invalidate_collection(self):
+        """
+        Test a write invalidates every url of the same resource only
+        """
+        list_url = 'https://api.newrelic.com/v2/applications.json'
+        users_url = 'https://api.newrelic.com/v2/users.json'
+        for url in [self.url, list_url, users_url]:
+            self.cache.set(request_key('get', url), url, make_response({}))
+
+        self.cache.invalidate('https://api.newrelic.com/v2/applications/1.json')
+
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertIsNone(self.cache.get(request_key('get', list_url)))
+        self.assertIsNotNone(self.cache.get(request_key('get', users_url)))
+
+    def test_stale_generation_is_not_stored(self):
+        """
+        Test a response fetched before an invalidation is not stored
+        """
+        generation = self.cache.generation(self.url)
+        self.cache.invalidate(self.url)
+
+        self.cache.set(self.key, self.url, make_response({}), generation=generation)
+
+        self.assertEqual(len(self.cache), 0)
+
+
+class TransportCacheTests(TestCase):
+    def setUp(self):
+        super(TransportCacheTests, self).setUp()
+        self.session = Mock(name='session')
+        self.session.get.return_value = make_response({'application': {'id': 1}})
+        self.session.put.return_value = make_response({'application': {'id': 1}})
+        self.cache = MemoryCache()
+        self.applications = Applications(
+            api_key='dummy_key',
+            transport=Transport(session=self.session, cache=self.cache)
+        )
+
+    def test_show_is_cached(self):
+        """
+        Test repeated shows are served from the cache
+        """
+        first = self.applications.show(1)
+        second = self.applications.show(1)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_errors_are_not_cached(self):
+        """
+        Test error responses are never stored
+        """
+        self.session.get.return_value = make_response({}, status_code=500)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.applications.show(1)
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_update_invalidates(self):
+        """
+        Test an update through the same transport invalidates the resource
+        """
+        self.session.get.return_value = make_response({
+            'application': {
+                'name': 'app',
+                'settings': {
+                    'app_apdex_threshold': 0.5,
+                    'end_user_apdex_threshold': 7,
+                    'enable_real_user_monitoring': True,
+                },
+            }
+        })
+        self.applications.list()
+
+        self.applications.update(1, name='new name')
+        self.applications.list()
+
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_policy_channel_association_invalidates_channels(self):
+        """
+        Test associating a policy with a channel invalidates the cached
+        notification channels, whose links list their policies
+        """
+        transport = self.applications.transport
+        channels = NotificationChannels(api_key='dummy_key', transport=transport)
+        policies = AlertPolicies(api_key='dummy_key', transport=transport)
+        self.session.get.return_value = make_response({'channels': []})
+        channels.list()
+        channels.list()
+        self.assertEqual(self.session.get.call_count, 1)
+
+        policies.associate_with_notification_channel(1, 2)
+        channels.list()
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+
+class ConditionalRequestTests(TestCase):
+    def setUp(self):
+        super(ConditionalRequestTests, self).setUp()
+        self.now = 0
+        self.session = Mock(name='session')
+        self.cache = MemoryCache(clock=lambda: self.now, default_ttl=10)
+        self.dashboards = Dashboards(
+            api_key='dummy_key',
+            transport=Transport(session=self.session, cache=self.cache)
+        )
+        self.body = {'dashboard': {'id': 1, 'title': 'test-dashboard'}}
+        self.session.get.return_value = make_response(
+            self.body,
+            headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 19 Oct 2026 10:00:00 GMT'}
+        )
+
+    def test_validators(self):
+        """
+        Test conditional headers are built from ETag and Last-Modified
+        """
+        self.assertEqual(
+            self.session.get.return_value.validators,
+            {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 19 Oct 2026 10:00:00 GMT'}
+        )
+        self.assertEqual(make_response({}).validators, {})
+
+    def test_not_modified_returns_cached_body(self):
+        """
+        Test an expired response is revalidated and reused on 304
+        """
+        self.dashboards.show(1)
+        self.now = 10
+        self.session.get.return_value = CachedResponse(304, b'', headers={'ETag': '"v2"'})
+
+        response = self.dashboards.show(1)
+
+        self.assertEqual(response, self.body)
+        self.assertEqual(self.session.get.call_count, 2)
+        headers = self.session.get.call_args[1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 19 Oct 2026 10:00:00 GMT')
+        self.assertNotIn('If-None-Match', self.dashboards.headers)
+        self.assertEqual(self.cache.revalidations, 1)
+
+        # The revalidated response is fresh again and carries the new validator
+        self.dashboards.show(1)
+        self.assertEqual(self.session.get.call_count, 2)
+        key = request_key('get', 'https://api.newrelic.com/v2/dashboards/1.json', None, self.dashboards.headers)
+        self.assertEqual(self.cache.get_stale(key).validators['If-None-Match'], '"v2"')
+
+    def test_modified_replaces_cached_body(self):
+        """
+        Test a full response to a conditional request replaces the entry
+        """
+        self.dashboards.show(1)
+        self.now = 10
+        self.session.get.return_value = make_response({'dashboard': {'id': 1, 'title': 'renamed'}})
+
+        response = self.dashboards.show(1)
+
+        self.assertEqual(response['dashboard']['title'], 'renamed')
+        self.assertEqual(self.cache.revalidations, 0)
+
+
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        super(StaleWhileRevalidateTests, self).setUp()
+        self.now = 0
+        self.release = threading.Event()
+        self.session = Mock(name='session')
+        self.session.get.return_value = make_response({'policies': [{'name': 'v1'}]})
+        self.cache = MemoryCache(
+            clock=lambda: self.now, default_ttl=10, stale_while_revalidate=30, max_refreshes=1)
+        self.policies = AlertPolicies(
+            api_key='dummy_key',
+            transport=Transport(session=self.session, cache=self.cache)
+        )
+        self.policies.list()
+
+    def slow_get(self, **kwargs):
+        self.release.wait(5)
+        return make_response({'policies': [{'name': 'v2'}]})
+
+    def wait_for_refreshes(self):
+        deadline = time.time() + 5
+        while self.cache.refreshing and time.time() < deadline:
+            time.sleep(0.001)
+
+    def test_stale_is_served_and_refreshed(self):
+        """
+        Test an expired response is returned at once and refreshed in the background
+        """
+        self.now = 15
+        self.session.get.side_effect = self.slow_get
+
+        response = self.policies.list()
+
+        self.assertEqual(response['policies'][0]['name'], 'v1')
+        self.assertEqual(self.cache.stale_hits, 1)
+
+        self.release.set()
+        self.wait_for_refreshes()
+
+        self.assertEqual(self.policies.list()['policies'][0]['name'], 'v2')
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_one_refresh_per_key(self):
+        """
+        Test repeated stale reads do not start more refreshes than allowed
+        """
+        self.now = 15
+        self.session.get.side_effect = self.slow_get
+
+        for _ in range(5):
+            self.policies.list()
+
+        self.assertEqual(len(self.cache.refreshing), 1)
+        self.assertFalse(self.cache.begin_refresh(('another', 'key')))
+
+        self.release.set()
+        self.wait_for_refreshes()
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_too_stale_blocks(self):
+        """
+        Test responses past the staleness bound are fetched in the foreground
+        """
+        self.now = 40
+        self.session.get.return_value = make_response({'policies': [{'name': 'v2'}]})
+
+        self.assertEqual(self.policies.list()['policies'][0]['name'], 'v2')
+        self.assertEqual(self.cache.stale_hits, 0)
+
+    def test_failed_refresh_keeps_stale(self):
+        """
+        Test a failing background refresh leaves the stale response in place
+        """
+        self.now = 15
+        self.session.get.side_effect = ValueError('boom')
+
+        self.policies.list()
+        self.wait_for_refreshes()
+
+        self.assertEqual(self.policies.list()['policies'][0]['name'], 'v1')
+
+
+class SQLiteCacheTests(TestCase):
+    def setUp(self):
+        super(SQLiteCacheTests, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+        self.now = 1000
+        self.cache = self.open_cache()
+        self.url = 'https://api.newrelic.com/v2/applications/1.json'
+        self.key = request_key('get', self.url, None, {'X-Api-Key': 'secret'})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(SQLiteCacheTests, self).tearDown()
+
+    def open_cache(self, **kwargs):
+        kwargs.setdefault('default_ttl', 10)
+        return SQLiteCache(self.path, clock=lambda: self.now, **kwargs)
+
+    def test_round_trip(self):
+        """
+        Test a stored response is returned intact until it expires
+        """
+        response = make_response(
+            {'application': {'id': 1}},
+            headers={'ETag': '"v1"'},
+            links={'next': {'url': 'https://api.newrelic.com/v2/applications.json?page=2', 'rel': 'next'}},
+        )
+
+        self.cache.set(self.key, self.url, response)
+        cached = self.cache.get(self.key)
+
+        self.assertEqual(cached.json(), {'application': {'id': 1}})
+        self.assertEqual(cached.headers, response.headers)
+        self.assertEqual(cached.links, response.links)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, len(self.url) + response.size)
+
+        self.now += 10
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertIsNotNone(self.cache.get_stale(self.key))
+
+    def test_api_key_not_on_disk(self):
+        """
+        Test request keys are hashed before being stored
+        """
+        self.cache.set(self.key, self.url, make_response({}))
+        self.cache.close()
+
+        with open(self.path, 'rb') as f:
+            self.assertNotIn(b'secret', f.read())
+
+    def test_shared_between_instances(self):
+        """
+        Test responses and invalidations are shared through the database
+        """
+        other = self.open_cache()
+
+        self.cache.set(self.key, self.url, make_response({'application': {'id': 1}}))
+        self.assertEqual(other.get(self.key).json(), {'application': {'id': 1}})
+
+        generation = self.cache.generation(self.url)
+        other.invalidate(self.url)
+
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertNotEqual(self.cache.generation(self.url), generation)
+        self.cache.set(self.key, self.url, make_response({}), generation=generation)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        """
+        Test the least recently used entries are evicted past max_entries
+        """
+        cache = self.open_cache(max_entries=2, touch_interval=0)
+        keys = [request_key('get', 'url{0}'.format(i)) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            self.now += 1
+            cache.set(key, 'url{0}'.format(i), make_response({}))
+        self.now += 1
+        cache.get(keys[0])
+
+        self.now += 1
+        cache.set(keys[2], 'url2', make_response({}))
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get_stale(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_hits_touch_at_most_once_per_interval(self):
+        """
+        Test hits only record the last use once touch_interval has passed,
+        so most reads do not write to the database
+        """
+        cache = self.open_cache(touch_interval=60, default_ttl=600)
+        cache.set(self.key, self.url, make_response({}))
+
+        def accessed():
+            return cache._connection().execute('SELECT accessed FROM responses').fetchone()[0]
+
+        self.now += 30
+        cache.get(self.key)
+        self.assertEqual(accessed(), 1000)
+
+        self.now += 30
+        cache.get(self.key)
+        self.assertEqual(accessed(), 1060)
+
+    def test_byte_eviction_and_purge(self):
+        """
+        Test max_bytes bounds the database, and purge drops unservable entries
+        """
+        response = make_response({'name': 'x' * 100})
+        cache = self.open_cache(max_bytes=(response.size + 10) * 2)
+        for i in range(3):
+            self.now += 1
+            cache.set(request_key('get', 'url{0}'.format(i)), 'url{0}'.format(i), response)
+
+        self.assertEqual(len(cache), 2)
+
+        self.now += 100
+        cache.purge()
+        self.assertEqual(len(cache), 0)
+
+    def test_transport(self):
+        """
+        Test the backend plugs into a transport
+        """
+        session = Mock(name='session')
+        session.get.return_value = make_response({'users': []})
+        users = Users(api_key='dummy_key', transport=Transport(session=session, cache=self.cache))
+
+        users.list()
+        users.list()
+
+        self.assertEqual(session.get.call_count, 1)
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        super(SnapshotTests, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'snapshot.json.gz')
+        self.session = Mock(name='session')
+        self.session.get.return_value = make_response(
+            {'servers': [{'id': 1, 'name': 'web'}]},
+            headers={'ETag': '"v1"'},
+            links={'next': {'url': 'https://api.newrelic.com/v2/servers.json?page=2', 'rel': 'next'}},
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(SnapshotTests, self).tearDown()
+
+    def make_client(self, api_key='dummy_key', **kwargs):
+        return NewRelicClient(api_key=api_key, session=self.session, cache=MemoryCache(default_ttl=60), **kwargs)
+
+    def test_round_trip(self):
+        """
+        Test a new client starts with the responses a previous one cached
+        """
+        client = self.make_client()
+        response = client.servers.list(page=1)
+
+        self.assertEqual(client.save_snapshot(self.path), 1)
+
+        warm = self.make_client(snapshot=self.path)
+        self.assertEqual(warm.servers.list(page=1), response)
+        self.assertEqual(self.session.get.call_count, 1)
+
+        with gzip.open(self.path, 'rb') as f:
+            self.assertNotIn(b'dummy_key', f.read())
+
+    def test_other_api_keys_are_not_exported(self):
+        """
+        Test only responses fetched with the client's own key are saved
+        """
+        client = self.make_client()
+        client.servers.list()
+        Servers(api_key='other_key', transport=client.transport).list()
+
+        self.assertEqual(client.save_snapshot(self.path), 1)
+
+    def test_expired_entries_are_revalidated(self):
+        """
+        Test responses that expired since the snapshot trigger a conditional request
+        """
+        client = self.make_client()
+        client.servers.list()
+        client.save_snapshot(self.path)
+
+        with patch.object(time, 'time', return_value=time.time() + 120):
+            warm = self.make_client(snapshot=self.path)
+        self.session.get.return_value = CachedResponse(304, b'')
+
+        self.assertEqual(warm.servers.list()['servers'], [{'id': 1, 'name': 'web'}])
+        self.assertEqual(self.session.get.call_args[1]['headers']['If-None-Match'], '"v1"')
+        self.assertEqual(warm.transport.cache.revalidations, 1)
+
+    def test_sqlite_cache(self):
+        """
+        Test snapshots can be saved from a SQLite cache, which keeps the
+        request of each response next to its hashed key
+        """
+        cache = SQLiteCache(os.path.join(self.directory, 'cache.sqlite'), default_ttl=60)
+        client = NewRelicClient(api_key='dummy_key', session=self.session, cache=cache)
+        client.servers.list(page=1)
+        Servers(api_key='other_key', transport=client.transport).list()
+
+        self.assertEqual(client.save_snapshot(self.path), 1)
+
+        warm = self.make_client(snapshot=self.path)
+        self.assertEqual(warm.servers.list(page=1)['servers'], [{'id': 1, 'name': 'web'}])
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_no_cache(self):
+        """
+        Test snapshots on a client without a cache raise a configuration error
+        """
+        client = NewRelicClient(api_key='dummy_key', session=self.session)
+        self.make_client().save_snapshot(self.path)
+
+        with self.assertRaises(ConfigurationException):
+            client.save_snapshot(self.path)
+        with self.assertRaises(ConfigurationException):
+            NewRelicClient(api_key='dummy_key', snapshot=self.path)
+
+    def test_missing_snapshot(self):
+        """
+        Test a missing snapshot file is ignored
+        """
+        client = self.make_client(snapshot=os.path.join(self.directory, 'missing'))
+
+        self.assertEqual(len(client.transport.cache), 0)
+
+    def test_incompatible_version(self):
+        """
+        Test snapshots from another format version are ignored
+        """
+        with gzip.open(self.path, 'wb') as f:
+            f.write(json.dumps({'version': 0, 'entries': [{}]}).encode('utf-8'))
+
+        self.assertEqual(self.make_client().load_snapshot(self.path), 0)
+
+
+class NegativeCacheTests(TestCase):
+    def setUp(self):
+        super(NegativeCacheTests, self).setUp()
+        self.now = 0
+        self.session = Mock(name='session')
+        self.session.get.return_value = make_response({'error': {'title': 'Not found'}}, status_code=404)
+        self.cache = MemoryCache(clock=lambda: self.now, default_ttl=60, negative_ttl=5)
+        self.servers = Servers(api_key='dummy_key', transport=Transport(session=self.session, cache=self.cache))
+
+    def test_missing_entity_is_remembered(self):
+        """
+        Test a 404 is served from the cache until the negative ttl runs out
+        """
+        for _ in range(3):
+            with self.assertRaises(NewRelicAPINotFoundException):
+                self.servers.show(1)
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.now = 5
+        with self.assertRaises(NewRelicAPINotFoundException):
+            self.servers.show(1)
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_disabled_by_default(self):
+        """
+        Test 404s are not cached without a negative ttl
+        """
+        self.cache.negative_ttl = 0
+
+        for _ in range(2):
+            with self.assertRaises(NewRelicAPINotFoundException):
+                self.servers.show(1)
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_write_invalidates(self):
+        """
+        Test a write to the resource forgets missing entities
+        """
+        with self.assertRaises(NewRelicAPINotFoundException):
+            self.servers.show(1)
+
+        self.session.delete.return_value = make_response({})
+        self.servers.delete(2)
+        self.session.get.return_value = make_response({'server': {'id': 1}})
+
+        self.assertEqual(self.servers.show(1), {'server': {'id': 1}})
+
+    def test_other_errors_are_not_cached(self):
+        """
+        Test server errors are never cached
+        """
+        self.session.get.return_value = make_response({}, status_code=503)
+
+        for _ in range(2):
+            with self.assertRaises(NewRelicAPIServerException):
+                self.servers.show(1)
+
+        self.assertEqual(self.session.get.call_count, 2)
@@ -0,0 +1,165 @@
+from unittest import TestCase
+
+from mock import Mock
+import requests
+
+from newrelic_api.circuit_breaker import CircuitBreaker
+from newrelic_api.exceptions import CircuitOpenException
+from newrelic_api.transport import Transport
+
+API_URL = 'https://api.newrelic.com/v2/applications.json'
+INFRA_URL = 'https://infra-api.newrelic.com/v2/alerts/conditions'
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        super(CircuitBreakerTests, self).setUp()
+        self.now = 0
+        self.on_state_change = Mock(name='on_state_change')
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5, window=4, min_requests=4, reset_timeout=30, probes=2,
+            on_state_change=self.on_state_change, clock=lambda: self.now)
+
+    def fail(self, url, count):
+        for _ in range(count):
+            self.breaker.before_request(url)
+            self.breaker.record(url, False)
+
+    def test_opens_at_failure_rate(self):
+        """
+        Test the circuit opens once enough requests of the window failed
+        """
+        self.breaker.record(API_URL, True)
+        self.breaker.record(API_URL, True)
+        self.fail(API_URL, 1)
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'closed')
+
+        self.fail(API_URL, 1)
+
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'open')
+        self.on_state_change.assert_called_once_with('api.newrelic.com', 'closed', 'open')
+
+    def test_min_requests(self):
+        """
+        Test a few failures on a quiet host do not open the circuit
+        """
+        self.fail(API_URL, 3)
+
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'closed')
+
+    def test_open_fails_fast(self):
+        """
+        Test requests are refused while the circuit is open
+        """
+        self.fail(API_URL, 4)
+
+        with self.assertRaises(CircuitOpenException):
+            self.breaker.before_request(API_URL)
+        self.assertEqual(self.breaker.states()['api.newrelic.com']['rejected'], 1)
+
+    def test_hosts_are_independent(self):
+        """
+        Test an open circuit on one host does not affect the other
+        """
+        self.fail(INFRA_URL, 4)
+
+        self.breaker.before_request(API_URL)
+        self.assertEqual(self.breaker.state('infra-api.newrelic.com'), 'open')
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'closed')
+
+    def test_half_open_probes_close(self):
+        """
+        Test the circuit closes once every probe succeeds
+        """
+        self.fail(API_URL, 4)
+        self.now = 30
+
+        self.breaker.before_request(API_URL)
+        self.breaker.before_request(API_URL)
+        with self.assertRaises(CircuitOpenException):
+            self.breaker.before_request(API_URL)
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'half_open')
+
+        self.breaker.record(API_URL, True)
+        self.breaker.record(API_URL, True)
+
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'closed')
+        self.assertEqual(self.breaker.states()['api.newrelic.com']['failure_rate'], 0.0)
+
+    def test_half_open_failure_reopens(self):
+        """
+        Test a failed probe opens the circuit for another reset timeout
+        """
+        self.fail(API_URL, 4)
+        self.now = 30
+        self.breaker.before_request(API_URL)
+        self.breaker.record(API_URL, False)
+
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'open')
+        self.now = 59
+        with self.assertRaises(CircuitOpenException):
+            self.breaker.before_request(API_URL)
+        self.now = 60
+        self.breaker.before_request(API_URL)
+
+    def test_abandoned_probe_is_given_back(self):
+        """
+        Test a probe that ended without an outcome frees its slot
+        """
+        self.fail(API_URL, 4)
+        self.now = 30
+        self.breaker.before_request(API_URL)
+        self.breaker.before_request(API_URL)
+
+        self.breaker.abandon(API_URL)
+
+        self.breaker.before_request(API_URL)
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'half_open')
+
+    def test_callback_can_read_states(self):
+        """
+        Test the state change callback is called without the lock held, so
+        it can read the states of the breaker
+        """
+        seen = []
+        self.breaker.on_state_change = lambda host, previous, state: seen.append(
+            self.breaker.states()[host]['state'])
+
+        self.fail(API_URL, 4)
+        self.now = 30
+        self.breaker.before_request(API_URL)
+
+        self.assertEqual(seen, ['open', 'half_open'])
+
+
+class TransportCircuitBreakerTests(TestCase):
+    def setUp(self):
+        super(TransportCircuitBreakerTests, self).setUp()
+        self.breaker = CircuitBreaker(window=2, min_requests=2)
+        self.session = Mock(name='session')
+        self.transport = Transport(session=self.session, coalesce=False, circuit_breaker=self.breaker)
+
+    def test_server_errors_and_connection_errors_open(self):
+        """
+        Test 5xx responses and connection errors count as failures
+        """
+        self.session.get.side_effect = [Mock(status_code=503), requests.ConnectionError()]
+
+        self.transport.request('get', API_URL)
+        with self.assertRaises(requests.ConnectionError):
+            self.transport.request('get', API_URL)
+        with self.assertRaises(CircuitOpenException):
+            self.transport.request('get', API_URL)
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_client_errors_do_not_open(self):
+        """
+        Test 4xx responses do not count as failures
+        """
+        self.session.get.return_value = Mock(status_code=404)
+
+        for _ in range(3):
+            self.transport.request('get', API_URL)
+
+        self.assertEqual(self.breaker.state('api.newrelic.com'), 'closed')
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from mock import patch, Mock
+
+import newrelic_api
+from newrelic_api.applications import Applications
+from newrelic_api.alert_conditions_infra import AlertConditionsInfra
+from newrelic_api.client import NewRelicClient
+from newrelic_api.exceptions import ConfigurationException
+from newrelic_api.transport import DEFAULT_TIMEOUT
+
+
+class NewRelicClientTests(TestCase):
+    def setUp(self):
+        super(NewRelicClientTests, self).setUp()
+        self.session = Mock(name='session')
+        self.client = NewRelicClient(api_key='dummy_key', session=self.session)
+
+    def test_resources_are_lazy(self):
+        """
+        Test resources are only created on first access
+        """
+        self.assertNotIn('applications', self.client.__dict__)
+
+        applications = self.client.applications
+
+        self.assertIsInstance(applications, Applications)
+        self.assertIs(self.client.applications, applications)
+        self.assertIn('applications', dir(self.client))
+
+    def test_resources_share_configuration(self):
+        """
+        Test every resource shares the client's key and transport
+        """
+        infra = self.client.alert_conditions_infra
+
+        self.assertIsInstance(infra, AlertConditionsInfra)
+        self.assertIs(infra.transport, self.client.transport)
+        self.assertIs(self.client.servers.transport, self.client.transport)
+        self.assertEqual(infra.api_key, 'dummy_key')
+
+    def test_every_resource_resolves(self):
+        """
+        Test every attribute in RESOURCES maps to a resource class
+        """
+        for name, class_name in NewRelicClient.RESOURCES.items():
+            self.assertEqual(type(getattr(self.client, name)).__name__, class_name)
+
+    def test_requests_use_session(self):
+        """
+        Test resource requests are sent with the shared session
+        """
+        self.session.get.return_value = Mock(name='response', ok=True, links=None)
+        self.session.get.return_value.json.return_value = {'application': {}}
+
+        self.client.applications.show(1)
+
+        self.session.get.assert_called_once_with(
+            url='https://api.newrelic.com/v2/applications/1.json',
+            headers=self.client.applications.headers,
+            timeout=DEFAULT_TIMEOUT,
+        )
+
+    def test_unknown_attribute(self):
+        """
+        Test unknown attributes raise AttributeError
+        """
+        with self.assertRaises(AttributeError):
+            self.client.not_a_resource
+
+    @patch('os.environ.get')
+    def test_missing_api_key(self, os_environ_mock):
+        """
+        Test the client fails fast without an API key
+        """
+        os_environ_mock.return_value = None
+
+        with self.assertRaises(ConfigurationException):
+            NewRelicClient()
+
+    def test_package_export(self):
+        """
+        Test the client is exported from the package
+        """
+        self.assertIs(newrelic_api.NewRelicClient, NewRelicClient)
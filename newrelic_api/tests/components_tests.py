@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.components import Components
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRComponentsTests(TestCase):
@@ -75,7 +76,8 @@ class NRComponentsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/components.json',
             headers=self.components.headers,
-            params='filter[name]=SendGrid'
+            params='filter[name]=SendGrid',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -88,7 +90,8 @@ class NRComponentsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/components.json',
             headers=self.components.headers,
-            params='filter[name]=SendGrid&filter[ids]=2223333'
+            params='filter[name]=SendGrid&filter[ids]=2223333',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -101,6 +104,7 @@ class NRComponentsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/components/2223333.json',
             headers=self.components.headers,
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -0,0 +1,226 @@
+import threading
+from unittest import TestCase
+
+from mock import Mock
+
+from newrelic_api.circuit_breaker import CircuitBreaker
+from newrelic_api.concurrency import AdaptiveLimiter, fan_out
+from newrelic_api.deadline import deadline
+from newrelic_api.exceptions import DeadlineExceededException
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport
+
+URL = 'https://api.newrelic.com/v2/servers.json'
+
+
+class FanOutTests(TestCase):
+
+    def test_results_keep_order(self):
+        """
+        Test results are returned in the order of the items
+        """
+        self.assertEqual(fan_out(lambda x: x * 2, range(20), max_workers=4), [x * 2 for x in range(20)])
+
+    def test_runs_on_threads(self):
+        """
+        Test items are processed on worker threads
+        """
+        threads = set()
+
+        def record(item):
+            threads.add(threading.current_thread().name)
+
+        fan_out(record, range(20), max_workers=4)
+
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_single_item_runs_inline(self):
+        """
+        Test a single item is processed on the calling thread
+        """
+        self.assertEqual(fan_out(lambda x: threading.current_thread(), [1]), [threading.current_thread()])
+        self.assertEqual(fan_out(lambda x: x, []), [])
+
+    def test_exceptions_propagate(self):
+        """
+        Test an exception raised by a call is raised to the caller
+        """
+        def fail(item):
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        with self.assertRaises(ValueError):
+            fan_out(fail, range(10), max_workers=4)
+
+
+class AdaptiveLimiterTests(TestCase):
+    def setUp(self):
+        super(AdaptiveLimiterTests, self).setUp()
+        self.now = 0
+        self.limiter = AdaptiveLimiter(initial_limit=2, max_limit=4, clock=lambda: self.now)
+
+    def saturate(self, status_code=200, latency=1):
+        tickets = [self.limiter.acquire(URL) for _ in range(self.limiter.limit)]
+        for ticket in tickets:
+            self.limiter.start(ticket)
+        self.now += latency
+        for ticket in tickets:
+            self.limiter.release(ticket, status_code)
+
+    def test_additive_increase(self):
+        """
+        Test healthy rounds that use the limit raise it by about one
+        """
+        self.saturate()
+        self.assertEqual(self.limiter.limit, 2)
+        self.saturate()
+        self.assertEqual(self.limiter.limit, 3)
+
+    def test_no_increase_when_unused(self):
+        """
+        Test the limit does not grow while less than half of it is used
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=4, max_limit=8, clock=lambda: self.now)
+        for _ in range(10):
+            self.limiter.release(self.limiter.acquire(URL), 200)
+
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_multiplicative_decrease_once_per_burst(self):
+        """
+        Test a burst of 429s halves the limit once
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=8, max_limit=8, clock=lambda: self.now)
+
+        self.saturate(status_code=429)
+
+        self.assertEqual(self.limiter.limit, 4)
+        self.assertEqual(self.limiter.decreases, 1)
+
+    def test_errors_and_server_errors_decrease(self):
+        """
+        Test connection errors and 5xx responses back off
+        """
+        self.limiter.release(self.limiter.acquire(URL))
+        self.limiter.release(self.limiter.acquire(URL), 503)
+
+        self.assertEqual(self.limiter.decreases, 2)
+        self.assertEqual(self.limiter.limit, 1)
+
+    def test_latency_spike_decreases(self):
+        """
+        Test a response much slower than usual for its endpoint backs off
+        """
+        self.saturate(latency=1)
+        self.limiter.release(self.limiter.acquire('https://api.newrelic.com/v2/applications.json'), 200)
+        self.assertEqual(self.limiter.decreases, 0)
+
+        self.saturate(latency=5)
+
+        self.assertEqual(self.limiter.decreases, 1)
+
+    def test_slower_endpoint_settles(self):
+        """
+        Test an endpoint that stays slower but healthy stops counting as
+        spiking once its usual latency has caught up
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=4, max_limit=32, clock=lambda: self.now)
+        self.saturate(latency=0.1)
+
+        for _ in range(100):
+            self.saturate(latency=0.5)
+
+        self.assertLess(self.limiter.decreases, 10)
+        self.assertGreater(self.limiter.limit, 4)
+
+    def test_short_latencies_are_not_spikes(self):
+        """
+        Test latencies under min_spike_latency never back off
+        """
+        self.saturate(latency=0.001)
+        self.saturate(latency=0.01)
+
+        self.assertEqual(self.limiter.decreases, 0)
+
+    def test_cancel_does_not_adjust(self):
+        """
+        Test a cancelled request frees its slot without changing the limit
+        """
+        self.limiter.cancel(self.limiter.acquire(URL))
+
+        self.assertEqual((self.limiter.in_flight, self.limiter.decreases, self.limiter.increases), (0, 0, 0))
+
+    def test_acquire_waits_for_a_slot(self):
+        """
+        Test acquire blocks at the limit until a request is released
+        """
+        self.limiter = AdaptiveLimiter(initial_limit=1)
+        ticket = self.limiter.acquire(URL)
+
+        with self.assertRaises(DeadlineExceededException):
+            self.limiter.acquire(URL, timeout=0.01)
+
+        threading.Timer(0.01, self.limiter.release, args=(ticket, 200)).start()
+        self.limiter.acquire(URL, timeout=5)
+
+    def test_show_many_uses_limiter(self):
+        """
+        Test fan-out helpers send requests through the limiter and size
+        their pool to its maximum
+        """
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=6)
+        session = Mock(name='session')
+        session.get.return_value.status_code = 200
+        session.get.return_value.links = {}
+        session.get.return_value.json.return_value = {'servers': []}
+        servers = Servers(api_key='dummy_key', transport=Transport(session=session, concurrency_limiter=limiter))
+
+        servers.show_many([1, 2, 3], batch_size=1)
+
+        self.assertEqual(session.get.call_count, 3)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(servers.transport.max_concurrency, 6)
+
+    def test_rate_limiter_wait_is_not_latency(self):
+        """
+        Test time spent waiting for the rate limiter is not counted as
+        latency of the API
+        """
+        limiter = AdaptiveLimiter(initial_limit=1, clock=lambda: self.now)
+        rate_limiter = Mock(name='rate_limiter')
+
+        def wait():
+            self.now += 10
+        rate_limiter.acquire.side_effect = wait
+        session = Mock(name='session')
+        session.put.return_value.status_code = 200
+        transport = Transport(session=session, rate_limiter=rate_limiter, concurrency_limiter=limiter)
+        for _ in range(3):
+            transport.request('put', URL)
+
+        self.assertEqual(limiter.decreases, 0)
+        self.assertEqual(limiter._latencies['servers.json'], 0)
+
+    def test_probe_slot_survives_limiter_timeout(self):
+        """
+        Test a request that times out waiting for a slot does not take a
+        half-open probe slot
+        """
+        breaker = CircuitBreaker(window=2, min_requests=2, reset_timeout=0)
+        limiter = AdaptiveLimiter(initial_limit=1)
+        session = Mock(name='session')
+        session.put.return_value.status_code = 503
+        transport = Transport(session=session, circuit_breaker=breaker, concurrency_limiter=limiter)
+        transport.request('put', URL)
+        transport.request('put', URL)
+
+        ticket = limiter.acquire(URL)
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(0.01):
+                transport.request('put', URL)
+        limiter.cancel(ticket)
+
+        session.put.return_value.status_code = 200
+        transport.request('put', URL)
+        self.assertEqual(breaker.state('api.newrelic.com'), 'closed')
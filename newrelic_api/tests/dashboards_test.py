@@ -315,3 +315,14 @@ class NRDashboardsTests(TestCase):
                     }
                 }
             )
+
+    def test_show_many(self):
+        """
+        Test dashboards .show_many() fetches dashboards by id through .list()
+        """
+        with patch.object(self.dashboards, '_show_many') as mock_show_many:
+            response = self.dashboards.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.dashboards.list, 'dashboards', [1, 2], batch_size=10, max_workers=3)
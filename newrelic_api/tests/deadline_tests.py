@@ -0,0 +1,215 @@
+import threading
+import time
+from unittest import TestCase
+
+from mock import Mock
+import requests
+
+from newrelic_api.circuit_breaker import CircuitBreaker
+from newrelic_api.concurrency import AdaptiveLimiter, fan_out
+from newrelic_api.deadline import Deadline, current_deadline, deadline
+from newrelic_api.exceptions import DeadlineExceededException
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport
+
+
+class DeadlineTests(TestCase):
+    def setUp(self):
+        super(DeadlineTests, self).setUp()
+        self.now = 0
+
+    def clock(self):
+        return self.now
+
+    def test_timeout_is_shrunk(self):
+        """
+        Test timeouts are shrunk to the time left
+        """
+        current = Deadline(10, clock=self.clock)
+        self.now = 8
+
+        self.assertEqual(current.timeout((3.05, 30)), (2, 2))
+        self.assertEqual(current.timeout(1), 1)
+        self.assertEqual(current.timeout(None), 2)
+
+    def test_check(self):
+        """
+        Test check raises once the deadline has passed
+        """
+        current = Deadline(10, clock=self.clock)
+        current.check()
+        self.now = 10
+
+        with self.assertRaises(DeadlineExceededException):
+            current.check()
+
+    def test_nested_deadline_cannot_extend(self):
+        """
+        Test a nested deadline keeps the earlier expiry
+        """
+        with deadline(5, clock=self.clock) as outer:
+            with deadline(10, clock=self.clock) as inner:
+                self.assertIs(inner, outer)
+            with deadline(1, clock=self.clock) as inner:
+                self.assertEqual(inner.expires, 1)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+    def test_fan_out_propagates(self):
+        """
+        Test worker threads see the deadline of the calling thread
+        """
+        with deadline(5) as current:
+            seen = fan_out(lambda item: current_deadline(), range(4), max_workers=4)
+
+        self.assertEqual(seen, [current] * 4)
+
+
+class TransportDeadlineTests(TestCase):
+    def setUp(self):
+        super(TransportDeadlineTests, self).setUp()
+        self.now = 0
+        self.session = Mock(name='session')
+        self.session.get.return_value = Mock(status_code=200, links={}, content=b'{"servers": []}')
+        self.session.get.return_value.json.return_value = {'servers': []}
+        self.transport = Transport(session=self.session, timeout=(3.05, 30))
+
+    def clock(self):
+        return self.now
+
+    def test_request_timeout_is_shrunk(self):
+        """
+        Test requests inside a deadline get the time left as their timeout
+        """
+        with deadline(10, clock=self.clock):
+            self.now = 4
+            self.transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+
+        self.session.get.assert_called_once_with(url='https://api.newrelic.com/v2/servers.json', timeout=(3.05, 6))
+
+    def test_pagination_aborts(self):
+        """
+        Test a listing stops sending requests once the deadline has passed
+        """
+        servers = Servers(api_key='dummy_key', transport=self.transport)
+        response = self.session.get.return_value
+        response.links = {'next': {'url': 'https://api.newrelic.com/v2/servers.json?page=2', 'rel': 'next'}}
+
+        def get(**kwargs):
+            self.now += 4
+            return response
+        self.session.get.side_effect = get
+
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(10, clock=self.clock):
+                servers._list_all(servers.list, 'servers')
+
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_timeout_past_deadline(self):
+        """
+        Test a request timing out at the deadline raises a deadline error
+        """
+        def get(**kwargs):
+            self.now = 10
+            raise requests.Timeout()
+        self.session.get.side_effect = get
+
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(10, clock=self.clock):
+                self.transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+
+    def test_expired_budget_is_not_a_host_failure(self):
+        """
+        Test a deadline that runs out before or during a request is not
+        recorded as a failure of the host
+        """
+        breaker = CircuitBreaker(window=2, min_requests=1)
+        limiter = AdaptiveLimiter(clock=self.clock)
+        rate_limiter = Mock(name='rate_limiter')
+
+        def wait():
+            self.now = 10
+        rate_limiter.acquire.side_effect = wait
+        transport = Transport(
+            session=self.session, rate_limiter=rate_limiter, circuit_breaker=breaker, concurrency_limiter=limiter)
+
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(10, clock=self.clock):
+                transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+
+        def get(**kwargs):
+            self.now += 10
+            raise requests.Timeout()
+        rate_limiter.acquire.side_effect = None
+        self.session.get.side_effect = get
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(10, clock=self.clock):
+                transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(breaker.states()['api.newrelic.com']['requests'], 0)
+        self.assertEqual((limiter.in_flight, limiter.decreases), (0, 0))
+
+    def test_coalesced_waiter_respects_deadline(self):
+        """
+        Test a thread waiting on an identical request in flight gives up at
+        its deadline
+        """
+        release = threading.Event()
+        started = threading.Event()
+
+        def get(**kwargs):
+            started.set()
+            release.wait(5)
+            return Mock(status_code=200)
+        self.session.get.side_effect = get
+        leader = threading.Thread(
+            target=self.transport.request, args=('get', 'https://api.newrelic.com/v2/servers.json'))
+        leader.start()
+        started.wait(5)
+
+        try:
+            with self.assertRaises(DeadlineExceededException):
+                with deadline(0.05):
+                    self.transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+        finally:
+            release.set()
+            leader.join()
+
+    def test_coalesced_waiter_without_deadline(self):
+        """
+        Test a thread without a deadline sends the request itself when the
+        request it was waiting on ran out of the leader's deadline
+        """
+        started = threading.Event()
+        response = Mock(status_code=200)
+        calls = []
+
+        def get(**kwargs):
+            calls.append(kwargs['timeout'])
+            if len(calls) == 1:
+                started.set()
+                time.sleep(0.2)
+                raise requests.Timeout()
+            return response
+        self.session.get.side_effect = get
+        errors = []
+
+        def lead():
+            try:
+                with deadline(0.1):
+                    self.transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+            except DeadlineExceededException as e:
+                errors.append(e)
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait(5)
+
+        try:
+            self.assertIs(self.transport.request('get', 'https://api.newrelic.com/v2/servers.json'), response)
+        finally:
+            leader.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(calls[1], (3.05, 30))
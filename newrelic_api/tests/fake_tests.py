@@ -0,0 +1,121 @@
+import datetime
+from unittest import TestCase
+
+from newrelic_api.exceptions import NewRelicAPINotFoundException
+from newrelic_api.instrumentation import END
+from newrelic_api.servers import Servers
+from newrelic_api.testing.backend import Backend
+from newrelic_api.testing.fake import FakeTransport, fake_client
+from newrelic_api.testing.fixtures import generate
+
+TERMS = [{'duration': '5', 'operator': 'above', 'priority': 'critical', 'threshold': '1', 'time_function': 'all'}]
+
+
+class FakeTransportTests(TestCase):
+    def setUp(self):
+        super(FakeTransportTests, self).setUp()
+        self.client = fake_client()
+        self.backend = self.client.transport.backend
+
+    def test_reads(self):
+        """
+        Test the read methods of every resource are answered
+        """
+        client = self.client
+
+        self.assertEqual(len(client.applications.list()['applications']), 20)
+        self.assertEqual(client.application_hosts.show(1, 1)['application_host']['links']['application'], 1)
+        self.assertEqual(client.application_instances.list(1)['application_instances'][0]['id'], 1)
+        self.assertEqual(sorted(client.servers.show_many(range(1, 51))), list(range(1, 51)))
+        self.assertEqual(client.alert_conditions.list(1)['conditions'][0]['id'], 1)
+        self.assertEqual(client.alert_conditions_nrql.list(1)['nrql_conditions'][0]['id'], 1)
+        self.assertEqual(client.alert_conditions_infra.show(1)['data']['policy_id'], 1)
+        self.assertEqual(client.alert_policies.list(filter_name='policy-2')['policies'][0]['id'], 2)
+        self.assertEqual(len(client.notification_channels.list()['channels']), 5)
+        self.assertEqual(client.key_transactions.show(1)['key_transaction']['id'], 1)
+        self.assertEqual(client.components.show(1)['component']['id'], 1)
+        self.assertEqual(client.plugins.list(filter_guid='com.example.plugin3')['plugins'][0]['id'], 3)
+        self.assertEqual(len(client.browser_applications.show_many([1, 2])), 2)
+        self.assertEqual(client.dashboards.show(1)['dashboard']['id'], 1)
+        self.assertEqual(client.users.show(2)['user']['id'], 2)
+        self.assertEqual(len(client.labels.list()['labels']), 5)
+
+    def test_metrics(self):
+        """
+        Test metric names and data are answered for every entity reporting
+        metrics
+        """
+        client = self.client
+        data = client.application_hosts.metric_data(
+            1, 1, ['Apdex', 'Unknown'], from_dt=datetime.datetime(2024, 1, 1),
+            to_dt=datetime.datetime(2024, 1, 1, 0, 5))['metric_data']
+
+        self.assertEqual(data['metrics_found'], ['Apdex'])
+        self.assertEqual(data['metrics_not_found'], ['Unknown'])
+        self.assertEqual(len(data['metrics'][0]['timeslices']), 5)
+        self.assertEqual(len(client.applications.metric_names(1)['metrics']), 50)
+        self.assertEqual(client.servers.metric_names(1, name='Load')['metrics'][0]['name'], 'System/Load')
+        self.assertEqual(
+            client.components.metric_data(1, ['Component/Summary/Errors'])['metric_data']['metrics_found'],
+            ['Component/Summary/Errors'])
+
+    def test_writes(self):
+        """
+        Test writes are visible to later requests
+        """
+        client = self.client
+
+        policy = client.alert_policies.create(name='ops', incident_preference='PER_POLICY')['policy']
+        client.alert_conditions.create(policy['id'], 'apm_app_metric', 'application', 'slow', ['1'], 'apdex', TERMS)
+        client.alert_conditions_nrql.create(
+            policy['id'], 'errors', 'static', 'SELECT count(*) FROM TransactionError', '3', TERMS,
+            value_function='single_value')
+        client.notification_channels.create('pager', 'email', {'recipients': 'ops@example.com'})
+        client.alert_policies.associate_with_notification_channel(policy['id'], 6)
+        client.servers.update(1, name='renamed')
+        client.applications.delete(2)
+        client.labels.create('blue', 'Team', servers=[1, 2])
+
+        self.assertIn('created_at', policy)
+        self.assertEqual(client.alert_conditions.list(policy['id'])['conditions'][0]['name'], 'slow')
+        self.assertEqual(client.alert_conditions_nrql.list(policy['id'])['nrql_conditions'][0]['name'], 'errors')
+        self.assertEqual(self.backend.get('alerts_channels', 6)['links']['policy_ids'], [policy['id']])
+        self.assertEqual(client.servers.list(filter_name='renamed')['servers'][0]['id'], 1)
+        self.assertEqual(
+            [server['id'] for server in client.servers.list(filter_labels={'Team': 'blue'})['servers']], [1, 2])
+        with self.assertRaises(NewRelicAPINotFoundException):
+            client.applications.show(2)
+
+    def test_pagination(self):
+        """
+        Test listings are paginated as the API paginates them
+        """
+        backend = generate(Backend(page_size=7), servers=30)
+        servers = Servers(api_key='fake', transport=FakeTransport(backend))
+
+        first = servers.list()
+
+        self.assertEqual(len(first['servers']), 7)
+        self.assertEqual(first['pages']['last']['url'], 'https://api.newrelic.com/v2/servers.json?page=5')
+        self.assertEqual(len(servers._list_all(servers.list, 'servers')), 30)
+        self.assertEqual(len(servers.transport.requests), 6)
+
+    def test_empty(self):
+        """
+        Test a transport without a backend answers from an empty account
+        """
+        servers = Servers(api_key='fake', transport=FakeTransport())
+
+        self.assertEqual(servers.list(), {'servers': []})
+        self.assertEqual(servers.transport.requests, [('get', 'https://api.newrelic.com/v2/servers.json', '', None)])
+
+    def test_hooks(self):
+        """
+        Test hooks see the requests answered by the fake
+        """
+        events = []
+        servers = Servers(api_key='fake', transport=FakeTransport(generate(Backend())), hooks=[events.append])
+
+        servers.show(1)
+
+        self.assertEqual([(event.stage, event.status_code) for event in events if event.stage == END], [(END, 200)])
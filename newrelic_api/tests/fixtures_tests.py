@@ -0,0 +1,156 @@
+import json
+from unittest import TestCase
+
+from newrelic_api.exceptions import ConfigurationException
+from newrelic_api.testing.backend import Backend
+from newrelic_api.testing.fixtures import Fixtures, MetricNames, generate
+
+# The keys of every entity, as documented by the resources
+SCHEMAS = {
+    'application': {
+        'id', 'name', 'language', 'health_status', 'reporting', 'last_reported_at', 'application_summary',
+        'end_user_summary', 'settings', 'links'},
+    'server': {'id', 'account_id', 'name', 'host', 'health_status', 'reporting', 'last_reported_at', 'summary',
+               'links'},
+    'key_transaction': {
+        'id', 'name', 'transaction_name', 'health_status', 'reporting', 'last_reported_at', 'application_summary',
+        'end_user_summary', 'links'},
+    'plugin': {'id', 'name', 'guid', 'publisher', 'component_agent_count', 'details', 'summary_metrics'},
+    'component': {'id', 'name', 'health_status', 'summary_metrics'},
+    'browser_application': {'id', 'name', 'browser_monitoring_key', 'loader_script'},
+    'user': {'id', 'first_name', 'last_name', 'email', 'role'},
+    'alert_policy': {'id', 'name', 'incident_preference', 'created_at', 'updated_at'},
+    'nrql_condition': {'id', 'type', 'name', 'runbook_url', 'enabled', 'value_function', 'terms', 'nrql'},
+    'dashboard': {
+        'id', 'title', 'description', 'icon', 'created_at', 'updated_at', 'visibility', 'editable', 'ui_url',
+        'api_url', 'owner_email', 'metadata', 'widgets', 'filter'},
+}
+
+
+class MetricNamesTests(TestCase):
+    def setUp(self):
+        super(MetricNamesTests, self).setUp()
+        self.names = MetricNames(['Apdex', 'HttpDispatcher'], 'Custom/{0}/count', 5)
+
+    def test_sequence(self):
+        """
+        Test names are generated after the fixed ones
+        """
+        self.assertEqual(list(self.names), ['Apdex', 'HttpDispatcher', 'Custom/0/count', 'Custom/1/count',
+                                            'Custom/2/count'])
+        self.assertEqual(len(self.names), 5)
+        self.assertEqual(self.names[-1], 'Custom/2/count')
+        self.assertEqual(self.names[1:3], ['HttpDispatcher', 'Custom/0/count'])
+        with self.assertRaises(IndexError):
+            self.names[5]
+
+    def test_contains(self):
+        """
+        Test membership is decided without generating the names
+        """
+        self.assertIn('Apdex', self.names)
+        self.assertIn('Custom/2/count', self.names)
+        self.assertNotIn('Custom/3/count', self.names)
+        self.assertNotIn('Custom/02/count', self.names)
+        self.assertNotIn('Custom/1/count/extra', self.names)
+
+    def test_large(self):
+        """
+        Test a large number of names can be paginated
+        """
+        names = MetricNames([], 'Custom/{0}', 10 ** 6)
+
+        self.assertEqual(names[999999], 'Custom/999999')
+        self.assertEqual(len(names[-1000:]), 1000)
+
+
+class FixturesTests(TestCase):
+    def test_schemas(self):
+        """
+        Test entities have the keys the API documents
+        """
+        fixtures = Fixtures()
+
+        for kind, keys in SCHEMAS.items():
+            self.assertEqual(set(getattr(fixtures, kind)(3)), keys, kind)
+        json.dumps([getattr(fixtures, kind)(3) for kind in SCHEMAS])
+
+    def test_deterministic(self):
+        """
+        Test entities depend on the seed and id only
+        """
+        self.assertEqual(Fixtures(seed=1).server(10), Fixtures(seed=1).server(10))
+        self.assertNotEqual(Fixtures(seed=1).server(10), Fixtures(seed=2).server(10))
+        self.assertNotEqual(Fixtures(seed=1).server(10)['summary'], Fixtures(seed=1).server(11)['summary'])
+
+    def test_summary(self):
+        """
+        Test the memory summary of a server is consistent
+        """
+        summary = Fixtures().server(1)['summary']
+
+        self.assertLessEqual(summary['memory_used'], summary['memory_total'])
+        self.assertAlmostEqual(summary['memory'], 100.0 * summary['memory_used'] / summary['memory_total'], places=1)
+
+
+class GenerateTests(TestCase):
+    def test_sizes(self):
+        """
+        Test every resource is generated at the requested size
+        """
+        backend = generate(Backend(), servers=300, applications=7, hosts_per_application=3, alert_policies=2,
+                           conditions_per_policy=5, users=0, application_metric_names=100000)
+
+        self.assertEqual(len(backend.entities['servers']), 300)
+        self.assertEqual(len(backend.entities['applications']), 7)
+        self.assertEqual(len(backend.entities['application_hosts']), 21)
+        self.assertEqual(len(backend.entities['alerts_conditions']), 10)
+        self.assertEqual(len(backend.entities['users']), 0)
+        self.assertEqual(len(backend.metric_names[('applications', 7)]), 100000)
+
+    def test_links(self):
+        """
+        Test generated entities link to entities that exist
+        """
+        backend = generate(Backend(), servers=3, applications=4, instances_per_application=3)
+        entities = backend.entities
+
+        for application in entities['applications'].values():
+            for host_id in application['links']['application_hosts']:
+                host = entities['application_hosts'][host_id]
+                self.assertEqual(host['links']['application'], application['id'])
+                self.assertIn(host['links']['server'], application['links']['servers'])
+                self.assertIn(host['links']['server'], entities['servers'])
+            for instance_id in application['links']['application_instances']:
+                instance = entities['application_instances'][instance_id]
+                host = entities['application_hosts'][instance['links']['application_host']]
+                self.assertIn(instance_id, host['links']['application_instances'])
+                self.assertEqual(instance['host'], host['host'])
+        for channel in entities['alerts_channels'].values():
+            self.assertTrue(set(channel['links']['policy_ids']) <= set(entities['alerts_policies']))
+        for label in entities['labels'].values():
+            self.assertTrue(set(label['links']['servers']) <= set(entities['servers']))
+        for condition in entities['alerts_conditions'].values():
+            self.assertTrue(set(int(id) for id in condition['entities']) <= set(entities['applications']))
+
+    def test_served(self):
+        """
+        Test a generated account is served by the backend
+        """
+        backend = generate(Backend(metric_names_page_size=1000), application_metric_names=5000)
+        url = 'https://api.newrelic.com/v2/applications/1/metrics.json'
+
+        last = json.loads(backend.handle('get', url, params='page=5').content.decode('utf-8'))
+        data = json.loads(backend.handle(
+            'get', 'https://api.newrelic.com/v2/applications/1/metrics/data.json',
+            params={'names[]': last['metrics'][-1]['name'], 'summarize': 'true'}).content.decode('utf-8'))
+
+        self.assertEqual(len(last['metrics']), 1000)
+        self.assertEqual(data['metric_data']['metrics_found'], [last['metrics'][-1]['name']])
+
+    def test_unknown_size(self):
+        """
+        Test sizes that do not exist are refused
+        """
+        with self.assertRaises(ConfigurationException):
+            generate(Backend(), hosts=10)
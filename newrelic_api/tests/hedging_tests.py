@@ -0,0 +1,146 @@
+import threading
+from unittest import TestCase
+
+from mock import Mock
+
+from newrelic_api.hedging import HedgingPolicy
+from newrelic_api.transport import Transport
+
+SHOW_URL = 'https://api.newrelic.com/v2/applications/1.json'
+LIST_URL = 'https://api.newrelic.com/v2/applications.json'
+
+
+class HedgingPolicyTests(TestCase):
+    def test_delay_is_percentile(self):
+        """
+        Test the delay is the configured percentile of recent latencies
+        """
+        policy = HedgingPolicy(percentile=90, min_samples=10)
+        for latency in range(1, 11):
+            policy.record(SHOW_URL, latency / 10.0)
+
+        self.assertEqual(policy.delay('https://api.newrelic.com/v2/applications/2.json'), 0.9)
+        self.assertIsNone(policy.delay(LIST_URL))
+
+    def test_initial_delay(self):
+        """
+        Test the initial delay is used until there are enough samples
+        """
+        policy = HedgingPolicy(min_samples=10, initial_delay=0.5)
+        policy.record(SHOW_URL, 0.1)
+
+        self.assertEqual(policy.delay(SHOW_URL), 0.5)
+
+    def test_endpoints(self):
+        """
+        Test only the configured endpoints are hedged
+        """
+        policy = HedgingPolicy(endpoints=['applications/{id}.json', '*/metrics/data.json'])
+
+        self.assertTrue(policy.applies(SHOW_URL))
+        self.assertTrue(policy.applies('https://api.newrelic.com/v2/servers/5/metrics/data.json?names[]=CPU'))
+        self.assertFalse(policy.applies(LIST_URL))
+
+    def test_extra_load_is_capped(self):
+        """
+        Test hedges are limited to the burst plus a fraction of requests
+        """
+        policy = HedgingPolicy(max_extra=0.25, burst=1)
+        policy.begin()
+        self.assertTrue(policy.try_hedge())
+        self.assertFalse(policy.try_hedge())
+
+        for _ in range(4):
+            policy.begin()
+
+        self.assertTrue(policy.try_hedge())
+        self.assertFalse(policy.try_hedge())
+        self.assertEqual((policy.requests, policy.hedges), (5, 2))
+
+
+class TransportHedgingTests(TestCase):
+    def setUp(self):
+        super(TransportHedgingTests, self).setUp()
+        self.session = Mock(name='session')
+        self.policy = HedgingPolicy(initial_delay=0.01)
+        self.transport = Transport(session=self.session, coalesce=False, hedging=self.policy)
+
+    def test_fast_response_is_not_hedged(self):
+        """
+        Test responses arriving before the delay are not hedged
+        """
+        self.policy.initial_delay = 5
+
+        response = self.transport.request('get', SHOW_URL)
+
+        self.assertIs(response, self.session.get.return_value)
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(self.policy.hedges, 0)
+
+    def test_slow_response_is_hedged(self):
+        """
+        Test the hedge's response is used when the first request is slow
+        """
+        release = threading.Event()
+        fast = Mock(name='fast')
+        responses = [None, fast]
+
+        def get(**kwargs):
+            response = responses.pop(0)
+            if response is None:
+                release.wait(5)
+                return Mock(name='slow')
+            return response
+        self.session.get.side_effect = get
+
+        try:
+            response = self.transport.request('get', SHOW_URL)
+        finally:
+            release.set()
+
+        self.assertIs(response, fast)
+        self.assertEqual((self.policy.hedges, self.policy.hedge_wins), (1, 1))
+
+    def test_error_waits_for_other_attempt(self):
+        """
+        Test a failed attempt does not hide a successful one
+        """
+        release = threading.Event()
+        ok = Mock(name='ok')
+        outcomes = [None, ValueError('boom')]
+
+        def get(**kwargs):
+            outcome = outcomes.pop(0)
+            if outcome is None:
+                release.wait(5)
+                return ok
+            release.set()
+            raise outcome
+        self.session.get.side_effect = get
+
+        self.assertIs(self.transport.request('get', SHOW_URL), ok)
+        self.assertEqual(self.policy.hedge_wins, 0)
+
+    def test_no_delay_sends_inline(self):
+        """
+        Test a request that cannot be hedged is sent on the calling thread
+        and its latency recorded
+        """
+        self.policy.initial_delay = None
+        self.transport._start_attempt = Mock(name='start_attempt')
+        threads = []
+        self.session.get.side_effect = lambda **kwargs: threads.append(threading.current_thread())
+
+        self.transport.request('get', SHOW_URL)
+
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertFalse(self.transport._start_attempt.called)
+        self.assertEqual(len(self.policy._latencies['applications/{id}.json']), 1)
+
+    def test_writes_are_not_hedged(self):
+        """
+        Test only GET requests are hedged
+        """
+        self.transport.request('put', SHOW_URL)
+
+        self.assertEqual(self.policy.requests, 0)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from unittest import TestCase, skipIf
+
+import newrelic_api
+
+
+def run_python(code):
+    return subprocess.check_output([sys.executable, '-c', code], stderr=subprocess.STDOUT).decode('utf-8')
+
+
+@skipIf(sys.version_info < (3, 7), 'lazy loading requires module level __getattr__')
+class LazyImportTests(TestCase):
+
+    def test_import_is_lazy(self):
+        """
+        Test importing the package does not import resources or requests
+        """
+        output = run_python(
+            'import sys, newrelic_api; '
+            'print(sorted(m for m in sys.modules if m.startswith(("newrelic_api.", "requests"))))'
+        )
+
+        self.assertEqual(output.strip(), "['newrelic_api.version']")
+
+    def test_attribute_access_loads_resource(self):
+        """
+        Test a resource class is imported on first access
+        """
+        from newrelic_api.servers import Servers
+
+        self.assertIs(newrelic_api.Servers, Servers)
+        self.assertIn('Servers', dir(newrelic_api))
+
+    def test_unknown_attribute(self):
+        """
+        Test unknown attributes still raise AttributeError
+        """
+        with self.assertRaises(AttributeError):
+            newrelic_api.NotAResource
+
+    def test_import_time_budget(self):
+        """
+        Benchmark the cumulative import time of the package, in microseconds,
+        as reported by -X importtime
+        """
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import newrelic_api'],
+            stderr=subprocess.STDOUT
+        ).decode('utf-8')
+        cumulative = [
+            int(line.split('|')[1]) for line in output.splitlines()
+            if line.rstrip().endswith('| newrelic_api')
+        ]
+
+        self.assertEqual(len(cumulative), 1)
+        self.assertLess(cumulative[0], 50000)
@@ -0,0 +1,164 @@
+import datetime
+from unittest import TestCase
+
+from mock import Mock
+import requests
+
+from newrelic_api.cache import MemoryCache
+from newrelic_api.exceptions import NewRelicAPINotFoundException
+from newrelic_api.instrumentation import (
+    END, START, Histogram, LatencyCollector, RequestEvent, add_hook, global_hooks, remove_hook
+)
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport
+
+
+def make_response(status_code=200, content=b'{"server": {"id": 1}}', elapsed=0.02):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.elapsed = datetime.timedelta(seconds=elapsed)
+    response.headers['Cache-Control'] = 'max-age=60'
+    return response
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        super(InstrumentationTests, self).setUp()
+        self.events = []
+        self.session = Mock(name='session')
+        self.session.get.return_value = make_response()
+        self.servers = Servers(
+            api_key='dummy_key', transport=Transport(session=self.session), hooks=[self.events.append])
+
+    def test_events(self):
+        """
+        Test hooks are told when a request starts and ends
+        """
+        self.servers.show(1)
+
+        start, end = self.events
+        self.assertEqual(start.stage, START)
+        self.assertEqual(end.stage, END)
+        self.assertEqual(end.method, 'get')
+        self.assertEqual(end.endpoint, 'servers/{id}.json')
+        self.assertEqual(end.status_code, 200)
+        self.assertEqual(end.size, len(b'{"server": {"id": 1}}'))
+        self.assertEqual(end.retries, 0)
+        self.assertIsNone(end.cache)
+        self.assertFalse(end.failed)
+        self.assertEqual(set(end.timings), set(['total', 'server', 'download', 'decode']))
+        self.assertEqual(end.timings['server'], 0.02)
+
+    def test_error_event(self):
+        """
+        Test a failed request is reported with its status and exception
+        """
+        self.session.get.return_value = make_response(status_code=404, content=b'{}')
+
+        with self.assertRaises(NewRelicAPINotFoundException) as context:
+            self.servers.show(1)
+
+        end = self.events[-1]
+        self.assertEqual(end.status_code, 404)
+        self.assertIs(end.error, context.exception)
+        self.assertTrue(end.failed)
+        self.assertNotIn('decode', end.timings)
+
+    def test_cache_hit(self):
+        """
+        Test cache hits are reported without a server phase
+        """
+        self.servers.transport.cache = MemoryCache()
+
+        self.servers.show(1)
+        self.servers.show(1)
+
+        self.assertEqual(self.events[1].cache, 'miss')
+        self.assertEqual(self.events[3].cache, 'hit')
+        self.assertNotIn('server', self.events[3].timings)
+
+    def test_global_hooks(self):
+        """
+        Test hooks registered globally see the requests of every resource
+        """
+        events = []
+        add_hook(events.append)
+        try:
+            Servers(api_key='dummy_key', transport=Transport(session=self.session)).show(1)
+        finally:
+            remove_hook(events.append)
+
+        self.assertEqual([event.stage for event in events], [START, END])
+        self.assertEqual(global_hooks(), ())
+
+
+class HistogramTests(TestCase):
+    def test_percentile(self):
+        """
+        Test percentiles are interpolated within their bucket
+        """
+        histogram = Histogram(buckets=(1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.mean, 1.625)
+        self.assertEqual(histogram.percentile(50), 1.5)
+        self.assertEqual(histogram.percentile(100), 4)
+
+    def test_overflow(self):
+        """
+        Test observations past the last bucket are reported at its bound
+        """
+        histogram = Histogram(buckets=(1, 2))
+        histogram.observe(10)
+
+        self.assertEqual(histogram.percentile(99), 2)
+        self.assertEqual(Histogram().percentile(50), 0.0)
+
+
+class LatencyCollectorTests(TestCase):
+    def event(self, endpoint, total, status_code=200, **kwargs):
+        return RequestEvent(
+            END, 'get', endpoint, 'https://api.newrelic.com/v2/' + endpoint, status_code=status_code,
+            timings={'total': total, 'decode': total / 10}, **kwargs)
+
+    def test_summary(self):
+        """
+        Test requests are summarized per verb and endpoint
+        """
+        collector = LatencyCollector()
+        collector(RequestEvent(START, 'get', 'servers.json', 'https://api.newrelic.com/v2/servers.json'))
+        collector(self.event('servers.json', 0.2, size=100))
+        collector(self.event('servers.json', 0.4, size=50, retries=1))
+        collector(self.event('servers/{id}.json', 0.1, status_code=500))
+
+        summary = collector.summary()
+
+        self.assertEqual(sorted(summary), ['GET servers.json', 'GET servers/{id}.json'])
+        servers = summary['GET servers.json']
+        self.assertEqual(servers['requests'], 2)
+        self.assertEqual(servers['errors'], 0)
+        self.assertEqual(servers['retries'], 1)
+        self.assertEqual(servers['bytes'], 150)
+        self.assertAlmostEqual(servers['phases']['total'], 0.3)
+        self.assertAlmostEqual(servers['phases']['decode'], 0.03)
+        self.assertEqual(summary['GET servers/{id}.json']['errors'], 1)
+
+    def test_report(self):
+        """
+        Test the report lists the endpoints that took the most time first
+        """
+        collector = LatencyCollector()
+        collector(self.event('servers/{id}.json', 0.1))
+        collector(self.event('servers.json', 0.4))
+
+        lines = collector.report().splitlines()
+
+        self.assertTrue(lines[0].startswith('endpoint'))
+        self.assertTrue(lines[1].startswith('GET servers.json'))
+        self.assertTrue(lines[2].startswith('GET servers/{id}.json'))
+
+        collector.reset()
+        self.assertEqual(collector.summary(), {})
@@ -0,0 +1,79 @@
+import json
+from unittest import TestCase
+
+from mock import patch, Mock
+import requests
+
+from newrelic_api.applications import Applications
+from newrelic_api.interning import StringInterner
+
+
+class StringInternerTests(TestCase):
+    def setUp(self):
+        super(StringInternerTests, self).setUp()
+        self.body = json.dumps({
+            'metrics': [
+                {'name': 'Agent/MetricsReported/count', 'values': ['average_response_time', 'call_count']},
+                {'name': 'Apdex', 'values': ['average_response_time', 'score']},
+            ]
+        })
+
+    def test_repeated_strings_are_shared(self):
+        """
+        Test equal keys and values decode to the same instance
+        """
+        interner = StringInterner()
+
+        first = json.loads(self.body, object_pairs_hook=interner)
+        second = json.loads(self.body, object_pairs_hook=interner)
+
+        self.assertEqual(first, second)
+        self.assertIs(
+            first['metrics'][0]['values'][0],
+            second['metrics'][1]['values'][0]
+        )
+        self.assertIs(
+            list(first['metrics'][0].keys())[0],
+            list(second['metrics'][0].keys())[0]
+        )
+
+    def test_long_values_are_not_interned(self):
+        """
+        Test values over max_length are left out of the table
+        """
+        interner = StringInterner(max_length=5)
+
+        json.loads(json.dumps({'status': 'green', 'name': 'a long application name'}), object_pairs_hook=interner)
+
+        self.assertEqual(len(interner), 3)
+        self.assertNotIn('a long application name', interner._table)
+
+    def test_max_size(self):
+        """
+        Test the table stops growing once full
+        """
+        interner = StringInterner(max_size=2)
+
+        self.assertEqual(interner.intern('a'), 'a')
+        interner.intern('b')
+        interner.intern('c')
+
+        self.assertEqual(len(interner), 2)
+        self.assertNotIn('c', interner._table)
+
+        interner.clear()
+        self.assertEqual(len(interner), 0)
+
+    @patch.object(requests, 'get')
+    def test_resource_uses_hook(self, mock_get):
+        """
+        Test the resource decodes responses with its object_pairs_hook
+        """
+        interner = StringInterner()
+        mock_response = Mock(name='response', links=None)
+        mock_response.json.return_value = {}
+        mock_get.return_value = mock_response
+
+        Applications(api_key='dummy_key', object_pairs_hook=interner).list()
+
+        mock_response.json.assert_called_once_with(object_pairs_hook=interner)
@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.key_transactions import KeyTransactions
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRKeyTransactionsTests(TestCase):
@@ -71,7 +72,8 @@ class NRKeyTransactionsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/key_transactions.json',
             headers=self.key_transactions.headers,
-            params='filter[ids]=333112'
+            params='filter[ids]=333112',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -113,3 +115,14 @@ class NRKeyTransactionsTests(TestCase):
         with self.assertRaises(ValueError):
             # Call the method
             self.key_transactions.show(id=333114)
+
+    def test_show_many(self):
+        """
+        Test key transactions .show_many() fetches key transactions by id through .list()
+        """
+        with patch.object(self.key_transactions, '_show_many') as mock_show_many:
+            response = self.key_transactions.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.key_transactions.list, 'key_transactions', [1, 2], batch_size=10, max_workers=3)
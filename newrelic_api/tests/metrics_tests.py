@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+try:
+    from urllib.request import urlopen
+except ImportError:  # pragma: no cover
+    from urllib2 import urlopen
+
+from newrelic_api.instrumentation import END, START, RequestEvent
+from newrelic_api.metrics import PrometheusMetrics
+
+
+class PrometheusMetricsTests(TestCase):
+    def setUp(self):
+        super(PrometheusMetricsTests, self).setUp()
+        self.metrics = PrometheusMetrics(buckets=(0.1, 1))
+
+    def request(self, endpoint, status_code=200, **kwargs):
+        url = 'https://api.newrelic.com/v2/' + endpoint
+        self.metrics(RequestEvent(START, 'get', endpoint, url))
+        self.metrics(RequestEvent(END, 'get', endpoint, url, status_code=status_code, **kwargs))
+
+    def test_counters(self):
+        """
+        Test requests, errors, retries and cache lookups are counted
+        """
+        self.request('servers.json', cache='miss', retries=1)
+        self.request('servers.json', cache='hit')
+        self.request('servers/{id}.json', status_code=None, error=IOError('reset'))
+
+        lines = self.metrics.render().splitlines()
+
+        self.assertIn('newrelic_api_requests_total{method="GET",endpoint="servers.json",status="200"} 2', lines)
+        self.assertIn('newrelic_api_requests_total{method="GET",endpoint="servers/{id}.json",status="error"} 1', lines)
+        self.assertIn('newrelic_api_request_errors_total{method="GET",endpoint="servers/{id}.json"} 1', lines)
+        self.assertIn('newrelic_api_request_retries_total{method="GET",endpoint="servers.json"} 1', lines)
+        self.assertIn('newrelic_api_cache_lookups_total{result="hit"} 1', lines)
+        self.assertIn('newrelic_api_cache_lookups_total{result="miss"} 1', lines)
+        self.assertIn('# TYPE newrelic_api_requests_total counter', lines)
+
+    def test_histograms(self):
+        """
+        Test durations and limiter waits are rendered as cumulative buckets
+        """
+        self.request('servers.json', timings={'total': 0.05, 'queue': 0.5})
+        self.request('servers.json', timings={'total': 2.0})
+
+        lines = self.metrics.render().splitlines()
+
+        labels = 'method="GET",endpoint="servers.json"'
+        self.assertIn('newrelic_api_request_duration_seconds_bucket{' + labels + ',le="0.1"} 1', lines)
+        self.assertIn('newrelic_api_request_duration_seconds_bucket{' + labels + ',le="1"} 1', lines)
+        self.assertIn('newrelic_api_request_duration_seconds_bucket{' + labels + ',le="+Inf"} 2', lines)
+        self.assertIn('newrelic_api_request_duration_seconds_sum{' + labels + '} 2.05', lines)
+        self.assertIn('newrelic_api_request_duration_seconds_count{' + labels + '} 2', lines)
+        self.assertIn('newrelic_api_rate_limiter_wait_seconds_bucket{le="1"} 1', lines)
+        self.assertIn('newrelic_api_rate_limiter_wait_seconds_count 1', lines)
+
+    def test_in_flight(self):
+        """
+        Test the in flight gauge follows requests that started and ended
+        """
+        self.assertIn('newrelic_api_requests_in_flight 0', self.metrics.render().splitlines())
+
+        self.metrics(RequestEvent(START, 'get', 'servers.json', 'https://api.newrelic.com/v2/servers.json'))
+
+        self.assertIn('newrelic_api_requests_in_flight 1', self.metrics.render().splitlines())
+
+    def test_label_escaping(self):
+        """
+        Test quotes and backslashes in label values are escaped
+        """
+        self.request('a"b\\c.json')
+
+        self.assertIn('endpoint="a\\"b\\\\c.json"', self.metrics.render())
+
+    def test_serve(self):
+        """
+        Test the metrics are served over HTTP
+        """
+        self.request('servers.json')
+        server = self.metrics.serve(port=0)
+        try:
+            response = urlopen('http://127.0.0.1:{0}/metrics'.format(server.server_port))
+            body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(body, self.metrics.render())
+        self.assertTrue(response.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
@@ -5,6 +5,7 @@ import json
 import requests
 
 from newrelic_api.notification_channels import NotificationChannels
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRNotificationChannelsTests(TestCase):
@@ -47,7 +48,8 @@ class NRNotificationChannelsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/alerts_channels.json',
             headers=self.channels.headers,
-            params=''
+            params='',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -60,7 +62,8 @@ class NRNotificationChannelsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/alerts_channels.json',
             headers=self.channels.headers,
-            params='page=2'
+            params='page=2',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'post')
@@ -83,5 +86,6 @@ class NRNotificationChannelsTests(TestCase):
                     "type": self.single_response['channels']['type'],
                     "configuration": self.single_response['channels']['configuration']
                 }
-            })
+            }),
+            timeout=DEFAULT_TIMEOUT
         )
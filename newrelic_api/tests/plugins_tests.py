@@ -4,6 +4,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.plugins import Plugins
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRPluginsTests(TestCase):
@@ -88,7 +89,8 @@ class NRPluginsTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/plugins.json',
             headers=self.plugins.headers,
-            params='filter[ids]=2227'
+            params='filter[ids]=2227',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -130,3 +132,14 @@ class NRPluginsTests(TestCase):
         with self.assertRaises(ValueError):
             # Call the method
             self.plugins.show(id=2227)
+
+    def test_show_many(self):
+        """
+        Test plugins .show_many() fetches plugins by id through .list()
+        """
+        with patch.object(self.plugins, '_show_many') as mock_show_many:
+            response = self.plugins.show_many([1, 2], detailed=True, batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.plugins.list, 'plugins', [1, 2], batch_size=10, max_workers=3, detailed=True)
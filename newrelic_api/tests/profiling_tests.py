@@ -0,0 +1,102 @@
+import json
+from unittest import TestCase
+
+try:
+    from StringIO import StringIO
+except ImportError:  # pragma: no cover
+    from io import StringIO
+
+from mock import Mock
+import requests
+
+from newrelic_api.cache import MemoryCache
+from newrelic_api.instrumentation import global_hooks
+from newrelic_api.profiling import profile
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode('utf-8')
+    response.headers['Cache-Control'] = 'max-age=60'
+    return response
+
+
+class ProfileTests(TestCase):
+    def setUp(self):
+        super(ProfileTests, self).setUp()
+        self.session = Mock(name='session')
+        self.session.get.side_effect = lambda **kwargs: make_response({
+            'server': {'id': 1, 'name': 'web'},
+            'servers': [{'id': 1, 'name': 'web'}],
+        })
+        self.session.put.side_effect = lambda **kwargs: make_response({'server': {'id': 1, 'name': 'db'}})
+        self.servers = Servers(api_key='dummy_key', transport=Transport(session=self.session))
+        self.stream = StringIO()
+
+    def test_loop(self):
+        """
+        Test requests sent in a loop are reported with a batched alternative
+        """
+        with profile(stream=self.stream) as result:
+            for server_id in range(5):
+                self.servers.show(server_id)
+
+        finding, = result.repeated()
+        self.assertEqual(finding.count, 5)
+        self.assertEqual(finding.endpoint, 'servers/{id}.json')
+        self.assertEqual(finding.site[0], __file__.replace('.pyc', '.py'))
+        self.assertEqual(finding.site[2], 'test_loop')
+        report = self.stream.getvalue()
+        self.assertIn('5 requests in', report)
+        self.assertIn('GET servers/{id}.json x5', report)
+        self.assertIn('Servers.show_many(ids)', report)
+        self.assertEqual(global_hooks(), ())
+
+    def test_below_threshold(self):
+        """
+        Test a few requests from one line are not reported as a loop
+        """
+        with profile(threshold=3, print_report=False) as result:
+            for server_id in range(2):
+                self.servers.show(server_id)
+
+        self.assertEqual(result.repeated(), [])
+        self.assertIn('No repeated requests found', result.report())
+
+    def test_batching_helpers(self):
+        """
+        Test the pages and batches sent by batching helpers are not reported
+        """
+        with profile(print_report=False) as result:
+            self.servers.show_many(range(10), batch_size=2, max_workers=2)
+            self.servers.show_many(range(10), batch_size=2, max_workers=1)
+
+        self.assertEqual(len(result.calls), 10)
+        self.assertEqual(result.repeated(), [])
+
+    def test_read_before_write(self):
+        """
+        Test the show Servers.update starts with is reported
+        """
+        with profile(print_report=False) as result:
+            self.servers.update(1)
+
+        finding, = result.reads_before_writes()
+        self.assertEqual(finding.read, 'servers/{id}.json')
+        self.assertEqual(finding.endpoint, 'servers/{id}.json')
+        self.assertIn('GET servers/{id}.json before PUT servers/{id}.json x1', result.report())
+
+    def test_cache_hits(self):
+        """
+        Test cache hits are not recorded
+        """
+        self.servers.transport.cache = MemoryCache()
+
+        with profile(print_report=False) as result:
+            for _ in range(5):
+                self.servers.show(1)
+
+        self.assertEqual(len(result.calls), 1)
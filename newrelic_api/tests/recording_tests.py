@@ -0,0 +1,127 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+import requests
+
+from newrelic_api.exceptions import ConfigurationException, ReplayMissException
+from newrelic_api.recording import RecordingTransport, ReplayTransport, load_recording
+from newrelic_api.servers import Servers
+
+SERVERS_URL = 'https://api.newrelic.com/v2/servers.json'
+
+
+def make_response(body, link=None):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode('utf-8')
+    if link:
+        response.headers['Link'] = link
+    return response
+
+
+class RecordingTests(TestCase):
+    def setUp(self):
+        super(RecordingTests, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'recording.json.gz')
+        self.session = Mock(name='session')
+
+        def get(url, params=None, **kwargs):
+            if params == 'page=2':
+                return make_response({'servers': [{'id': 2}]})
+            return make_response(
+                {'servers': [{'id': 1}]}, link='<{0}?page=2>; rel="next", <{0}?page=2>; rel="last"'.format(url))
+        self.session.get.side_effect = get
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(RecordingTests, self).tearDown()
+
+    def record(self):
+        transport = RecordingTransport(session=self.session)
+        servers = Servers(api_key='dummy_key', transport=transport)
+        servers._list_all(servers.list, 'servers')
+        return transport.save(self.path)
+
+    def test_record(self):
+        """
+        Test exchanges are recorded without the request headers
+        """
+        self.assertEqual(self.record(), 2)
+
+        first, second = load_recording(self.path)
+        self.assertEqual(first['url'], SERVERS_URL)
+        self.assertEqual(first['params'], '')
+        self.assertIn('rel="next"', first['headers']['Link'])
+        self.assertEqual(second['params'], 'page=2')
+        self.assertEqual(json.loads(second['content']), {'servers': [{'id': 2}]})
+        self.assertNotIn('dummy_key', json.dumps([first, second]))
+
+    def test_replay(self):
+        """
+        Test a replay follows the recorded pagination without sending requests
+        """
+        self.record()
+        self.session.reset_mock()
+        servers = Servers(api_key='other_key', transport=ReplayTransport(self.path))
+
+        entities = servers._list_all(servers.list, 'servers')
+
+        self.assertEqual(entities, [{'id': 1}, {'id': 2}])
+        self.assertEqual(self.session.get.call_count, 0)
+
+    def test_replay_order(self):
+        """
+        Test responses recorded for one request are replayed in order, then
+        start over
+        """
+        exchanges = [
+            {'method': 'get', 'url': SERVERS_URL, 'params': None, 'data': None, 'status_code': 200,
+             'headers': {}, 'content': json.dumps({'servers': [{'id': index}]}), 'latency': 0.1}
+            for index in range(2)
+        ]
+        transport = ReplayTransport(exchanges)
+
+        seen = [transport.request('get', SERVERS_URL).json()['servers'][0]['id'] for _ in range(3)]
+
+        self.assertEqual(seen, [0, 1, 0])
+
+    def test_miss(self):
+        """
+        Test a request that was not recorded raises
+        """
+        with self.assertRaises(ReplayMissException):
+            ReplayTransport([]).request('get', SERVERS_URL)
+
+    def test_latency(self):
+        """
+        Test replayed responses can take their recorded, a fixed or a
+        synthetic latency
+        """
+        self.record()
+        sleep = Mock(name='sleep')
+        recorded = load_recording(self.path)[0]['latency']
+
+        transport = ReplayTransport(self.path, latency='recorded', sleep=sleep)
+        response = transport.request('get', SERVERS_URL, params='')
+        self.assertAlmostEqual(response.elapsed.total_seconds(), recorded, places=5)
+
+        ReplayTransport(self.path, latency=0.25, sleep=sleep).request('get', SERVERS_URL, params='')
+        ReplayTransport(self.path, latency=lambda exchange: 0.5, sleep=sleep).request('get', SERVERS_URL, params='')
+
+        self.assertEqual(sleep.call_args_list[-2:], [((0.25,),), ((0.5,),)])
+
+    def test_incompatible_version(self):
+        """
+        Test recordings of another version are refused
+        """
+        with gzip.open(self.path, 'wb') as f:
+            f.write(json.dumps({'version': 0, 'exchanges': []}).encode('utf-8'))
+
+        with self.assertRaises(ConfigurationException):
+            ReplayTransport(self.path)
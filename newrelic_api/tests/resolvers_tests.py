@@ -0,0 +1,116 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from newrelic_api.client import NewRelicClient
+from newrelic_api.exceptions import ConfigurationException, NoEntityException
+from newrelic_api.labels import Labels
+from newrelic_api.resolvers import NameResolver
+from newrelic_api.servers import Servers
+from newrelic_api.users import Users
+
+
+class NameResolverTests(TestCase):
+    def setUp(self):
+        super(NameResolverTests, self).setUp()
+        self.now = 0
+        self.servers = Servers(api_key='dummy_key')
+        self.pages = [
+            {
+                'servers': [{'id': 1, 'name': 'web'}, {'id': 2, 'name': 'web-01'}],
+                'pages': {'next': {'url': 'https://api.newrelic.com/v2/servers.json?page=2', 'rel': 'next'}},
+            },
+            {
+                'servers': [{'id': 3, 'name': 'db'}, {'id': 4, 'name': 'web'}],
+            },
+        ]
+        self.servers.list = Mock(name='list', side_effect=self.list_servers)
+        self.resolver = NameResolver(self.servers, max_age=60, clock=lambda: self.now)
+
+    def list_servers(self, filter_name=None, page=None):
+        if filter_name:
+            return {'servers': [{'id': 5, 'name': 'web-02'}, {'id': 6, 'name': 'web-02-old'}]}
+        return self.pages[(page or 1) - 1]
+
+    def test_index_is_built_once(self):
+        """
+        Test lookups after the first are served from memory
+        """
+        self.assertEqual(self.resolver.get_id('db'), 3)
+        self.assertEqual(self.resolver.get_name(2), 'web-01')
+        self.assertEqual(len(self.resolver), 4)
+        self.assertEqual(self.servers.list.call_count, 2)
+
+    def test_exact_match(self):
+        """
+        Test names only match exactly, and duplicates resolve to the lowest id
+        """
+        self.assertEqual(sorted(s['id'] for s in self.resolver.get_all('web')), [1, 4])
+        self.assertEqual(self.resolver.get('web'), {'id': 1, 'name': 'web'})
+
+    def test_missing_name_is_looked_up(self):
+        """
+        Test names missing from the index are fetched with a filtered listing
+        """
+        self.resolver.build()
+
+        self.assertEqual(self.resolver.get_id('web-02'), 5)
+        self.servers.list.assert_called_with(page=None, filter_name='web-02')
+        self.assertEqual(self.resolver.get_id('web-02-old'), 6)
+        self.assertEqual(self.servers.list.call_count, 3)
+
+    def test_unknown_name_is_remembered(self):
+        """
+        Test unknown names raise, and are not looked up again until a rebuild
+        """
+        for _ in range(2):
+            with self.assertRaises(NoEntityException):
+                self.resolver.get_id('mail')
+        with self.assertRaises(NoEntityException):
+            self.resolver.get_name(99)
+
+        self.assertEqual(self.servers.list.call_count, 3)
+
+    def test_rebuilt_after_max_age(self):
+        """
+        Test the index is rebuilt once it is older than max_age
+        """
+        self.resolver.get_id('db')
+        self.pages[1]['servers'][0]['name'] = 'database'
+        self.now = 60
+
+        self.assertEqual(self.resolver.get_id('database'), 3)
+        with self.assertRaises(NoEntityException):
+            self.resolver.get_id('db')
+
+    def test_renamed_entity(self):
+        """
+        Test an entity added under a new name leaves its old name
+        """
+        self.resolver.build()
+        self.resolver._add({'id': 3, 'name': 'database'})
+
+        self.assertEqual(self.resolver.get_name(3), 'database')
+        self.assertNotIn('db', self.resolver._by_field)
+
+    def test_field_per_resource(self):
+        """
+        Test users resolve by email, and unsupported resources are rejected
+        """
+        resolver = NameResolver(Users(api_key='dummy_key'))
+
+        self.assertEqual((resolver.key, resolver.field, resolver.filter_arg), ('users', 'email', 'filter_email'))
+        with self.assertRaises(ConfigurationException):
+            NameResolver(Labels(api_key='dummy_key'))
+
+    def test_client_resolver(self):
+        """
+        Test the client keeps one resolver per resource
+        """
+        client = NewRelicClient(api_key='dummy_key', session=Mock(name='session'))
+
+        resolver = client.resolver('dashboards')
+
+        self.assertIs(client.resolver('dashboards'), resolver)
+        self.assertIs(resolver.resource, client.dashboards)
+        self.assertEqual(resolver.field, 'title')
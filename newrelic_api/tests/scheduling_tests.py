@@ -0,0 +1,188 @@
+import threading
+import time
+from unittest import TestCase
+
+from mock import Mock
+
+from newrelic_api.concurrency import AdaptiveLimiter, fan_out
+from newrelic_api.deadline import deadline
+from newrelic_api.exceptions import ConfigurationException, DeadlineExceededException
+from newrelic_api.scheduling import PriorityScheduler, current_priority, explicit_priority, priority
+from newrelic_api.servers import Servers
+from newrelic_api.transport import Transport
+
+
+class PriorityTests(TestCase):
+    def test_default_is_normal(self):
+        """
+        Test requests are normal priority unless set
+        """
+        self.assertIsNone(explicit_priority())
+        self.assertEqual(current_priority(), 'normal')
+
+    def test_priority_is_restored(self):
+        """
+        Test the priority is restored when the block exits
+        """
+        with priority('bulk'):
+            with priority('interactive'):
+                self.assertEqual(current_priority(), 'interactive')
+            self.assertEqual(current_priority(), 'bulk')
+        self.assertIsNone(explicit_priority())
+
+    def test_unknown_priority(self):
+        """
+        Test an unknown priority raises a configuration error
+        """
+        with self.assertRaises(ConfigurationException):
+            with priority('urgent'):
+                pass
+
+    def test_fan_out_propagates(self):
+        """
+        Test worker threads run at the priority of the calling thread
+        """
+        with priority('interactive'):
+            seen = fan_out(lambda item: current_priority(), range(4), max_workers=4)
+
+        self.assertEqual(seen, ['interactive'] * 4)
+
+    def test_listings_default_to_bulk(self):
+        """
+        Test full listings run as bulk unless a priority is set
+        """
+        servers = Servers(api_key='dummy_key')
+        seen = []
+        servers.list = Mock(side_effect=lambda **kwargs: seen.append(current_priority()) or {'servers': []})
+
+        servers._list_all(servers.list, 'servers')
+        with priority('interactive'):
+            servers._list_all(servers.list, 'servers')
+
+        self.assertEqual(seen, ['bulk', 'interactive'])
+
+
+class PrioritySchedulerTests(TestCase):
+    def setUp(self):
+        super(PrioritySchedulerTests, self).setUp()
+        self.now = 0
+        self.order = []
+        self.threads = []
+        # Tokens only refill when the test advances the clock, by whole
+        # seconds so the bucket refills exactly
+        self.scheduler = PriorityScheduler(rate=100, clock=lambda: self.now)
+        self.scheduler.acquire()
+
+    def tearDown(self):
+        super(PrioritySchedulerTests, self).tearDown()
+        for thread in self.threads:
+            thread.join(1)
+
+    def start(self, name, count=1):
+        def run():
+            with priority(name):
+                self.scheduler.acquire()
+            self.order.append(name)
+
+        expected = self.scheduler.waiting()
+        expected[name] += count
+        for _ in range(count):
+            thread = threading.Thread(target=run)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+        self.wait_until(lambda: self.scheduler.waiting() == expected)
+
+    def release_all(self):
+        while any(thread.is_alive() for thread in self.threads):
+            granted = len(self.order)
+            self.now += 1
+            self.wait_until(lambda: len(self.order) > granted)
+
+    def wait_until(self, condition):
+        for _ in range(1000):
+            if condition():
+                return
+            time.sleep(0.001)
+        self.fail('condition never met')
+
+    def test_interactive_jumps_the_queue(self):
+        """
+        Test an interactive request is served before queued bulk requests
+        """
+        self.start('bulk', 3)
+        self.start('interactive')
+
+        self.release_all()
+
+        self.assertEqual(self.order, ['interactive', 'bulk', 'bulk', 'bulk'])
+        self.assertEqual(self.scheduler.granted, {'interactive': 1, 'normal': 1, 'bulk': 3})
+
+    def test_bulk_is_not_starved(self):
+        """
+        Test bulk requests get tokens by weight under contention
+        """
+        self.scheduler.weights['interactive'] = 2
+        self.start('bulk')
+        self.start('interactive', 6)
+
+        self.release_all()
+
+        self.assertEqual(self.order[:3], ['interactive', 'bulk', 'interactive'])
+
+    def test_deadline_while_waiting(self):
+        """
+        Test a caller gives up waiting for a token at its deadline
+        """
+        scheduler = PriorityScheduler(rate=0.1)
+        scheduler.acquire()
+
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(0.01):
+                scheduler.acquire()
+        self.assertEqual(scheduler.waiting()['normal'], 0)
+
+    def test_transport_uses_scheduler(self):
+        """
+        Test the scheduler can be the rate limiter of a transport
+        """
+        session = Mock(name='session')
+        scheduler = PriorityScheduler(rate=1000, burst=2)
+        transport = Transport(session=session, rate_limiter=scheduler)
+
+        with priority('interactive'):
+            transport.request('put', 'https://api.newrelic.com/v2/servers/1.json')
+
+        self.assertEqual(scheduler.granted['interactive'], 1)
+
+    def test_scheduler_orders_concurrency_slots(self):
+        """
+        Test queued bulk requests do not hold the concurrency slots an
+        interactive request is waiting for
+        """
+        finished = []
+        session = Mock(name='session')
+        session.get.side_effect = lambda *args, **kwargs: time.sleep(0.001) or Mock(status_code=200)
+        scheduler = PriorityScheduler(rate=50)
+        transport = Transport(
+            session=session, coalesce=False, rate_limiter=scheduler,
+            concurrency_limiter=AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=2))
+
+        def send(name):
+            with priority(name):
+                transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+            finished.append(name)
+
+        threads = [threading.Thread(target=send, args=('bulk',)) for _ in range(40)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        # The bulk requests wait for tokens, not for the two slots
+        self.assertGreater(scheduler.waiting()['bulk'], 2)
+        ahead = len(finished)
+        send('interactive')
+        for thread in threads:
+            thread.join()
+
+        # Only a bulk request already holding a token may go first
+        self.assertLessEqual(finished.index('interactive') - ahead, 1)
@@ -5,6 +5,7 @@ from mock import patch, Mock
 import requests
 
 from newrelic_api.servers import Servers
+from newrelic_api.transport import DEFAULT_TIMEOUT
 
 
 class NRServersTests(TestCase):
@@ -132,7 +133,8 @@ class NRServersTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/servers.json',
             headers=self.server.headers,
-            params='filter[ids]=1234567'
+            params='filter[ids]=1234567',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -153,7 +155,8 @@ class NRServersTests(TestCase):
         mock_get.assert_called_once_with(
             url='https://api.newrelic.com/v2/servers.json',
             headers=self.server.headers,
-            params='filter[labels]=Type1:Value1;Type2:Value2'
+            params='filter[labels]=Type1:Value1;Type2:Value2',
+            timeout=DEFAULT_TIMEOUT
         )
 
     @patch.object(requests, 'get')
@@ -300,3 +303,14 @@ class NRServersTests(TestCase):
         )
 
         self.assertIsInstance(response, dict)
+
+    def test_show_many(self):
+        """
+        Test servers .show_many() fetches servers by id through .list()
+        """
+        with patch.object(self.server, '_show_many') as mock_show_many:
+            response = self.server.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.server.list, 'servers', [1, 2], batch_size=10, max_workers=3)
@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from newrelic_api.applications import Applications
+from newrelic_api.exceptions import NewRelicAPINotFoundException, NewRelicAPIServerException
+from newrelic_api.servers import Servers
+from newrelic_api.testing.backend import Backend, populate
+from newrelic_api.testing.server import StandInServer
+
+
+class StandInServerTests(TestCase):
+    def setUp(self):
+        super(StandInServerTests, self).setUp()
+        self.server = StandInServer(backend=populate(Backend(page_size=20))).start()
+        self.addCleanup(self.server.stop)
+
+    def resource(self, resource_class, server=None, **kwargs):
+        server = server or self.server
+        return resource_class(api_key='dummy_key', transport=server.transport(**kwargs))
+
+    def test_list_all(self):
+        """
+        Test a listing is followed across every page of the stand-in
+        """
+        servers = self.resource(Servers, pooled=True)
+
+        entities = servers._list_all(servers.list, 'servers')
+
+        self.assertEqual(len(entities), 50)
+        self.assertEqual(len(servers.list()['servers']), 20)
+        self.assertIn('next', servers.list()['pages'])
+
+    def test_show_and_update(self):
+        """
+        Test updates sent to the stand-in are visible to later requests
+        """
+        applications = self.resource(Applications)
+
+        applications.update(3, name='renamed')
+
+        self.assertEqual(applications.show(3)['application']['name'], 'renamed')
+        self.assertEqual(applications.list(filter_name='renamed')['applications'][0]['id'], 3)
+
+    def test_not_found(self):
+        """
+        Test unknown entities are answered with 404
+        """
+        with self.assertRaises(NewRelicAPINotFoundException):
+            self.resource(Servers).show(10 ** 6)
+
+    def test_errors(self):
+        """
+        Test a share of requests can be answered with a server error
+        """
+        server = StandInServer(backend=Backend(), error_rate=1.0).start()
+        self.addCleanup(server.stop)
+
+        with self.assertRaises(NewRelicAPIServerException):
+            self.resource(Servers, server).list()
+        self.assertEqual(server.stats, {'requests': 1, 'errors': 1, 'throttled': 0})
+
+    def test_throttling(self):
+        """
+        Test throttled requests are answered with 429 and a Retry-After
+        header
+        """
+        server = StandInServer(backend=Backend(), throttle_rate=1.0, retry_after=7).start()
+        self.addCleanup(server.stop)
+
+        response = server.transport().request('get', 'https://api.newrelic.com/v2/servers.json')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '7')
+        self.assertEqual(server.stats['throttled'], 1)
+
+    def test_api_key(self):
+        """
+        Test requests without the expected key are answered with 401
+        """
+        server = StandInServer(backend=Backend(), api_key='secret').start()
+        self.addCleanup(server.stop)
+
+        with self.assertRaises(NewRelicAPIServerException) as context:
+            self.resource(Servers, server).list()
+        self.assertIn('401', str(context.exception))
+        self.assertEqual(
+            Servers(api_key='secret', transport=server.transport()).list(), {'servers': []})
+
+    def test_latency(self):
+        """
+        Test a callable latency is drawn for every request
+        """
+        latency = Mock(return_value=0)
+        server = StandInServer(backend=Backend(), latency=latency).start()
+        self.addCleanup(server.stop)
+        servers = self.resource(Servers, server)
+
+        servers.list()
+        servers.list(page=2)
+
+        self.assertEqual(latency.call_count, 2)
@@ -0,0 +1,217 @@
+import threading
+import time
+from unittest import TestCase
+
+from mock import patch, Mock
+import requests
+
+from newrelic_api.transport import DEFAULT_TIMEOUT, RateLimiter, Transport, affected_collections, request_key
+
+
+class RateLimiterTests(TestCase):
+    def setUp(self):
+        super(RateLimiterTests, self).setUp()
+        self.now = 0
+        self.sleep = Mock(name='sleep')
+
+    def clock(self):
+        return self.now
+
+    def test_burst_does_not_wait(self):
+        """
+        Test tokens available in the bucket are taken without waiting
+        """
+        limiter = RateLimiter(rate=1, burst=2, clock=self.clock, sleep=self.sleep)
+
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertFalse(self.sleep.called)
+
+    def test_empty_bucket_waits(self):
+        """
+        Test callers queue behind each other once the bucket is empty
+        """
+        limiter = RateLimiter(rate=2, clock=self.clock, sleep=self.sleep)
+
+        limiter.acquire()
+
+        self.assertEqual(limiter.acquire(), 0.5)
+        self.assertEqual(limiter.acquire(), 1.0)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_bucket_refills(self):
+        """
+        Test tokens are added back over time
+        """
+        limiter = RateLimiter(rate=2, clock=self.clock, sleep=self.sleep)
+
+        limiter.acquire()
+        self.now = 10
+
+        self.assertEqual(limiter.acquire(), 0)
+
+
+class TransportTests(TestCase):
+
+    @patch.object(requests, 'get')
+    def test_request_without_session(self, mock_get):
+        """
+        Test requests are sent with the requests module by default
+        """
+        transport = Transport()
+
+        response = transport.request('get', 'https://api.newrelic.com/v2/servers.json', headers={})
+
+        self.assertIs(response, mock_get.return_value)
+        mock_get.assert_called_once_with(
+            url='https://api.newrelic.com/v2/servers.json', headers={}, timeout=DEFAULT_TIMEOUT)
+
+    def test_request_with_session(self):
+        """
+        Test requests are sent with the session when there is one
+        """
+        session = Mock(name='session')
+        transport = Transport(session=session)
+
+        transport.request('delete', url='https://api.newrelic.com/v2/servers/1.json')
+
+        session.delete.assert_called_once_with(
+            url='https://api.newrelic.com/v2/servers/1.json', timeout=DEFAULT_TIMEOUT)
+
+    @patch.object(requests, 'Session')
+    def test_pooled_creates_one_session(self, mock_session):
+        """
+        Test a pooled transport lazily creates a single session
+        """
+        transport = Transport(pooled=True)
+        self.assertFalse(mock_session.called)
+
+        transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+        transport.request('get', 'https://api.newrelic.com/v2/users.json')
+
+        mock_session.assert_called_once_with()
+        self.assertEqual(mock_session.return_value.get.call_count, 2)
+
+    def test_rate_limiter(self):
+        """
+        Test a token is acquired before each request
+        """
+        limiter = Mock(name='limiter')
+        transport = Transport(session=Mock(name='session'), rate_limiter=limiter)
+
+        transport.request('get', 'https://api.newrelic.com/v2/servers.json')
+
+        limiter.acquire.assert_called_once_with()
+
+    def test_affected_collections(self):
+        """
+        Test writes affect their own collection and the ones depending on it
+        """
+        self.assertEqual(
+            affected_collections('https://api.newrelic.com/v2/labels/labels/Type:Value.json'),
+            [
+                'https://api.newrelic.com/v2/labels',
+                'https://api.newrelic.com/v2/applications',
+                'https://api.newrelic.com/v2/servers',
+            ]
+        )
+        self.assertEqual(
+            affected_collections('https://api.newrelic.com/v2/users/1.json'),
+            ['https://api.newrelic.com/v2/users']
+        )
+
+
+class CoalescingTests(TestCase):
+    def setUp(self):
+        super(CoalescingTests, self).setUp()
+        self.release = threading.Event()
+        self.session = Mock(name='session')
+        self.session.get.side_effect = self.slow_get
+        self.transport = Transport(session=self.session)
+        self.results = []
+
+    def slow_get(self, **kwargs):
+        self.release.wait(5)
+        return Mock(name='response')
+
+    def fetch(self, url, headers):
+        try:
+            self.results.append(self.transport.request('get', url, headers=headers))
+        except Exception as e:
+            self.results.append(e)
+
+    def waiters(self):
+        return sum(call.waiters for call in list(self.transport._flight._calls.values()))
+
+    def run_concurrently(self, *requests_args):
+        threads = [threading.Thread(target=self.fetch, args=args) for args in requests_args]
+        for thread in threads:
+            thread.start()
+        # Wait until every thread has either started a request or joined one in flight
+        deadline = time.time() + 5
+        while self.session.get.call_count + self.waiters() < len(threads) and time.time() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_identical_gets_share_one_request(self):
+        """
+        Test concurrent identical GETs send one request and share its response
+        """
+        args = ('https://api.newrelic.com/v2/applications/1.json', {'X-Api-Key': '123'})
+
+        self.run_concurrently(args, args, args, args)
+
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(len(self.results), 4)
+        self.assertTrue(all(result is self.results[0] for result in self.results))
+        self.assertEqual(len(self.transport._flight), 0)
+
+    def test_different_headers_are_not_shared(self):
+        """
+        Test requests made with different API keys are never coalesced
+        """
+        url = 'https://api.newrelic.com/v2/applications/1.json'
+
+        self.run_concurrently((url, {'X-Api-Key': '123'}), (url, {'X-Api-Key': '456'}))
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_errors_are_shared(self):
+        """
+        Test every waiter receives the exception raised by the shared request
+        """
+        error = ValueError('boom')
+
+        def failing_get(**kwargs):
+            self.release.wait(5)
+            raise error
+
+        self.session.get.side_effect = failing_get
+        args = ('https://api.newrelic.com/v2/applications/1.json', {})
+
+        self.run_concurrently(args, args, args)
+
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(self.results, [error, error, error])
+
+    def test_coalescing_disabled(self):
+        """
+        Test coalescing can be turned off
+        """
+        self.transport.coalesce = False
+        args = ('https://api.newrelic.com/v2/applications/1.json', {})
+
+        self.run_concurrently(args, args)
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_request_key_is_order_independent(self):
+        """
+        Test equal headers produce equal keys
+        """
+        self.assertEqual(
+            request_key('get', 'url', 'page=1', {'a': '1', 'b': '2'}),
+            request_key('get', 'url', 'page=1', {'b': '2', 'a': '1'})
+        )
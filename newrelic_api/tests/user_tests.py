@@ -105,3 +105,14 @@ class NRUsersTests(TestCase):
         with self.assertRaises(ValueError):
             # Call the method
             self.user.show(id=333114)
+
+    def test_show_many(self):
+        """
+        Test users .show_many() fetches users by id through .list()
+        """
+        with patch.object(self.user, '_show_many') as mock_show_many:
+            response = self.user.show_many([1, 2], batch_size=10, max_workers=3)
+
+        self.assertIs(response, mock_show_many.return_value)
+        mock_show_many.assert_called_once_with(
+            self.user.list, 'users', [1, 2], batch_size=10, max_workers=3)
@@ -0,0 +1,563 @@
+import re
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+from newrelic_api.deadline import current_deadline, monotonic, use_deadline
+from newrelic_api.exceptions import DeadlineExceededException
+from newrelic_api.instrumentation import current_trace, use_trace
+from newrelic_api.scheduling import BULK, explicit_priority, priority
+
+# The default (connect, read) timeouts in seconds. The connect timeout is
+# slightly larger than a multiple of 3 seconds, the TCP retransmission window.
+DEFAULT_TIMEOUT = (3.05, 30)
+
+_VERSION_ROOT = re.compile(r'^[a-z]+://[^/]+/v2/')
+_ID_SEGMENT = re.compile(r'/\d+(?=/|\.json$|$)')
+
+
+def endpoint_template(url):
+    """
+    Returns the endpoint a url belongs to, relative to the API version root
+    and with numeric ids replaced by ``{id}``. Query strings are dropped.
+
+    .. code-block:: python
+
+        >>> endpoint_template('https://api.newrelic.com/v2/applications/1234/hosts/5678.json?page=2')
+        'applications/{id}/hosts/{id}.json'
+
+    :type url: str
+    :param url: The url of a request
+
+    :rtype: str
+    :return: The endpoint template
+    """
+    path = _VERSION_ROOT.sub('', url.split('?', 1)[0])
+    return _ID_SEGMENT.sub('/{id}', path)
+
+
+def collection_url(url):
+    """
+    Returns the url of the collection a url belongs to: the version root
+    followed by the first path segment. Every url of a resource, whether it
+    is a list, a show, a metrics call or a write, shares the same collection.
+
+    .. code-block:: python
+
+        >>> collection_url('https://api.newrelic.com/v2/applications/1234/metrics.json')
+        'https://api.newrelic.com/v2/applications'
+
+    :type url: str
+    :param url: The url of a request
+
+    :rtype: str
+    :return: The collection url
+    """
+    url = url.split('?', 1)[0]
+    match = _VERSION_ROOT.match(url)
+    root = match.group(0) if match else ''
+    segment = url[len(root):].split('/', 1)[0]
+    if segment.endswith('.json'):
+        segment = segment[:-len('.json')]
+    return root + segment
+
+
+# Collections whose responses embed data changed by writes to another
+# collection, e.g. the policy_ids links of notification channels
+DEPENDENT_COLLECTIONS = {
+    'alerts_policies': ('alerts_channels',),
+    'alerts_policy_channels': ('alerts_channels', 'alerts_policies'),
+    'labels': ('applications', 'servers'),
+}
+
+
+def affected_collections(url):
+    """
+    Returns the urls of the collections a write to a url may change: its own
+    collection followed by the collections that depend on it
+
+    .. code-block:: python
+
+        >>> affected_collections('https://api.newrelic.com/v2/alerts_policy_channels.json?policy_id=1')
+        ['https://api.newrelic.com/v2/alerts_policy_channels', 'https://api.newrelic.com/v2/alerts_channels',
+         'https://api.newrelic.com/v2/alerts_policies']
+
+    :type url: str
+    :param url: The url of a create, update or delete
+
+    :rtype: list of str
+    """
+    collection = collection_url(url)
+    root, _, name = collection.rpartition('/')
+    return [collection] + ['{0}/{1}'.format(root, dependent) for dependent in DEPENDENT_COLLECTIONS.get(name, ())]
+
+
+def _trace_cache(outcome):
+    trace = current_trace()
+    if trace is not None:
+        trace.cache = outcome
+
+
+def _trace_wait(seconds):
+    trace = current_trace()
+    if trace is not None:
+        trace.waited(seconds)
+
+
+class RateLimiter(object):
+    """
+    A thread safe token bucket limiting how many requests per second are
+    sent. Callers that find the bucket empty reserve the next token and sleep
+    until it is due, so waiting callers are served in order.
+    """
+    def __init__(self, rate, burst=1, clock=monotonic, sleep=time.sleep):
+        """
+        :type rate: float
+        :param rate: The sustained number of requests allowed per second
+
+        :type burst: int
+        :param burst: The number of requests that may be sent back to back
+            after a quiet period
+        """
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes a token, blocking until one is available
+
+        :rtype: float
+        :return: The number of seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            self._tokens -= 1
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def request_key(method, url, params=None, headers=None):
+    """
+    Builds a hashable key identifying a request by its verb, url, query
+    parameters and headers. Headers are part of the key so requests made
+    with different API keys are never confused.
+
+    :rtype: tuple
+    :return: The request key
+    """
+    return (method, url, _freeze(params), _freeze(headers))
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls sharing a key: the first caller runs the
+    function while later callers wait for it and receive the same result or
+    exception.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, func, timeout=None):
+        """
+        Runs ``func`` unless a call with the same key is already in flight,
+        in which case its outcome is shared. A caller that still has time
+        left does not share a leader's
+        :class:`newrelic_api.exceptions.DeadlineExceededException`, which
+        only says the leader ran out of its own budget: it runs ``func``
+        itself instead.
+
+        :type key: hashable
+        :param key: Identifies equivalent calls
+
+        :type func: callable
+        :param func: The function to run
+
+        :type timeout: float
+        :param timeout: How long to wait for a call already in flight
+
+        :returns: The return value of ``func``
+
+        :raises: A :class:`newrelic_api.exceptions.DeadlineExceededException`
+            if the call in flight did not finish within ``timeout``
+        """
+        started = monotonic()
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+
+            if leader:
+                return self._lead(key, call, func)
+            left = None if timeout is None else timeout - (monotonic() - started)
+            if not call.done.wait(left):
+                raise DeadlineExceededException('Timed out waiting for an identical request in flight')
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, DeadlineExceededException) or (
+                    timeout is not None and monotonic() - started >= timeout):
+                raise call.error
+
+    def _lead(self, key, call, func):
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class Transport(object):
+    """
+    Sends HTTP requests on behalf of one or more resources. A transport can
+    be shared between resources so that they use the same connection pool
+    and rate limiter.
+    """
+    def __init__(
+            self, session=None, pooled=False, rate_limiter=None, coalesce=True, cache=None, circuit_breaker=None,
+            timeout=DEFAULT_TIMEOUT, hedging=None, concurrency_limiter=None):
+        """
+        :type session: :class:`requests.Session`
+        :param session: The session used to send requests. If no session is
+            passed, requests are sent with the module level ``requests``
+            functions, unless ``pooled`` is set.
+
+        :type pooled: bool
+        :param pooled: Create a :class:`requests.Session` on the first
+            request and reuse its connections for every following request
+
+        :type rate_limiter: :class:`RateLimiter`
+        :param rate_limiter: An optional limiter every request must acquire
+            a token from before it is sent. A
+            :class:`newrelic_api.scheduling.PriorityScheduler` hands tokens
+            out by priority.
+
+        :type coalesce: bool
+        :param coalesce: Share one in flight request between threads that
+            concurrently GET the same url with the same parameters and
+            headers
+
+        :type cache: :class:`newrelic_api.cache.MemoryCache`
+        :param cache: An optional cache for GET responses. Creates, updates
+            and deletes sent through the transport invalidate the collection
+            they write to, and the collections listed for it in
+            DEPENDENT_COLLECTIONS. Expired
+            responses that carry an ``ETag`` or ``Last-Modified`` header are
+            revalidated with a conditional request, and reused if the server
+            answers 304 Not Modified. If the cache allows it, expired
+            responses are served immediately while they are refreshed on a
+            background thread.
+
+        :type circuit_breaker: :class:`newrelic_api.circuit_breaker.CircuitBreaker`
+        :param circuit_breaker: An optional circuit breaker that fails
+            requests fast while their host is degraded
+
+        :type timeout: float or tuple
+        :param timeout: The timeout of every request in seconds, or a
+            (connect, read) tuple. None waits forever. Inside a
+            :func:`newrelic_api.deadline.deadline` block, timeouts are
+            shrunk to the time left.
+
+        :type hedging: :class:`newrelic_api.hedging.HedgingPolicy`
+        :param hedging: An optional policy for sending a duplicate of slow
+            GET requests and using whichever response arrives first
+
+        :type concurrency_limiter: :class:`newrelic_api.concurrency.AdaptiveLimiter`
+        :param concurrency_limiter: An optional limiter that adapts the
+            number of requests in flight to the health of the API
+        """
+        self._session = session
+        self.pooled = pooled
+        self.rate_limiter = rate_limiter
+        self.coalesce = coalesce
+        self.cache = cache
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self.hedging = hedging
+        self.concurrency_limiter = concurrency_limiter
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    @property
+    def max_concurrency(self):
+        """
+        The number of threads fan-out helpers should use, or None for their
+        default
+        """
+        if self.concurrency_limiter is None:
+            return None
+        return self.concurrency_limiter.max_limit
+
+    @property
+    def session(self):
+        """
+        The session requests are sent with, or None if they are sent with the
+        module level ``requests`` functions
+        """
+        if self._session is None and self.pooled:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    self._session = requests.Session()
+        return self._session
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request
+
+        :type method: str
+        :param method: The lowercase HTTP verb, e.g. 'get'
+
+        :type url: str
+        :param url: The url to request
+
+        :returns: The response
+        :rtype: :class:`requests.Response`
+        """
+        if method != 'get':
+            try:
+                return self._limited_send(method, url, **kwargs)
+            finally:
+                if self.cache is not None:
+                    for collection in affected_collections(url):
+                        self.cache.invalidate(collection)
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        if self.cache is not None:
+            response = self.cache.get(key)
+            outcome = 'hit'
+            if response is None:
+                response = self._serve_stale(key, url, **kwargs)
+                outcome = 'stale'
+            _trace_cache(outcome if response is not None else 'miss')
+            if response is not None:
+                return response
+
+        if self.coalesce:
+            current = current_deadline()
+            return self._flight.do(
+                key, lambda: self._fetch(key, url, **kwargs),
+                timeout=current.remaining() if current is not None else None)
+        return self._fetch(key, url, **kwargs)
+
+    def _serve_stale(self, key, url, **kwargs):
+        response = self.cache.serve_stale(key)
+        if response is not None and self.cache.begin_refresh(key):
+            thread = threading.Thread(target=self._refresh, args=(key, url), kwargs=kwargs)
+            thread.daemon = True
+            thread.start()
+        return response
+
+    def _refresh(self, key, url, **kwargs):
+        try:
+            # Nobody is waiting for a background refresh
+            with priority(BULK):
+                self._flight.do(key, lambda: self._fetch(key, url, **kwargs))
+        except Exception:
+            # The stale response stays in place and the next caller retries
+            pass
+        finally:
+            self.cache.end_refresh(key)
+
+    def _fetch(self, key, url, **kwargs):
+        if self.cache is None:
+            return self._send_get(url, **kwargs)
+
+        generation = self.cache.generation(url)
+        stale = self.cache.get_stale(key)
+        if stale is not None and stale.validators:
+            headers = dict(kwargs.get('headers') or {})
+            headers.update(stale.validators)
+            kwargs['headers'] = headers
+
+        response = self._send_get(url, **kwargs)
+        if response.status_code == 304 and stale is not None:
+            _trace_cache('revalidated')
+            return self.cache.revalidate(key, url, stale, response, generation=generation)
+        if self.cache.should_store(response):
+            response = self.cache.set(key, url, response, generation=generation)
+        return response
+
+    def _send_get(self, url, **kwargs):
+        if self.hedging is None or not self.hedging.applies(url):
+            return self._limited_send('get', url, **kwargs)
+        return self._hedged_send(url, **kwargs)
+
+    def _hedged_send(self, url, **kwargs):
+        policy = self.hedging
+        policy.begin()
+        delay = policy.delay(url)
+        if delay is None:
+            # Nothing to hedge, so no thread is needed to wait on
+            started = monotonic()
+            response = self._limited_send('get', url, **kwargs)
+            policy.record(url, monotonic() - started)
+            return response
+        return self._race(url, delay, **kwargs)
+
+    def _race(self, url, delay, **kwargs):
+        policy = self.hedging
+        results = queue.Queue()
+        current = current_deadline()
+        current_priority = explicit_priority()
+        trace = current_trace()
+
+        def attempt(hedge):
+            started = monotonic()
+            try:
+                with use_deadline(current), priority(current_priority), use_trace(trace):
+                    response = self._limited_send('get', url, **kwargs)
+            except Exception as e:
+                results.put((hedge, None, e))
+                return
+            policy.record(url, monotonic() - started)
+            results.put((hedge, response, None))
+
+        self._start_attempt(attempt, False)
+        attempts = 1
+        try:
+            first = results.get(timeout=delay)
+        except queue.Empty:
+            if policy.try_hedge():
+                self._start_attempt(attempt, True)
+                attempts = 2
+            first = results.get()
+
+        hedge, response, error = first
+        if error is not None and attempts == 2:
+            # The other attempt may still succeed
+            hedge, response, error = results.get()
+        if error is not None:
+            raise error
+        if hedge:
+            policy.won()
+        return response
+
+    def _start_attempt(self, attempt, hedge):
+        thread = threading.Thread(target=attempt, args=(hedge,))
+        thread.daemon = True
+        thread.start()
+
+    def _limited_send(self, method, url, **kwargs):
+        waiting = monotonic()
+        ticket = self._admit(url)
+        if ticket is not None or self.rate_limiter is not None:
+            _trace_wait(monotonic() - waiting)
+        try:
+            response = self._send(method, url, **kwargs)
+        except DeadlineExceededException:
+            # The caller ran out of time, which says nothing about the host
+            self._abandon(url, ticket)
+            raise
+        except Exception:
+            self._record_outcome(url, ticket, None)
+            raise
+        self._record_outcome(url, ticket, response)
+        return response
+
+    def _admit(self, url):
+        current = current_deadline()
+        if current is not None:
+            current.check()
+        # The rate limiter goes first, so that a priority scheduler decides
+        # the order requests are sent in rather than who got a slot first
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            if current is not None:
+                # The rate limiter may have used up the rest of the budget
+                current.check()
+        ticket = None
+        if self.concurrency_limiter is not None:
+            ticket = self.concurrency_limiter.acquire(url, timeout=current.remaining() if current is not None else None)
+        try:
+            # Checked last, as a half-open circuit only lets a few probes
+            # through and each one must be followed by a send
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(url)
+        except Exception:
+            if ticket is not None:
+                self.concurrency_limiter.cancel(ticket)
+            raise
+
+        if ticket is not None:
+            self.concurrency_limiter.start(ticket)
+        return ticket
+
+    def _abandon(self, url, ticket):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.abandon(url)
+        if ticket is not None:
+            self.concurrency_limiter.cancel(ticket)
+
+    def _record_outcome(self, url, ticket, response):
+        status_code = None if response is None else response.status_code
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(url, status_code is not None and status_code < 500)
+        if ticket is not None:
+            self.concurrency_limiter.release(ticket, status_code)
+
+    def _send(self, method, url, **kwargs):
+        timeout = kwargs.pop('timeout', self.timeout)
+        current = current_deadline()
+        if current is not None:
+            timeout = current.timeout(timeout)
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        session = self.session
+        if session is None:
+            import requests
+            session = requests
+        trace = current_trace()
+        started = monotonic()
+        try:
+            return getattr(session, method)(url=url, **kwargs)
+        except Exception:
+            if current is not None and current.expired():
+                raise DeadlineExceededException('The deadline passed while waiting for {0}'.format(url))
+            raise
+        finally:
+            if trace is not None:
+                trace.attempted(monotonic() - started)
@@ -87,3 +87,37 @@ class Users(Resource):
             url='{0}users/{1}.json'.format(self.URL, id),
             headers=self.headers,
         )
+
+    def show_many(self, ids, batch_size=None, max_workers=None):
+        """
+        Returns many users at once. Rather than one show request
+        per id, the ids are split into batches that are fetched concurrently
+        with the filter[ids] parameter of :meth:`list`.
+
+        :type ids: list of ints
+        :param ids: User IDs
+
+        :type batch_size: int
+        :param batch_size: The maximum number of ids per request
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests
+
+        :rtype: dict
+        :return: The users keyed by id, as returned by :meth:`list`.
+            Ids that do not exist are left out.
+
+        ::
+
+            {
+                1234567: {
+                    "id": 1234567,
+                    "first_name": "string",
+                    "last_name": "string",
+                    "email": "string",
+                    "role": "string"
+                }
+            }
+
+        """
+        return self._show_many(self.list, 'users', ids, batch_size=batch_size, max_workers=max_workers)
@@ -36,7 +36,8 @@ setup(
     ],
     license='MIT',
     install_requires=[
-        'requests>=2.0.0'
+        'requests>=2.0.0',
+        'futures>=3.0.0; python_version < "3.2"',
     ],
     test_suite='nose.collector',
     tests_require=[